@@ -0,0 +1,48 @@
+"""Benchmark: giveaway winner draws, list + random.sample vs EntrantPool.
+
+EntrantPool is not faster than sampling a plain list: it adds weighted entries
+and rerolls that exclude past winners, at a cost this benchmark shows.
+
+Run from the repository root:
+    python -m benchmarks.bench_draw [entrants] [winners]
+"""
+import random
+import sys
+import time
+
+from core.entrants import EntrantPool
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    entrants = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    winners = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    ids = random.sample(range(10**17, 10**18), entrants)
+    weights = [random.choice((1, 1, 1, 2, 5)) for _ in ids]
+
+    start = time.perf_counter()
+    pool = EntrantPool.from_entries(ids, weights)
+    build = time.perf_counter() - start
+    previous = pool.draw(winners)
+
+    old = timed(lambda: random.sample(ids, winners), 50)
+    new = timed(lambda: pool.draw(winners), 50)
+    reroll = timed(lambda: pool.draw(winners, exclude=previous), 50)
+
+    print(f"entrants: {entrants:,}  winners: {winners}")
+    print(f"EntrantPool build (one-off, O(n)):  {build * 1000:9.2f} ms")
+    print(f"list + random.sample:               {old * 1000:9.3f} ms  (unweighted, repeats allowed on reroll)")
+    print(f"EntrantPool.draw (weighted):        {new * 1000:9.3f} ms")
+    print(f"EntrantPool.draw excluding winners: {reroll * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark: startup time and memory for each MEMBER_CACHE mode.
+
+Starts tools/fake_gateway.py with large synthetic guilds, then boots main.py
+once per mode against it and reports the time to ready, the RSS once ready
+and the number of cached members. Linux only (RSS is read from /proc).
+
+Run from the repository root:
+    python -m benchmarks.bench_member_cache [members_per_guild] [guilds]
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from core.members import MEMBER_CACHE_MODES
+
+FAKE_PORT = 18700
+BOT_PORT = 18701
+READY_TIMEOUT = 300
+
+
+def http_get(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+    except OSError:
+        return None, ""
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        match = re.search(r"VmRSS:\s+(\d+) kB", f.read())
+    return int(match.group(1)) / 1024
+
+
+def wait_for(url: str, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, _ = http_get(url)
+        if status == 200:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def run_mode(mode: str, env: dict) -> dict:
+    data_dir = tempfile.mkdtemp(prefix=f"bench-{mode}-")
+    process = subprocess.Popen(
+        [sys.executable, "main.py"],
+        env=dict(env, MEMBER_CACHE=mode, BOT_DATA_DIR=data_dir, PORT=str(BOT_PORT)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    started = time.perf_counter()
+    try:
+        if not wait_for(f"http://127.0.0.1:{BOT_PORT}/readyz", READY_TIMEOUT):
+            return {"mode": mode, "error": "not ready in time"}
+        ready = time.perf_counter() - started
+        time.sleep(1)  # let post-ready work (command sync, reconcile) settle
+        _, metrics = http_get(f"http://127.0.0.1:{BOT_PORT}/metrics")
+        cached = re.search(r'bot_member_cache_entries\{cache="discord"\} (\S+)', metrics)
+        return {"mode": mode, "ready": ready, "rss": rss_mb(process.pid),
+                "cached": int(float(cached.group(1))) if cached else 0}
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    guilds = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "tools.fake_gateway", "--guilds", str(guilds), "--members", str(members),
+         "--shards", "1", "--port", str(FAKE_PORT)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    env = dict(os.environ,
+               BOTTOKEN="fake",
+               DISCORD_API_BASE=f"http://127.0.0.1:{FAKE_PORT}/api/v10",
+               DISCORD_GATEWAY_URL=f"ws://127.0.0.1:{FAKE_PORT}/gateway")
+    try:
+        if not wait_for(f"http://127.0.0.1:{FAKE_PORT}/_fake/shards", 30):
+            raise SystemExit("fake gateway did not start")
+        print(f"{guilds} guild(s) x {members:,} member(s)")
+        print(f"{'mode':<8} {'ready (s)':>10} {'RSS (MB)':>10} {'cached members':>16}")
+        for mode in MEMBER_CACHE_MODES:
+            result = run_mode(mode, env)
+            if "error" in result:
+                print(f"{mode:<8} {result['error']}")
+                continue
+            print(f"{mode:<8} {result['ready']:>10.2f} {result['rss']:>10.1f} {result['cached']:>16,}")
+    finally:
+        fake.terminate()
+        fake.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: on_message throughput, original handler vs MessageDispatcher.
+
+Uses stand-in message objects and a real (never logged-in) commands.Bot for
+``process_commands``, so command parsing costs what it costs in production.
+The message mix is mostly plain chat with some mentions and prefixed
+commands, which is what a busy channel looks like.
+
+Run from the repository root:
+    python -m benchmarks.bench_on_message [messages]
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import discord
+from discord.ext import commands
+
+from core.dispatch import MessageDispatcher
+
+PREFIX = ",,"
+
+
+class FakeChannel:
+    async def send(self, *args, **kwargs):
+        pass
+
+
+def make_messages(count, state):
+    channel = FakeChannel()
+    users = [SimpleNamespace(id=1000 + i, bot=False, display_name=f"user{i}", mention=f"<@{1000 + i}>") for i in range(500)]
+    bot_user = SimpleNamespace(id=1, bot=True)
+    words = "hey gg lol anyone want to trade i need help with the event tonight".split()
+    messages = []
+    for _ in range(count):
+        roll = random.random()
+        author = bot_user if roll < 0.05 else random.choice(users)
+        mentions = []
+        if roll < 0.20:
+            content = PREFIX + random.choice(["help", "sync", "logstats", "ps vru"])
+        else:
+            content = " ".join(random.choices(words, k=random.randint(3, 15)))
+            if roll > 0.90:
+                mentions = [random.choice(users)]
+        messages.append(SimpleNamespace(author=author, content=content, mentions=mentions, channel=channel, guild=None, attachments=[], _state=state))
+    return messages
+
+
+def make_bot():
+    bot = commands.Bot(command_prefix=PREFIX, intents=discord.Intents.default(), help_command=None)
+    bot._connection.user = SimpleNamespace(id=1)
+
+    for name in ("help", "sync", "logstats"):
+        async def noop(ctx):
+            pass
+        bot.command(name=name)(noop)
+    return bot
+
+
+def build_handlers(afk_users, bot):
+    process_commands = bot.process_commands
+
+    async def ps_vru(message):
+        pass
+
+    # Copy of the original on_message body (sends stubbed out)
+    async def legacy_on_message(message):
+        if message.author.bot:
+            return
+        if message.author.id in afk_users:
+            afk_users[message.author.id] = afk_users.pop(message.author.id)
+        for user in message.mentions:
+            if user.id in afk_users:
+                await message.channel.send(f"💤 {user.display_name} is AFK")
+        if message.content.lower().strip() == ",,ps vru":
+            await ps_vru(message)
+            return
+        await process_commands(message)
+
+    async def afk_stage(message):
+        if message.author.id in afk_users:
+            afk_users[message.author.id] = afk_users.pop(message.author.id)
+        for user in message.mentions:
+            if user.id in afk_users:
+                await message.channel.send(f"💤 {user.display_name} is AFK")
+
+    dispatcher = MessageDispatcher(PREFIX, process_commands)
+    dispatcher.add_stage(afk_stage, enabled=lambda: afk_users)
+    dispatcher.add_trigger(",,ps vru", ps_vru)
+    return legacy_on_message, dispatcher.dispatch
+
+
+async def throughput(handler, messages):
+    start = time.perf_counter()
+    for message in messages:
+        await handler(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for label, afk_count in (("nobody AFK", 0), ("50 users AFK", 50)):
+        afk_users = {1000 + i: {"since": datetime.now(timezone.utc), "reason": "AFK"} for i in range(afk_count)}
+        bot = make_bot()
+        messages = make_messages(count, bot._connection)
+        legacy, staged = build_handlers(afk_users, bot)
+        before = await throughput(legacy, messages)
+        after = await throughput(staged, messages)
+        print(f"{label:>14}: before {before:12,.0f} msg/s   after {after:12,.0f} msg/s   ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
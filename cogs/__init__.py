@@ -0,0 +1,5 @@
+"""Bot features packaged as discord.py extensions.
+
+Each module exposes ``async def setup(bot)`` and keeps its in-memory state in
+``bot.state`` so ``,,ext reload <name>`` swaps the code without losing it.
+"""
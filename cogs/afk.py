@@ -0,0 +1,120 @@
+"""AFK status: welcome-back messages and coalesced "is AFK" notices on mentions."""
+import time
+from datetime import datetime, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+AFK_NOTICE_WINDOW = 30          # seconds; one "is AFK" notice per (channel, AFK user) per window
+AFK_MAX_TRACKED_PINGERS = 20    # distinct pingers remembered per AFK user
+
+
+def record_afk_ping(data: dict, pinger_id: int, channel_id: int):
+    """Count a ping in the bounded, deduplicated pinged_by table"""
+    data["ping_total"] += 1
+    pinged_by = data["pinged_by"]
+    entry = pinged_by.pop(pinger_id, None)
+    if entry is None:
+        entry = [0, channel_id]
+        if len(pinged_by) >= AFK_MAX_TRACKED_PINGERS:
+            # Forget the least recent pinger; their pings still count in ping_total
+            del pinged_by[next(iter(pinged_by))]
+            data["pingers_dropped"] += 1
+    entry[0] += 1
+    entry[1] = channel_id
+    pinged_by[pinger_id] = entry  # re-insert so dict order is least -> most recent
+
+
+def afk_ping_summary(data: dict) -> str:
+    pinged_by = data["pinged_by"]
+    if not pinged_by:
+        return ""
+    parts = []
+    for pinger_id, (count, channel_id) in reversed(pinged_by.items()):
+        times = f" ×{count}" if count > 1 else ""
+        parts.append(f"<@{pinger_id}>{times} in <#{channel_id}>")
+    others = f" and {data['pingers_dropped']} other(s)" if data["pingers_dropped"] else ""
+    return f"\n⚡ You were pinged {data['ping_total']} time(s) by: {', '.join(parts)}{others}"
+
+
+class AFK(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # guild_id -> {user_id: AFK data}; partitioned by guild so a cluster only holds its own guilds
+        self.afk_users = bot.state.get("afk_users")
+        self.afk_notices_sent = bot.state.get("afk_notices_sent")  # (channel_id, afk_user_id) -> monotonic time of last notice
+
+    async def cog_load(self):
+        # Skipped by the dispatcher while nobody is AFK
+        self.bot.message_dispatcher.add_stage(self.afk_stage, enabled=lambda: self.afk_users)
+
+    async def cog_unload(self):
+        self.bot.message_dispatcher.remove_stage(self.afk_stage)
+
+    def should_send_afk_notice(self, channel_id: int, afk_user_id: int) -> bool:
+        now = time.monotonic()
+        key = (channel_id, afk_user_id)
+        last = self.afk_notices_sent.get(key)
+        if last is not None and now - last < AFK_NOTICE_WINDOW:
+            return False
+        if len(self.afk_notices_sent) > 1000:
+            for stale in [k for k, sent in self.afk_notices_sent.items() if now - sent >= AFK_NOTICE_WINDOW]:
+                del self.afk_notices_sent[stale]
+        self.afk_notices_sent[key] = now
+        return True
+
+    async def afk_stage(self, message):
+        """AFK return and AFK-mention handling (only runs while someone is AFK)"""
+        if message.guild is None:
+            return
+        afk_users = self.afk_users.get(message.guild.id)
+        if not afk_users:
+            return
+        # AFK check
+        if message.author.id in afk_users:
+            data = afk_users.pop(message.author.id)
+            if not afk_users:
+                del self.afk_users[message.guild.id]
+            since = datetime.now(timezone.utc) - data["since"]
+            seconds = int(since.total_seconds())
+            hours, remainder = divmod(seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            pinged_text = afk_ping_summary(data)
+            await message.channel.send(
+                f"✅ Welcome back {message.author.mention}! You were AFK for {hours}h {minutes}m {seconds}s.{pinged_text}")
+
+        # Mention check for AFK users
+        if not afk_users:
+            return
+        notices = []
+        seen = set()
+        for user in message.mentions:
+            if user.id in afk_users and user.id not in seen:
+                seen.add(user.id)
+                data = afk_users[user.id]
+                record_afk_ping(data, message.author.id, message.channel.id)
+                if self.should_send_afk_notice(message.channel.id, user.id):
+                    notices.append(f"💤 {user.display_name} is AFK due to the following reason: {data['reason']}")
+
+        # One message per triggering message, and repeat mentions within the window stay silent
+        if notices:
+            await message.channel.send("\n".join(notices))
+
+    # SLASH COMMAND - AFK
+    @app_commands.command(name="afk", description="Set yourself as AFK")
+    async def afk_slash(self, interaction: discord.Interaction, reason: str = "AFK"):
+        """Set AFK using slash command"""
+        self.afk_users.setdefault(interaction.guild_id, {})[interaction.user.id] = {
+            "since": datetime.now(timezone.utc),
+            "reason": reason,
+            "channel": interaction.channel.id,
+            "pinged_by": {},      # pinger_id -> [ping count, channel_id of latest ping]
+            "ping_total": 0,
+            "pingers_dropped": 0
+        }
+        await interaction.response.send_message(f"💤 {interaction.user.mention} is now AFK: {reason}")
+
+
+async def setup(bot):
+    await bot.add_cog(AFK(bot))
@@ -0,0 +1,533 @@
+"""Giveaways: reaction entries, scheduled endings, weighted draws and rerolls.
+
+Only running giveaways live in ``active_giveaways``, indexed per guild by end
+time for ``/giveaway_list``. Ended ones move to a bounded ``ended_giveaways``
+map, where they can still be rerolled for ENDED_GIVEAWAY_RETENTION; after that
+(or past ENDED_GIVEAWAYS_KEPT) they are appended to giveaway_archive.jsonl
+without their entrant lists.
+
+Reactions don't rewrite giveaways.json: each entry or leave is appended to
+giveaway_entries.jsonl with the giveaway's next ``entry_seq``, and replayed on
+load on top of the last snapshot (which holds each giveaway's ``entry_seq``).
+The journal is emptied whenever a snapshot is written.
+
+Giveaways (and journal lines) of guilds another cluster owns are kept as
+stored and written back unchanged.
+"""
+import bisect
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from config import GIVEAWAY_BONUS_ENTRIES
+from core.durations import parse_duration
+from core.entrants import EntrantPool
+from core.outbound import Priority, outbound
+from core.paginator import Paginator
+from core.permissions import Access, require_access, resolver
+from core.storage import append_jsonl_later, data_path, load_json, load_jsonl, save_json_later
+
+GIVEAWAYS_FILE = "giveaways.json"
+GIVEAWAY_ARCHIVE_FILE = "giveaway_archive.jsonl"
+GIVEAWAY_ENTRIES_FILE = "giveaway_entries.jsonl"
+GIVEAWAY_EMOJI = "🎉"
+ENDED_GIVEAWAYS_KEPT = 200
+ENDED_GIVEAWAY_RETENTION = timedelta(days=7)
+GIVEAWAY_LIST_PAGE_SIZE = 10
+
+
+def giveaway_entry_weight(member) -> int:
+    """Number of entries a member gets: 1 plus the bonus entries of their roles"""
+    if not GIVEAWAY_BONUS_ENTRIES:
+        return 1
+    return 1 + sum(GIVEAWAY_BONUS_ENTRIES.get(role.id, 0) for role in getattr(member, 'roles', ()))
+
+
+class Giveaways(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.state = bot.state.get("giveaways")
+        self.active_giveaways = self.state.setdefault("active", {})
+        # Recently ended giveaways (rerolls), oldest first
+        self.ended_giveaways = self.state.setdefault("ended", OrderedDict())
+        # guild_id -> sorted [(end timestamp, giveaway_id)] of the active giveaways
+        self.end_index = self.state.setdefault("end_index", {})
+        # message_id -> giveaway_id for giveaways that still accept entries
+        self.giveaway_messages = self.state.setdefault("messages", {})
+        # "giveaway_id" -> stored giveaway of a guild another cluster owns
+        self.foreign_giveaways = self.state.setdefault("foreign", {})
+        # giveaway_id -> [(user_id, weight)] reaction events seen while its entrants are being re-read
+        self._reconciling = {}
+
+    async def cog_load(self):
+        if not self.state.get("loaded"):
+            self.state["loaded"] = True
+            self.load_giveaways()
+        self.bot.scheduler.register("end_giveaway", self.end_giveaway)
+
+    async def cog_unload(self):
+        self.bot.scheduler.unregister("end_giveaway", self.end_giveaway)
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save_giveaways(self):
+        """Persist giveaways (debounced) so scheduled endings survive restarts"""
+        save_json_later(GIVEAWAYS_FILE, self._giveaways_snapshot, on_saved=self._clear_entry_journal)
+
+    def _giveaways_snapshot(self):
+        giveaways = dict(self.foreign_giveaways)
+        for source in (self.active_giveaways, self.ended_giveaways):
+            for giveaway_id, giveaway in source.items():
+                giveaways[str(giveaway_id)] = {**giveaway,
+                                               'end_time': giveaway['end_time'].timestamp(),
+                                               'participants': giveaway['participants'].to_dict()}
+        return {"next_id": self.state["next_id"], "giveaways": giveaways}
+
+    def load_giveaways(self):
+        """Restore giveaways saved by a previous run (only those of guilds this cluster owns)"""
+        stored = load_json(GIVEAWAYS_FILE, {})
+        self.state["next_id"] = stored.get("next_id", 1)
+        ended = []
+        for giveaway_id, giveaway in stored.get("giveaways", {}).items():
+            if not self.bot.cluster.owns_guild(giveaway.get('guild_id')):
+                self.foreign_giveaways[giveaway_id] = giveaway
+                continue
+            giveaway['end_time'] = datetime.fromtimestamp(giveaway['end_time'], timezone.utc)
+            giveaway['participants'] = EntrantPool.from_dict(giveaway['participants'])
+            giveaway.setdefault('previous_winners', [])
+            giveaway.setdefault('entry_seq', 0)
+            if giveaway['ended']:
+                ended.append((int(giveaway_id), giveaway))
+            else:
+                self._add_active(int(giveaway_id), giveaway)
+        for giveaway_id, giveaway in sorted(ended, key=lambda item: self._ended_at(item[1])):
+            self.ended_giveaways[giveaway_id] = giveaway
+        self._replay_entry_journal()
+        # Files from before the archive kept every giveaway ever created
+        if self._evict_ended():
+            self.save_giveaways()
+
+    def _replay_entry_journal(self):
+        """Apply the entries and leaves journaled after the snapshot"""
+        foreign_lines = self.state.setdefault("foreign_entries", [])
+        for line in load_jsonl(GIVEAWAY_ENTRIES_FILE):
+            guild_id, giveaway_id, entry_seq, user_id, weight = line
+            if str(giveaway_id) in self.foreign_giveaways:
+                foreign_lines.append(line)
+                continue
+            giveaway = self.active_giveaways.get(giveaway_id)
+            if giveaway is None or entry_seq <= giveaway['entry_seq']:
+                continue  # ended, or already in the snapshot
+            giveaway['entry_seq'] = entry_seq
+            if weight:
+                giveaway['participants'].add(user_id, weight)
+            else:
+                giveaway['participants'].discard(user_id)
+
+    def _journal_entry(self, giveaway_id: int, user_id: int, weight: int):
+        """Record one entry (weight > 0) or leave (weight 0) without rewriting giveaways.json"""
+        giveaway = self.active_giveaways[giveaway_id]
+        giveaway['entry_seq'] = giveaway.get('entry_seq', 0) + 1
+        append_jsonl_later(GIVEAWAY_ENTRIES_FILE,
+                           [giveaway.get('guild_id'), giveaway_id, giveaway['entry_seq'], user_id, weight])
+
+    def _clear_entry_journal(self):
+        # Runs right after a snapshot: it holds every journaled line of this cluster's giveaways
+        try:
+            with open(data_path(GIVEAWAY_ENTRIES_FILE), "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(line, separators=(",", ":")) + "\n"
+                             for line in self.state.get("foreign_entries", ()))
+        except OSError as e:
+            print(f"❌ Failed to clear {GIVEAWAY_ENTRIES_FILE}: {e}")
+
+    def _add_active(self, giveaway_id: int, giveaway: dict):
+        self.active_giveaways[giveaway_id] = giveaway
+        self.giveaway_messages[giveaway['message_id']] = giveaway_id
+        bisect.insort(self.end_index.setdefault(giveaway.get('guild_id'), []),
+                      (giveaway['end_time'].timestamp(), giveaway_id))
+
+    def _remove_active(self, giveaway_id: int) -> dict:
+        giveaway = self.active_giveaways.pop(giveaway_id)
+        self.giveaway_messages.pop(giveaway['message_id'], None)
+        guild_id = giveaway.get('guild_id')
+        entries = self.end_index.get(guild_id, [])
+        key = (giveaway['end_time'].timestamp(), giveaway_id)
+        position = bisect.bisect_left(entries, key)
+        if position < len(entries) and entries[position] == key:
+            del entries[position]
+        if not entries:
+            self.end_index.pop(guild_id, None)
+        return giveaway
+
+    @staticmethod
+    def _ended_at(giveaway: dict) -> float:
+        # Giveaways ended before 'ended_at' was stored fall back to their scheduled end
+        return giveaway.get('ended_at') or giveaway['end_time'].timestamp()
+
+    def _evict_ended(self) -> int:
+        """Move ended giveaways past the retention window (or the size bound) to the archive file"""
+        cutoff = (datetime.now(timezone.utc) - ENDED_GIVEAWAY_RETENTION).timestamp()
+        evicted = []
+        while self.ended_giveaways:
+            giveaway_id, giveaway = next(iter(self.ended_giveaways.items()))
+            if len(self.ended_giveaways) <= ENDED_GIVEAWAYS_KEPT and self._ended_at(giveaway) > cutoff:
+                break
+            del self.ended_giveaways[giveaway_id]
+            evicted.append((giveaway_id, giveaway))
+        if evicted:
+            try:
+                with open(data_path(GIVEAWAY_ARCHIVE_FILE), "a", encoding="utf-8") as f:
+                    for giveaway_id, giveaway in evicted:
+                        record = {key: value for key, value in giveaway.items() if key != 'participants'}
+                        record.update(id=giveaway_id, end_time=giveaway['end_time'].timestamp(),
+                                      participant_count=len(giveaway['participants']))
+                        f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print(f"❌ Failed to archive {len(evicted)} giveaway(s): {e}")
+        return len(evicted)
+
+    def find_giveaway(self, giveaway_id: int):
+        """Active or recently ended giveaway (archived ones are no longer in memory)"""
+        return self.active_giveaways.get(giveaway_id) or self.ended_giveaways.get(giveaway_id)
+
+    # ---------------------------
+    # Entry tracking from raw reaction events
+    # ---------------------------
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        if str(payload.emoji) != GIVEAWAY_EMOJI:
+            return
+        giveaway_id = self.giveaway_messages.get(payload.message_id)
+        if giveaway_id is None:
+            return
+        if payload.user_id == self.bot.user.id or (payload.member and payload.member.bot):
+            return
+        weight = giveaway_entry_weight(payload.member)
+        self.active_giveaways[giveaway_id]['participants'].add(payload.user_id, weight)
+        self._reconciling.get(giveaway_id, []).append((payload.user_id, weight))
+        self._journal_entry(giveaway_id, payload.user_id, weight)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        if str(payload.emoji) != GIVEAWAY_EMOJI:
+            return
+        giveaway_id = self.giveaway_messages.get(payload.message_id)
+        if giveaway_id is None:
+            return
+        self.active_giveaways[giveaway_id]['participants'].discard(payload.user_id)
+        self._reconciling.get(giveaway_id, []).append((payload.user_id, 0))
+        self._journal_entry(giveaway_id, payload.user_id, 0)
+
+    async def reconcile_giveaway_entries(self):
+        """One-time pass that picks up reactions added or removed while the bot was offline"""
+        for giveaway_id, giveaway in list(self.active_giveaways.items()):
+            if giveaway['ended']:
+                continue
+            channel = self.bot.get_channel(giveaway['channel_id'])
+            if not channel:
+                if self.bot.cluster.sharded and giveaway.get('guild_id') is None:
+                    # Saved before guild ids were stored; it belongs to another cluster
+                    self._forget_giveaway(giveaway_id)
+                continue
+            if giveaway.get('guild_id') is None:
+                # Re-indexed under the guild it turned out to belong to
+                self._remove_active(giveaway_id)
+                giveaway['guild_id'] = channel.guild.id
+                self._add_active(giveaway_id, giveaway)
+            try:
+                message = await channel.fetch_message(giveaway['message_id'])
+            except discord.HTTPException:
+                continue
+            for reaction in message.reactions:
+                if str(reaction.emoji) == GIVEAWAY_EMOJI:
+                    # Pages already read miss reactions changed meanwhile; the raw events are applied on top
+                    self._reconciling[giveaway_id] = events = []
+                    try:
+                        users = [user async for user in reaction.users() if not user.bot]
+                    finally:
+                        del self._reconciling[giveaway_id]
+                    if giveaway_id not in self.active_giveaways:
+                        break  # ended while its reactions were being read
+                    # Entrants already tracked keep their weight: reaction.users() may return
+                    # plain Users (MEMBER_CACHE=lazy/joined) without the roles it comes from
+                    known = giveaway['participants']
+                    weights = [known.weight_of(user.id) or await self._entry_weight(channel.guild, user)
+                               for user in users]
+                    participants = EntrantPool.from_entries([user.id for user in users], weights)
+                    for user_id, weight in events:
+                        if weight:
+                            participants.add(user_id, weight)
+                        else:
+                            participants.discard(user_id)
+                    giveaway['participants'] = participants
+                    break
+        self.save_giveaways()
+
+    async def _entry_weight(self, guild: discord.Guild, user) -> int:
+        if not GIVEAWAY_BONUS_ENTRIES or isinstance(user, discord.Member):
+            return giveaway_entry_weight(user)
+        member = await self.bot.members.fetch(guild, user.id)
+        return giveaway_entry_weight(member)
+
+    def _allocate_giveaway_id(self) -> int:
+        # Clusters interleave IDs so they stay unique bot-wide (unsharded: 1, 2, 3, ...)
+        cluster = self.bot.cluster
+        counter = self.state["next_id"]
+        self.state["next_id"] += 1
+        return counter * cluster.cluster_count + cluster.cluster_id
+
+    def _forget_giveaway(self, giveaway_id: int):
+        self._remove_active(giveaway_id)
+        self.bot.scheduler.cancel(f"giveaway:{giveaway_id}")
+
+    async def end_giveaway(self, giveaway_id: int):
+        """End a giveaway and pick winners"""
+        if giveaway_id not in self.active_giveaways:
+            return
+
+        giveaway = self._remove_active(giveaway_id)
+        giveaway['ended'] = True
+        giveaway['ended_at'] = datetime.now(timezone.utc).timestamp()
+        self.ended_giveaways[giveaway_id] = giveaway
+        self._evict_ended()
+        self.bot.scheduler.cancel(f"giveaway:{giveaway_id}")
+        self.save_giveaways()
+
+        try:
+            channel = self.bot.get_channel(giveaway['channel_id'])
+            if not channel:
+                return
+
+            # Entrants were tracked from reaction events, so no history fetch is needed
+            message = channel.get_partial_message(giveaway['message_id'])
+            participants = giveaway['participants']
+
+            if not participants:
+                embed = discord.Embed(
+                    title=f"🎉 **{giveaway['prize']}** 🎉",
+                    description=f"**Winners:** No participants 😢\n"
+                                f"**Hosted by:** <@{giveaway['host_id']}>\n\n"
+                                f"Giveaway has ended with no participants.",
+                    color=0xff0000)
+                if giveaway.get('image_url'):
+                    embed.set_image(url=giveaway['image_url'])
+                try:
+                    await outbound.submit(Priority.USER, lambda: message.edit(embed=embed), bucket=f"channel:{channel.id}",
+                                          coalesce_key=("edit", message.id))
+                except discord.NotFound:
+                    return
+
+                log_embed = discord.Embed(
+                    title="🎉 Giveaway Ended - No Participants",
+                    description=f"**Prize:** {giveaway['prize']}\n"
+                                f"**Host:** <@{giveaway['host_id']}>\n"
+                                f"**Giveaway ID:** {giveaway_id}\n"
+                                f"**Participants:** 0\n"
+                                f"❌ **No winners** - No one entered the giveaway",
+                    color=0xff0000,
+                    timestamp=datetime.now(timezone.utc))
+                if giveaway.get('image_url'):
+                    log_embed.set_image(url=giveaway['image_url'])
+                await self.bot.send_log(embed=log_embed, guild=channel.guild)
+
+                await outbound.submit(Priority.USER, lambda: channel.send(f"🎉 Giveaway for **{giveaway['prize']}** ended with no participants!"),
+                                      bucket=f"channel:{channel.id}")
+                return
+
+            # Pick winners
+            winners = participants.draw(giveaway['winners'])
+            giveaway['previous_winners'] = winners
+            self.save_giveaways()
+            winners_mentions = ', '.join([f"<@{winner_id}>" for winner_id in winners])
+
+            # Update embed
+            embed = discord.Embed(
+                title=f"🎉 **{giveaway['prize']}** 🎉",
+                description=f"**Winners:** {winners_mentions}\n"
+                            f"**Participants:** {len(participants)}\n"
+                            f"**Hosted by:** <@{giveaway['host_id']}>\n\n"
+                            f"Congratulations to the winners! 🎊",
+                color=0xffa500)
+            embed.set_footer(text=f"Giveaway ID: {giveaway_id} | Ended")
+
+            if giveaway.get('image_url'):
+                embed.set_image(url=giveaway['image_url'])
+
+            try:
+                await outbound.submit(Priority.USER, lambda: message.edit(embed=embed), bucket=f"channel:{channel.id}",
+                                      coalesce_key=("edit", message.id))
+            except discord.NotFound:
+                return
+            winners_text = f"🎉 **Giveaway Ended!** 🎉\n\n**Prize:** {giveaway['prize']}\n**Winners:** {winners_mentions}\n**Host:** <@{giveaway['host_id']}>\nCongratulations! 🎊"
+            await outbound.submit(Priority.USER, lambda: channel.send(winners_text), bucket=f"channel:{channel.id}")
+
+            log_embed = discord.Embed(
+                title="🎉 Giveaway Ended - Winners Selected",
+                description=f"**Prize:** {giveaway['prize']}\n"
+                            f"**Host:** <@{giveaway['host_id']}>\n"
+                            f"**Giveaway ID:** {giveaway_id}\n"
+                            f"**Participants:** {len(participants)}\n"
+                            f"**Winners:** {winners_mentions}",
+                color=0x00ff00,
+                timestamp=datetime.now(timezone.utc))
+            if giveaway.get('image_url'):
+                log_embed.set_image(url=giveaway['image_url'])
+            await self.bot.send_log(embed=log_embed, guild=channel.guild)
+
+        except Exception as e:
+            print(f"Error ending giveaway {giveaway_id}: {e}")
+
+    # SLASH COMMAND FOR GIVEAWAY CREATE
+    @app_commands.command(name="giveaway_create", description="Create a new giveaway")
+    @require_access(Access.GIVEAWAY, "❌ You don't have permission to create giveaways!")
+    async def giveaway_create(self, interaction: discord.Interaction, prize: str, duration: str, winners: int, host: discord.Member = None):
+        """Create a giveaway using slash command"""
+        if host is None:
+            host = interaction.user
+
+        if winners < 1:
+            await interaction.response.send_message("❌ Winners must be at least 1!", ephemeral=True)
+            return
+
+        duration_seconds = parse_duration(duration)
+        if duration_seconds <= 0:
+            await interaction.response.send_message("❌ Please provide a valid duration (e.g., 1h, 30m, 1d, 10s)", ephemeral=True)
+            return
+
+        end_time = datetime.now(timezone.utc) + timedelta(seconds=duration_seconds)
+        giveaway_id = self._allocate_giveaway_id()
+
+        embed = discord.Embed(
+            title=f"🎉 **{prize}** 🎉",
+            description=f"**Winners:** {winners}\n"
+                        f"**Ends:** <t:{int(end_time.timestamp())}:R> (<t:{int(end_time.timestamp())}:F>)\n"
+                        f"**Hosted by:** {host.mention}\n\n"
+                        f"Click the 🎉 button to enter!",
+            color=0x00ff00,
+            timestamp=end_time)
+        embed.set_footer(text=f"Giveaway ID: {giveaway_id} | Ends at")
+
+        await interaction.response.send_message(embed=embed)
+        giveaway_msg = await interaction.original_response()
+        await giveaway_msg.add_reaction(GIVEAWAY_EMOJI)
+
+        self._add_active(giveaway_id, {
+            'message_id': giveaway_msg.id,
+            'channel_id': interaction.channel.id,
+            'guild_id': interaction.guild_id,
+            'prize': prize,
+            'winners': winners,
+            'end_time': end_time,
+            'host_id': host.id,
+            'participants': EntrantPool(),
+            'previous_winners': [],
+            'ended': False,
+            'image_url': None,
+            'entry_seq': 0
+        })
+        self.bot.scheduler.schedule(f"giveaway:{giveaway_id}", end_time, "end_giveaway", {"giveaway_id": giveaway_id},
+                                    guild_id=interaction.guild_id)
+        self.save_giveaways()
+
+        success_msg = f"✅ Giveaway created successfully! ID: `{giveaway_id}`\n**Host:** {host.mention}"
+        await interaction.followup.send(success_msg, ephemeral=True)
+
+        log_embed = discord.Embed(
+            title="🎉 Giveaway Created",
+            description=f"**Prize:** {prize}\n"
+                        f"**Winners:** {winners}\n"
+                        f"**Duration:** {duration}\n"
+                        f"**Ends:** <t:{int(end_time.timestamp())}:F>\n"
+                        f"**Host:** {host.mention}\n"
+                        f"**Created by:** {interaction.user.mention}\n"
+                        f"**Channel:** {interaction.channel.mention}\n"
+                        f"**Giveaway ID:** {giveaway_id}",
+            color=0x00ff00,
+            timestamp=datetime.now(timezone.utc))
+        await self.bot.send_log(embed=log_embed, guild=interaction.guild)
+
+    # SLASH COMMAND FOR GIVEAWAY END
+    @app_commands.command(name="giveaway_end", description="End a giveaway early")
+    @require_access(Access.GIVEAWAY, "❌ You don't have permission to end giveaways!")
+    async def giveaway_end(self, interaction: discord.Interaction, giveaway_id: int):
+        """End a giveaway early using slash command"""
+        giveaway = self.active_giveaways.get(giveaway_id)
+        if giveaway is None or giveaway.get('guild_id', interaction.guild_id) != interaction.guild_id:
+            await interaction.response.send_message("❌ Giveaway not found or already ended.", ephemeral=True)
+            return
+
+        if giveaway['host_id'] != interaction.user.id and not resolver.has(interaction.user, Access.FULL_ADMIN):
+            await interaction.response.send_message("❌ You can only end giveaways that you hosted!", ephemeral=True)
+            return
+
+        await self.end_giveaway(giveaway_id)
+        await interaction.response.send_message(f"✅ Giveaway `{giveaway_id}` ended successfully!")
+
+    # SLASH COMMAND FOR GIVEAWAY LIST
+    @app_commands.command(name="giveaway_list", description="List all active giveaways")
+    async def giveaway_list(self, interaction: discord.Interaction):
+        """List this server's active giveaways, ending soonest first"""
+        guild_id = interaction.guild_id
+        if not self.end_index.get(guild_id):
+            await interaction.response.send_message("📝 No active giveaways!")
+            return
+
+        def render(page: int):
+            entries = self.end_index.get(guild_id, [])
+            page_count = max(1, -(-len(entries) // GIVEAWAY_LIST_PAGE_SIZE))
+            embed = discord.Embed(title="🎉 Active Giveaways", color=0x00ff00)
+            now = datetime.now(timezone.utc)
+            for _, giveaway_id in entries[page * GIVEAWAY_LIST_PAGE_SIZE:(page + 1) * GIVEAWAY_LIST_PAGE_SIZE]:
+                giveaway = self.active_giveaways[giveaway_id]
+                time_left = giveaway['end_time'] - now
+                hours, remainder = divmod(max(0, int(time_left.total_seconds())), 3600)
+                minutes, seconds = divmod(remainder, 60)
+                embed.add_field(
+                    name=f"ID: {giveaway_id} - {giveaway['prize']}",
+                    value=f"Winners: {giveaway['winners']} | Ends in: {hours}h {minutes}m\nHosted by: <@{giveaway['host_id']}>",
+                    inline=False)
+            if not entries:
+                embed.description = "📝 No active giveaways!"
+            embed.set_footer(text=f"{len(entries)} active · page {min(page + 1, page_count)}/{page_count}")
+            return embed, page_count
+
+        await Paginator.send(interaction, render)
+
+    # SLASH COMMAND FOR GIVEAWAY REROLL
+    @app_commands.command(name="giveaway_reroll", description="Reroll winners for an ended giveaway")
+    @require_access(Access.GIVEAWAY, "❌ You don't have permission to reroll giveaways!")
+    async def giveaway_reroll(self, interaction: discord.Interaction, giveaway_id: int, winners: int = 1):
+        """Reroll winners using slash command"""
+        if giveaway_id in self.active_giveaways:
+            await interaction.response.send_message("❌ Giveaway hasn't ended yet!", ephemeral=True)
+            return
+        giveaway = self.ended_giveaways.get(giveaway_id)
+        if giveaway is None or giveaway.get('guild_id', interaction.guild_id) != interaction.guild_id:
+            await interaction.response.send_message(
+                f"❌ Giveaway not found! Ended giveaways can be rerolled for {ENDED_GIVEAWAY_RETENTION.days} days.", ephemeral=True)
+            return
+
+        if not giveaway['participants']:
+            await interaction.response.send_message("❌ No participants to reroll from!", ephemeral=True)
+            return
+
+        # Previous winners are excluded so a reroll always picks someone new
+        new_winners = giveaway['participants'].draw(winners, exclude=giveaway['previous_winners'])
+        if not new_winners:
+            await interaction.response.send_message("❌ No eligible participants left to reroll from!", ephemeral=True)
+            return
+        giveaway['previous_winners'].extend(new_winners)
+        self.save_giveaways()
+        winners_mentions = ', '.join([f"<@{winner_id}>" for winner_id in new_winners])
+
+        await interaction.response.send_message(
+            f"🎉 **Rerolled Winners for** `{giveaway['prize']}`\n\nNew winners: {winners_mentions}\n**Host:** <@{giveaway['host_id']}>")
+
+
+async def setup(bot):
+    await bot.add_cog(Giveaways(bot))
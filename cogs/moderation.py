@@ -0,0 +1,345 @@
+"""Moderation slash commands: timeout, ban, mass ban, kick, roles, nicknames and the case log."""
+import io
+import time
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.bulk import ProgressMessage, WorkerPool, format_eta, parse_ids, read_id_attachment
+from core.deferral import auto_defer
+from core.durations import parse_duration_to_seconds
+from core.paginator import Paginator
+from core.permissions import Access, require_access, resolver
+
+MASS_BAN_MAX_TARGETS = 5000
+MASS_BAN_BULK_SIZE = 200  # users per bulk ban request (Discord's limit)
+MASS_BAN_WORKERS = 4      # concurrent single bans when bulk ban is unavailable
+MAX_DELETE_MESSAGE_SECONDS = 7 * 24 * 3600
+MODLOG_PAGE_SIZE = 8
+CASE_LABELS = {
+    "timeout": "⏳ Timeout",
+    "ban": "🔨 Ban",
+    "kick": "⛔ Kick",
+    "role_add": "🛠️ Role Added",
+    "role_remove": "🗑️ Role Removed",
+    "nickname": "✏️ Nickname",
+}
+
+
+class Moderation(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    def record_case(self, interaction: discord.Interaction, action: str, target, reason: str = None, **details) -> int:
+        """Add a case to the moderation case log (queued, never waits); returns the case number"""
+        return self.bot.case_log.record(interaction.guild_id, action, target.id, interaction.user.id,
+                                        reason, details or None)
+
+    # SLASH COMMAND - TIMEOUT
+    @app_commands.command(name="timeout", description="Timeout a user")
+    @require_access(Access.MODERATION, "❌ You don't have permission to timeout users!")
+    async def timeout_slash(self, interaction: discord.Interaction, user: discord.Member, duration: str, reason: str = None):
+        """Timeout a user using slash command"""
+        seconds = parse_duration_to_seconds(duration)
+        if seconds is None:
+            await interaction.response.send_message("❌ Invalid duration format. Use examples: 30s, 10m, 2h, 1d", ephemeral=True)
+            return
+
+        until = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+        try:
+            await user.edit(timed_out_until=until)
+            case_id = self.record_case(interaction, "timeout", user, reason, duration=duration)
+            await interaction.response.send_message(f"⏳ {user.mention} timed out for {duration}.")
+            await self.bot.send_log(f"⏳ **Timeout** {user.mention} by {interaction.user.mention} for {duration} — Reason: {reason} (case #{case_id})", guild=interaction.guild)
+        except Exception as e:
+            await interaction.response.send_message("❌ Could not apply timeout (bot missing permission or role hierarchy).", ephemeral=True)
+
+    # SLASH COMMAND - BAN
+    @app_commands.command(name="ban", description="Ban a user from the server")
+    @require_access(Access.MODERATION, "❌ You don't have permission to ban users!")
+    async def ban_slash(self, interaction: discord.Interaction, user: discord.Member, reason: str = None):
+        """Ban a user using slash command"""
+        try:
+            await interaction.guild.ban(user, reason=reason)
+            case_id = self.record_case(interaction, "ban", user, reason)
+            await interaction.response.send_message(f"🔨 Banned {user.mention}.")
+            await self.bot.send_log(f"🔨 **Banned** {user.mention} by {interaction.user.mention} — Reason: {reason} (case #{case_id})", guild=interaction.guild)
+        except Exception as e:
+            await interaction.response.send_message("❌ Could not ban that member (missing permissions / role hierarchy).", ephemeral=True)
+
+    # SLASH COMMAND - MASS BAN
+    @app_commands.command(name="massban", description="Ban many users at once (raid response)")
+    @app_commands.describe(
+        ids="User IDs or mentions, separated by spaces, commas or new lines",
+        id_file="Text file with user IDs",
+        joined_within="Also ban members who joined in the last ... (e.g. 10m, 2h)",
+        reason="Reason (shown in the audit log)",
+        delete_messages="Delete their messages from the last ... (e.g. 1h, 1d; at most 7d)",
+        dry_run="Only show who would be banned")
+    @require_access(Access.MODERATION, "❌ You don't have permission to ban users!")
+    async def massban_slash(self, interaction: discord.Interaction, ids: str = None, id_file: discord.Attachment = None,
+                            joined_within: str = None, reason: str = None, delete_messages: str = None,
+                            dry_run: bool = False):
+        """Ban an ID list, an ID file and/or recent joiners with bulk ban requests"""
+        delete_seconds = 0
+        if delete_messages:
+            delete_seconds = parse_duration_to_seconds(delete_messages)
+            if delete_seconds is None:
+                await interaction.response.send_message("❌ Invalid delete_messages duration. Use examples: 1h, 1d", ephemeral=True)
+                return
+            delete_seconds = min(delete_seconds, MAX_DELETE_MESSAGE_SECONDS)
+        joined_seconds = None
+        if joined_within:
+            joined_seconds = parse_duration_to_seconds(joined_within)
+            if joined_seconds is None:
+                await interaction.response.send_message("❌ Invalid joined_within duration. Use examples: 10m, 2h", ephemeral=True)
+                return
+        if not ids and id_file is None and joined_seconds is None:
+            await interaction.response.send_message("❌ Give at least one of: ids, id_file, joined_within.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        guild = interaction.guild
+        targets = dict.fromkeys(parse_ids(ids))  # user_id -> Member when known
+        try:
+            if id_file is not None:
+                targets.update(dict.fromkeys(await read_id_attachment(id_file)))
+        except (ValueError, discord.HTTPException) as e:
+            await interaction.followup.send(f"❌ Could not read the ID file: {e}", ephemeral=True)
+            return
+        if joined_seconds is not None:
+            await interaction.edit_original_response(content="🔍 Looking up recent joins...")
+            for member in await self._recent_joins(guild, joined_seconds):
+                targets[member.id] = member
+
+        ban_ids, skipped = [], {}
+        for user_id, member in targets.items():
+            member = member or self.bot.members.get(guild, user_id)
+            skip = self._mass_ban_skip_reason(interaction, user_id, member)
+            if skip:
+                skipped[skip] = skipped.get(skip, 0) + 1
+            else:
+                ban_ids.append(user_id)
+        skipped_text = ", ".join(f"{count} {why}" for why, count in skipped.items()) or "none"
+
+        if not ban_ids:
+            await interaction.edit_original_response(content=f"❌ Nobody to ban (skipped: {skipped_text}).")
+            return
+        if len(ban_ids) > MASS_BAN_MAX_TARGETS:
+            await interaction.edit_original_response(
+                content=f"❌ {len(ban_ids)} targets; at most {MASS_BAN_MAX_TARGETS} per mass ban. Narrow the filter.")
+            return
+        if dry_run:
+            preview = ", ".join(f"<@{user_id}>" for user_id in ban_ids[:30])
+            more = f" and {len(ban_ids) - 30} more" if len(ban_ids) > 30 else ""
+            await interaction.edit_original_response(
+                content=f"🧪 **Dry run:** would ban {len(ban_ids)} user(s) (skipped: {skipped_text})\n{preview}{more}")
+            return
+
+        audit_reason = f"Mass ban by {interaction.user} ({interaction.user.id}): {reason or 'no reason'}"[:512]
+        progress = ProgressMessage(lambda content: interaction.edit_original_response(content=content))
+        started = time.monotonic()
+        banned, failed, method = await self.mass_ban(guild, ban_ids, audit_reason, delete_seconds, progress, started)
+        elapsed = time.monotonic() - started
+        for user_id in banned:
+            self.record_case(interaction, "ban", discord.Object(id=user_id), reason, mass_ban=True)
+
+        await progress.update(
+            f"✅ **Mass ban finished** in {format_eta(elapsed)} ({method})\n"
+            f"🔨 {len(banned)} banned · ❌ {len(failed)} failed · ⏭️ skipped: {skipped_text}", force=True)
+
+        # One log entry for the whole job, with the full ID lists attached
+        log_embed = discord.Embed(
+            title="🔨 Mass Ban",
+            description=f"**Moderator:** {interaction.user.mention}\n"
+                        f"**Reason:** {reason}\n"
+                        f"**Banned:** {len(banned)} | **Failed:** {len(failed)} | **Skipped:** {skipped_text}\n"
+                        f"**Method:** {method} | **Took:** {format_eta(elapsed)}",
+            color=0xff0000,
+            timestamp=datetime.now(timezone.utc))
+        listing = "\n".join([f"banned {user_id}" for user_id in banned] +
+                            [f"failed {user_id} {error}" for user_id, error in failed])
+        file = discord.File(io.BytesIO(listing.encode()), filename=f"massban-{int(time.time())}.txt")
+        await self.bot.send_log(embed=log_embed, file=file, guild=guild)
+
+    async def _recent_joins(self, guild: discord.Guild, seconds: int) -> list:
+        """Members who joined in the last ``seconds`` (walks the member list when it is not cached)"""
+        since = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+        if guild.chunked:
+            return [member for member in guild.members if member.joined_at and member.joined_at >= since]
+        return [member async for member in guild.fetch_members(limit=None)
+                if member.joined_at and member.joined_at >= since]
+
+    def _mass_ban_skip_reason(self, interaction: discord.Interaction, user_id: int, member):
+        guild = interaction.guild
+        if user_id in (interaction.user.id, self.bot.user.id, guild.owner_id):
+            return "protected"
+        if member is None:
+            return None  # not cached (or not in the server): Discord enforces the hierarchy
+        if resolver.has(member, Access.MODERATION):
+            return "staff"
+        if member.top_role >= guild.me.top_role:
+            return "above the bot"
+        if interaction.user.id != guild.owner_id and member.top_role >= interaction.user.top_role:
+            return "above you"
+        return None
+
+    async def mass_ban(self, guild: discord.Guild, user_ids: list, reason: str, delete_seconds: int,
+                       progress: ProgressMessage, started: float) -> tuple:
+        """Ban ``user_ids``: bulk ban in chunks of 200, single bans through a worker pool for the rest"""
+        banned, failed, fallback = [], [], []
+        method = "bulk ban"
+
+        async def report():
+            done = len(banned) + len(failed)
+            rate = done / max(time.monotonic() - started, 0.001)
+            eta = format_eta((len(user_ids) - done) / rate) if rate else "?"
+            await progress.update(f"🔨 **Mass ban in progress** ({method}): {done}/{len(user_ids)}\n"
+                                  f"✅ {len(banned)} banned · ❌ {len(failed)} failed · ETA {eta}")
+
+        # Guild.bulk_ban needs discord.py 2.4+; older versions only have single bans
+        bulk_offsets = range(0, len(user_ids), MASS_BAN_BULK_SIZE) if hasattr(guild, "bulk_ban") else ()
+        if not bulk_offsets:
+            fallback.extend(user_ids)
+        for offset in bulk_offsets:
+            chunk = user_ids[offset:offset + MASS_BAN_BULK_SIZE]
+            try:
+                result = await guild.bulk_ban([discord.Object(id=user_id) for user_id in chunk],
+                                              reason=reason, delete_message_seconds=delete_seconds)
+            except discord.Forbidden:
+                # Bulk ban also needs Manage Server; single bans only need Ban Members
+                fallback.extend(user_ids[offset:])
+                break
+            except discord.HTTPException:
+                # Discord rejects the whole request when none of the users could be banned:
+                # retry them one by one to get a per-user result
+                fallback.extend(chunk)
+                continue
+            banned.extend(user.id for user in result.banned)
+            failed.extend((user.id, "bulk ban refused") for user in result.failed)
+            await report()
+
+        if fallback:
+            method = "bulk ban + single bans" if banned or failed else "single bans"
+
+            async def ban_one(user_id):
+                await guild.ban(discord.Object(id=user_id), reason=reason, delete_message_seconds=delete_seconds)
+
+            async def on_result(user_id, result, error):
+                if error is None:
+                    banned.append(user_id)
+                else:
+                    failed.append((user_id, getattr(error, "text", None) or type(error).__name__))
+                await report()
+
+            await WorkerPool(ban_one, MASS_BAN_WORKERS, on_result).run(fallback)
+        return banned, failed, method
+
+    # SLASH COMMAND - KICK
+    @app_commands.command(name="kick", description="Kick a user from the server")
+    @require_access(Access.MODERATION, "❌ You don't have permission to kick users!")
+    async def kick_slash(self, interaction: discord.Interaction, user: discord.Member, reason: str = None):
+        """Kick a user using slash command"""
+        try:
+            await interaction.guild.kick(user, reason=reason)
+            case_id = self.record_case(interaction, "kick", user, reason)
+            await interaction.response.send_message(f"⛔ Kicked {user.mention}.")
+            await self.bot.send_log(f"⛔ **Kicked** {user.mention} by {interaction.user.mention} — Reason: {reason} (case #{case_id})", guild=interaction.guild)
+        except Exception as e:
+            await interaction.response.send_message("❌ Could not kick that member (missing permissions / role hierarchy).", ephemeral=True)
+
+    # SLASH COMMAND - GIVE ROLE
+    @app_commands.command(name="give_role", description="Give roles to a user")
+    @require_access(Access.MODERATION, "❌ You don't have permission to give roles!")
+    async def give_role_slash(self, interaction: discord.Interaction, user: discord.Member, role: discord.Role):
+        """Give role to user using slash command"""
+        try:
+            await user.add_roles(role)
+            case_id = self.record_case(interaction, "role_add", user, role_id=role.id, role_name=role.name)
+            await interaction.response.send_message(f"✅ **Role Added!**\n👤 User: {user.mention}\n🎭 Role: {role.name}")
+            await self.bot.send_log(f"🛠️ **Role Added**\nAdmin: {interaction.user.mention}\nUser: {user.mention}\nRole: {role.name}\nCase: #{case_id}", guild=interaction.guild)
+        except Exception:
+            await interaction.response.send_message("❌ Could not add role (check bot permissions and role hierarchy).", ephemeral=True)
+
+    # SLASH COMMAND - REMOVE ROLE
+    @app_commands.command(name="remove_role", description="Remove roles from a user")
+    @require_access(Access.MODERATION, "❌ You don't have permission to remove roles!")
+    async def remove_role_slash(self, interaction: discord.Interaction, user: discord.Member, role: discord.Role):
+        """Remove role from user using slash command"""
+        try:
+            await user.remove_roles(role)
+            case_id = self.record_case(interaction, "role_remove", user, role_id=role.id, role_name=role.name)
+            await interaction.response.send_message(f"🗑️ **Role Removed!**\n👤 User: {user.mention}\n🎭 Removed: {role.name}")
+            await self.bot.send_log(f"🗑️ **Role Removed**\nAdmin: {interaction.user.mention}\nUser: {user.mention}\nRemoved: {role.name}\nCase: #{case_id}", guild=interaction.guild)
+        except Exception:
+            await interaction.response.send_message("❌ Could not remove role (check permissions).", ephemeral=True)
+
+    # SLASH COMMAND - CHANGE NICKNAME
+    @app_commands.command(name="change_nickname", description="Change a user's nickname")
+    @require_access(Access.MODERATION, "❌ You don't have permission to change nicknames!")
+    async def change_nickname_slash(self, interaction: discord.Interaction, user: discord.Member, nickname: str):
+        """Change nickname using slash command"""
+        try:
+            await user.edit(nick=nickname)
+            case_id = self.record_case(interaction, "nickname", user, nickname=nickname)
+            await interaction.response.send_message(f"✏️ Nickname changed for {user.mention} → **{nickname}**")
+            await self.bot.send_log(f"✏️ **Nickname Changed**\nAdmin: {interaction.user.mention}\nUser: {user.mention}\nNew Nickname: **{nickname}**\nCase: #{case_id}", guild=interaction.guild)
+        except Exception:
+            await interaction.response.send_message("❌ I don't have permission to change that nickname.", ephemeral=True)
+
+    # SLASH COMMAND - MODERATION LOG
+    @app_commands.command(name="modlog", description="Show the moderation history of a user or moderator")
+    @app_commands.describe(user="Cases against this user", moderator="Cases by this moderator",
+                           within="Only cases from the last ... (e.g. 7d, 12h)")
+    @require_access(Access.MODERATION)
+    @auto_defer(ephemeral=True)
+    async def modlog_slash(self, interaction: discord.Interaction, user: discord.User = None,
+                           moderator: discord.User = None, within: str = None):
+        """Paginated case history from the local case log"""
+        since = None
+        if within:
+            seconds = parse_duration_to_seconds(within)
+            if seconds is None:
+                await interaction.response.send_message("❌ Invalid duration format. Use examples: 12h, 7d", ephemeral=True)
+                return
+            since = time.time() - seconds
+
+        filters = [f"User: {user.mention}" if user else None,
+                   f"Moderator: {moderator.mention}" if moderator else None,
+                   f"Last {within}" if within else None]
+        description = " · ".join(part for part in filters if part) or "All cases in this server"
+        guild_id = interaction.guild_id
+
+        def render(page: int):
+            cases, total = self.bot.case_log.history(
+                guild_id, target_id=user.id if user else None, moderator_id=moderator.id if moderator else None,
+                since=since, limit=MODLOG_PAGE_SIZE, offset=page * MODLOG_PAGE_SIZE)
+            embed = discord.Embed(title="📒 Moderation Log", description=description, color=0x5865f2)
+            for case in cases:
+                lines = [f"**User:** <@{case.target_id}> · **By:** <@{case.moderator_id}>"]
+                details = case.details or {}
+                if "duration" in details:
+                    lines.append(f"**Duration:** {details['duration']}")
+                if "role_id" in details:
+                    lines.append(f"**Role:** <@&{details['role_id']}>")
+                if "nickname" in details:
+                    lines.append(f"**Nickname:** {details['nickname']}")
+                if case.reason:
+                    lines.append(f"**Reason:** {case.reason[:200]}")
+                mass = " (mass ban)" if details.get("mass_ban") else ""
+                embed.add_field(name=f"#{case.case_id} · {CASE_LABELS.get(case.action, case.action)}{mass}",
+                                value="\n".join(lines) + f"\n<t:{int(case.created_at)}:f>", inline=False)
+            if not cases:
+                embed.add_field(name="\u200b", value="📭 No cases found.", inline=False)
+            page_count = max(1, -(-total // MODLOG_PAGE_SIZE))
+            embed.set_footer(text=f"{total} case(s) · page {min(page + 1, page_count)}/{page_count}")
+            return embed, page_count
+
+        await Paginator.send(interaction, render, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
@@ -0,0 +1,362 @@
+"""Bulk role jobs: add or remove a role for many members, with live progress and resume.
+
+A job's targets (members of another role, entrants of a giveaway, or pasted /
+uploaded IDs) are resolved once and appended to role_job_targets.jsonl when
+the job is created; role_jobs.json only holds each job's cursor and counters,
+so saving progress stays cheap however many targets a job has. The cursor
+only moves past a contiguous prefix of finished targets, so
+a job interrupted by a restart or a reload resumes where it stopped (at worst
+repeating the last few in-flight calls, which are idempotent). Jobs of guilds
+another cluster owns are kept in the file as stored.
+"""
+import asyncio
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.bulk import ProgressMessage, WorkerPool, format_eta, parse_ids, read_id_attachment
+from core.permissions import Access, require_access
+from core.storage import append_jsonl_later, load_json, load_jsonl, save_json_later, save_jsonl
+
+ROLE_JOBS_FILE = "role_jobs.json"
+ROLE_JOB_TARGETS_FILE = "role_job_targets.jsonl"  # [guild_id, job_id, user_ids] per job
+ROLE_JOB_WORKERS = 4
+ROLE_JOB_MAX_TARGETS = 50_000
+ROLE_JOB_KEEP_FINISHED = 20  # finished jobs kept for /bulk_role jobs (without their target lists)
+ROLE_JOB_KEEP_FAILURES = 50  # failed targets stored per job (the count is always exact)
+
+
+def job_progress_text(job_id: int, job: dict, rate: float = None) -> str:
+    total = job['total']
+    verb = "Adding" if job['action'] == "add" else "Removing"
+    percent = job['cursor'] / total * 100 if total else 100
+    header = {
+        "running": f"🎭 **Bulk role #{job_id}**: {verb.lower()} <@&{job['role_id']}>",
+        "finished": f"✅ **Bulk role #{job_id} finished**: {verb.lower()} <@&{job['role_id']}>",
+        "cancelled": f"⏹️ **Bulk role #{job_id} cancelled**: {verb.lower()} <@&{job['role_id']}>",
+    }[job['status']]
+    lines = [header,
+             f"{job['cursor']:,}/{total:,} ({percent:.1f}%) · ✅ {job['changed']:,} changed · "
+             f"⏭️ {job['unchanged']:,} unchanged · ❌ {job['failed_count']:,} failed"]
+    if job['status'] == "running" and rate:
+        lines.append(f"⚡ {rate:.1f}/s · ETA {format_eta((total - job['cursor']) / rate)}")
+    elif job['status'] != "running":
+        lines.append(f"⏱️ Took {format_eta(job['finished_at'] - job['created_at'])}")
+    return "\n".join(lines)
+
+
+class RoleJobs(commands.Cog):
+    bulk_role = app_commands.Group(name="bulk_role", description="Add or remove a role for many members at once",
+                                   guild_only=True)
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Handed over across reloads; see cogs/__init__.py
+        self.state = bot.state.get("role_jobs")
+        self.tasks = self.state.setdefault("tasks", {})  # job_id -> running asyncio.Task
+        self.targets = self.state.setdefault("targets", {})  # job_id -> user IDs of a running job
+
+    async def cog_load(self):
+        if "jobs" not in self.state:
+            stored = load_json(ROLE_JOBS_FILE, {})
+            self.state["next_id"] = stored.get("next_id", 1)
+            self.state["jobs"], self.state["foreign_jobs"] = {}, {}
+            for job_id, job in stored.get("jobs", {}).items():
+                if self.bot.cluster.owns_guild(job['guild_id']):
+                    self.state["jobs"][int(job_id)] = job
+                else:
+                    self.state["foreign_jobs"][job_id] = job
+            self._load_targets()
+        self.jobs = self.state["jobs"]
+        if self.bot.is_ready():
+            self.resume_jobs()
+
+    async def cog_unload(self):
+        # Stored as running, so the reloaded cog picks them up again
+        for task in list(self.tasks.values()):
+            task.cancel()
+        self.tasks.clear()
+        self.save_jobs()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.resume_jobs()
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save_jobs(self):
+        save_json_later(ROLE_JOBS_FILE, lambda: {"next_id": self.state["next_id"],
+                                                  "jobs": {**self.state["foreign_jobs"],
+                                                           **{str(job_id): job for job_id, job in self.jobs.items()}}})
+
+    def _load_targets(self):
+        """Read the target lists of running jobs, dropping those of finished ones from the file"""
+        jobs, foreign = self.state["jobs"], self.state["foreign_jobs"]
+        lines = load_jsonl(ROLE_JOB_TARGETS_FILE)
+        kept = []
+        for line in lines:
+            guild_id, job_id, user_ids = line
+            if job_id in jobs and jobs[job_id]['status'] == "running":
+                self.targets[job_id] = user_ids
+            elif foreign.get(str(job_id), {}).get('status') != "running":
+                continue  # finished: its targets are no longer needed
+            kept.append(line)
+        migrated = False
+        for job_id, job in jobs.items():
+            if 'user_ids' not in job:
+                continue
+            # Saved before the targets had their own file
+            user_ids = job.pop('user_ids')
+            job.setdefault('total', len(user_ids))
+            if job['status'] == "running":
+                self.targets[job_id] = user_ids
+                kept.append([job['guild_id'], job_id, user_ids])
+            migrated = True
+        if migrated or len(kept) != len(lines):
+            save_jsonl(ROLE_JOB_TARGETS_FILE, kept)
+
+    def _allocate_job_id(self) -> int:
+        # Interleaved like giveaway IDs, so jobs of guilds that move between clusters never collide
+        cluster = self.bot.cluster
+        counter = self.state["next_id"]
+        self.state["next_id"] += 1
+        return counter * cluster.cluster_count + cluster.cluster_id
+
+    def _prune_finished(self):
+        finished = sorted(job_id for job_id, job in self.jobs.items() if job['status'] != "running")
+        for job_id in finished[:-ROLE_JOB_KEEP_FINISHED]:
+            del self.jobs[job_id]
+
+    def resume_jobs(self):
+        for job_id, job in self.jobs.items():
+            if job['status'] == "running" and job_id not in self.tasks:
+                print(f"🔁 Resuming bulk role job #{job_id} at {job['cursor']}/{job['total']}")
+                self.start_job(job_id)
+
+    def start_job(self, job_id: int):
+        task = self.tasks[job_id] = asyncio.create_task(self.run_job(job_id))
+        task.add_done_callback(lambda _: self.tasks.pop(job_id, None) if self.tasks.get(job_id) is task else None)
+
+    # ---------------------------
+    # Running a job
+    # ---------------------------
+    async def run_job(self, job_id: int):
+        job = self.jobs[job_id]
+        user_ids = self.targets.get(job_id)
+        guild = self.bot.get_guild(job['guild_id'])
+        role = guild.get_role(job['role_id']) if guild else None
+        if role is None or user_ids is None:
+            job['failed_count'] += job['total'] - job['cursor']
+            job['failures'].append([None, "role or server no longer available" if user_ids is not None
+                                    else "target list was not saved"])
+            await self._finish(job_id, "cancelled")
+            return
+
+        channel = self.bot.get_channel(job['channel_id'])
+        message = channel.get_partial_message(job['message_id']) if channel and job['message_id'] else None
+        progress = ProgressMessage(lambda content: message.edit(content=content), interval=3.0)
+        adding = job['action'] == "add"
+        reason = f"Bulk role job #{job_id} by {job['requested_by']}"
+        started, processed = time.monotonic(), 0
+        finished_indices = set()
+
+        async def apply(index: int):
+            user_id = user_ids[index]
+            member = self.bot.members.get(guild, user_id)
+            if member is not None:
+                # Cached members: skip the call when nothing would change
+                if (member.get_role(role.id) is not None) == adding:
+                    return False
+            # One REST call by ID, without fetching the member first
+            if adding:
+                await self.bot.http.add_role(guild.id, user_id, role.id, reason=reason)
+            else:
+                await self.bot.http.remove_role(guild.id, user_id, role.id, reason=reason)
+            return True
+
+        async def on_result(index: int, changed, error):
+            nonlocal processed
+            processed += 1
+            if error is not None:
+                job['failed_count'] += 1
+                if len(job['failures']) < ROLE_JOB_KEEP_FAILURES:
+                    job['failures'].append([user_ids[index], getattr(error, "text", None) or type(error).__name__])
+            elif changed:
+                job['changed'] += 1
+            else:
+                job['unchanged'] += 1
+            # Advance the cursor over the finished prefix only
+            finished_indices.add(index)
+            while job['cursor'] in finished_indices:
+                finished_indices.discard(job['cursor'])
+                job['cursor'] += 1
+            self.save_jobs()
+            if message is not None:
+                rate = processed / max(time.monotonic() - started, 0.001)
+                await progress.update(job_progress_text(job_id, job, rate))
+
+        pool = WorkerPool(apply, ROLE_JOB_WORKERS, on_result)
+        self.state.setdefault("pools", {})[job_id] = pool
+        try:
+            await pool.run(range(job['cursor'], len(user_ids)))
+        finally:
+            self.state["pools"].pop(job_id, None)
+        await self._finish(job_id, "cancelled" if job.get('cancel_requested') else "finished")
+        if message is not None:
+            await progress.update(job_progress_text(job_id, job), force=True)
+
+    async def _finish(self, job_id: int, status: str):
+        job = self.jobs[job_id]
+        job['status'] = status
+        job['finished_at'] = time.time()
+        self.targets.pop(job_id, None)  # its line is dropped from the targets file on the next start
+        self._prune_finished()
+        self.save_jobs()
+
+        log_embed = discord.Embed(
+            title=f"🎭 Bulk Role Job #{job_id} {status.title()}",
+            description=f"**Action:** {job['action']} <@&{job['role_id']}>\n"
+                        f"**Targets:** {job['source']} ({job['total']:,})\n"
+                        f"**Requested by:** <@{job['requested_by_id']}>\n"
+                        f"**Changed:** {job['changed']:,} | **Unchanged:** {job['unchanged']:,} | "
+                        f"**Failed:** {job['failed_count']:,}\n"
+                        f"**Took:** {format_eta(job['finished_at'] - job['created_at'])}",
+            color=0x00ff00 if status == "finished" else 0xffa500)
+        if job['failures']:
+            listing = "\n".join(f"{'-' if user_id is None else f'<@{user_id}>'}: {error}"
+                                for user_id, error in job['failures'][:10])
+            log_embed.add_field(name="Failures", value=listing[:1024], inline=False)
+        await self.bot.send_log(embed=log_embed, guild=self.bot.get_guild(job['guild_id']))
+
+    # ---------------------------
+    # Targets
+    # ---------------------------
+    async def _role_members(self, guild: discord.Guild, role: discord.Role) -> list:
+        if guild.chunked:
+            return [member.id for member in role.members]
+        # Member cache off or incomplete (MEMBER_CACHE=lazy): walk the member list
+        return [member.id async for member in guild.fetch_members(limit=None) if member.get_role(role.id)]
+
+    async def _resolve_targets(self, interaction: discord.Interaction, from_role, giveaway_id, ids, id_file):
+        """(user_ids, description of the source) or (None, error message)"""
+        user_ids, sources = [], []
+        if from_role is not None:
+            user_ids += await self._role_members(interaction.guild, from_role)
+            sources.append(f"members of {from_role.mention}")
+        if giveaway_id is not None:
+            giveaways = self.bot.get_cog('Giveaways')
+            giveaway = giveaways.find_giveaway(giveaway_id) if giveaways else None
+            if giveaway is None or giveaway.get('guild_id', interaction.guild_id) != interaction.guild_id:
+                return None, f"❌ Giveaway `{giveaway_id}` not found."
+            user_ids += list(giveaway['participants'])
+            sources.append(f"entrants of giveaway #{giveaway_id}")
+        if ids:
+            user_ids += parse_ids(ids)
+            sources.append("pasted IDs")
+        if id_file is not None:
+            try:
+                user_ids += await read_id_attachment(id_file)
+            except (ValueError, discord.HTTPException) as e:
+                return None, f"❌ Could not read the ID file: {e}"
+            sources.append(f"`{id_file.filename}`")
+        if not sources:
+            return None, "❌ Give at least one of: from_role, giveaway_id, ids, id_file."
+        return list(dict.fromkeys(user_ids)), " + ".join(sources)
+
+    # ---------------------------
+    # Commands
+    # ---------------------------
+    async def _create_job(self, interaction: discord.Interaction, action: str, role: discord.Role,
+                          from_role, giveaway_id, ids, id_file):
+        guild = interaction.guild
+        if role.managed or role.is_default():
+            await interaction.response.send_message("❌ That role can't be assigned.", ephemeral=True)
+            return
+        if role >= guild.me.top_role or (interaction.user.id != guild.owner_id and role >= interaction.user.top_role):
+            await interaction.response.send_message("❌ That role is above my (or your) highest role.", ephemeral=True)
+            return
+        if any(job['guild_id'] == guild.id and job['status'] == "running" for job in self.jobs.values()):
+            await interaction.response.send_message("❌ A bulk role job is already running here. "
+                                                    "See `/bulk_role jobs` or cancel it first.", ephemeral=True)
+            return
+
+        await interaction.response.defer(thinking=True)
+        user_ids, source = await self._resolve_targets(interaction, from_role, giveaway_id, ids, id_file)
+        if user_ids is None:
+            await interaction.followup.send(source)
+            return
+        if not user_ids:
+            await interaction.followup.send(f"❌ No targets found ({source}).")
+            return
+        if len(user_ids) > ROLE_JOB_MAX_TARGETS:
+            await interaction.followup.send(f"❌ {len(user_ids):,} targets; at most {ROLE_JOB_MAX_TARGETS:,} per job.")
+            return
+
+        job_id = self._allocate_job_id()
+        # Written once; progress saves only touch the small job record below
+        self.targets[job_id] = user_ids
+        append_jsonl_later(ROLE_JOB_TARGETS_FILE, [guild.id, job_id, user_ids])
+        job = self.jobs[job_id] = {
+            'guild_id': guild.id, 'channel_id': interaction.channel_id, 'message_id': None,
+            'role_id': role.id, 'action': action, 'source': source,
+            'requested_by': str(interaction.user), 'requested_by_id': interaction.user.id,
+            'total': len(user_ids), 'cursor': 0, 'changed': 0, 'unchanged': 0,
+            'failed_count': 0, 'failures': [], 'status': "running", 'created_at': time.time(),
+        }
+        # The live progress is an ordinary message so it can still be edited after a restart
+        message = await interaction.followup.send(job_progress_text(job_id, job), wait=True)
+        job['message_id'] = message.id
+        self.save_jobs()
+        self.start_job(job_id)
+
+    @bulk_role.command(name="add", description="Give a role to many members")
+    @app_commands.describe(role="Role to give", from_role="Everyone with this role", giveaway_id="Everyone who entered this giveaway",
+                           ids="User IDs or mentions", id_file="Text file with user IDs")
+    @require_access(Access.MODERATION, "❌ You don't have permission to give roles!")
+    async def bulk_role_add(self, interaction: discord.Interaction, role: discord.Role, from_role: discord.Role = None,
+                            giveaway_id: int = None, ids: str = None, id_file: discord.Attachment = None):
+        await self._create_job(interaction, "add", role, from_role, giveaway_id, ids, id_file)
+
+    @bulk_role.command(name="remove", description="Remove a role from many members")
+    @app_commands.describe(role="Role to remove", from_role="Everyone with this role", giveaway_id="Everyone who entered this giveaway",
+                           ids="User IDs or mentions", id_file="Text file with user IDs")
+    @require_access(Access.MODERATION, "❌ You don't have permission to remove roles!")
+    async def bulk_role_remove(self, interaction: discord.Interaction, role: discord.Role, from_role: discord.Role = None,
+                               giveaway_id: int = None, ids: str = None, id_file: discord.Attachment = None):
+        await self._create_job(interaction, "remove", role, from_role, giveaway_id, ids, id_file)
+
+    @bulk_role.command(name="jobs", description="Show running and recent bulk role jobs")
+    @require_access(Access.MODERATION)
+    async def bulk_role_jobs(self, interaction: discord.Interaction):
+        jobs = [(job_id, job) for job_id, job in sorted(self.jobs.items(), reverse=True)
+                if job['guild_id'] == interaction.guild_id][:10]
+        if not jobs:
+            await interaction.response.send_message("📭 No bulk role jobs yet.", ephemeral=True)
+            return
+        await interaction.response.send_message("\n\n".join(job_progress_text(job_id, job) for job_id, job in jobs),
+                                                ephemeral=True)
+
+    @bulk_role.command(name="cancel", description="Stop a running bulk role job")
+    @require_access(Access.MODERATION)
+    async def bulk_role_cancel(self, interaction: discord.Interaction, job_id: int):
+        job = self.jobs.get(job_id)
+        if job is None or job['guild_id'] != interaction.guild_id or job['status'] != "running":
+            await interaction.response.send_message(f"❌ No running job #{job_id}.", ephemeral=True)
+            return
+        job['cancel_requested'] = True
+        pool = self.state.get("pools", {}).get(job_id)
+        if pool is not None:
+            pool.stop()  # calls in flight finish, then the job is marked cancelled
+        else:
+            task = self.tasks.pop(job_id, None)
+            if task is not None:
+                task.cancel()
+            await self._finish(job_id, "cancelled")
+        await interaction.response.send_message(f"⏹️ Stopping bulk role job #{job_id}...", ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(RoleJobs(bot))
@@ -0,0 +1,112 @@
+"""Per-guild configuration commands (/config), backed by core/guildconfig.py."""
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from config import TICKET_WELCOME_MESSAGES
+from core.guildconfig import SETTINGS
+from core.permissions import Access, require_access
+
+ROLE_LEVELS = {
+    "full_admin": "full_admin_role_ids",
+    "ticket_admin": "ticket_admin_role_ids",
+    "giveaway": "giveaway_role_ids",
+    "support": "support_role_ids",
+}
+TICKET_TYPES = tuple(TICKET_WELCOME_MESSAGES)
+DENIED = "❌ You don't have permission to change the bot configuration!"
+
+
+def describe_setting(kind: str, value) -> str:
+    if kind == "channel":
+        return f"<#{value}>" if value else "*not set*"
+    if kind == "roles":
+        return ", ".join(f"<@&{role_id}>" for role_id in value) or "*none*"
+    if kind == "messages":
+        return "\n".join(f"**{ticket_type}:** {text[:80]}{'…' if len(text) > 80 else ''}"
+                         for ticket_type, text in value.items())
+    return f"`{value}`"
+
+
+class Settings(commands.Cog):
+    config = app_commands.Group(name="config", description="View or change this server's bot configuration",
+                                guild_only=True)
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @property
+    def store(self):
+        return self.bot.guild_config
+
+    async def _changed(self, interaction: discord.Interaction, message: str):
+        await interaction.response.send_message(f"✅ {message}", ephemeral=True)
+        await self.bot.send_log(f"⚙️ **Config Changed** by {interaction.user.mention}: {message}", guild=interaction.guild)
+
+    @config.command(name="show", description="Show this server's configuration")
+    @require_access(Access.FULL_ADMIN, DENIED)
+    async def config_show(self, interaction: discord.Interaction):
+        settings = self.store.get(interaction.guild_id)
+        overridden = self.store.overrides(interaction.guild_id)
+        embed = discord.Embed(title="⚙️ Server Configuration", color=0x3498db)
+        for key, kind in SETTINGS.items():
+            marker = "" if key in overridden else " (default)"
+            embed.add_field(name=f"{key}{marker}", value=describe_setting(kind, settings[key])[:1024], inline=False)
+        embed.set_footer(text="Full admins always have every permission level")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @config.command(name="log_channel", description="Set the channel bot logs are sent to")
+    @require_access(Access.FULL_ADMIN, DENIED)
+    async def config_log_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
+        self.store.set(interaction.guild_id, "log_channel_id", channel.id)
+        await self._changed(interaction, f"Log channel set to {channel.mention}")
+
+    @config.command(name="role", description="Grant or revoke a permission level for a role")
+    @app_commands.choices(
+        level=[app_commands.Choice(name=name, value=name) for name in ROLE_LEVELS],
+        action=[app_commands.Choice(name="add", value="add"), app_commands.Choice(name="remove", value="remove")])
+    @require_access(Access.FULL_ADMIN, DENIED)
+    async def config_role(self, interaction: discord.Interaction, level: str, action: str, role: discord.Role):
+        key = ROLE_LEVELS[level]
+        role_ids = list(self.store.get(interaction.guild_id)[key])
+        if action == "add":
+            if role.id in role_ids:
+                await interaction.response.send_message(f"❌ {role.mention} already has **{level}**.", ephemeral=True)
+                return
+            role_ids.append(role.id)
+        else:
+            if role.id not in role_ids:
+                await interaction.response.send_message(f"❌ {role.mention} does not have **{level}**.", ephemeral=True)
+                return
+            role_ids.remove(role.id)
+        self.store.set(interaction.guild_id, key, role_ids)
+        verb = "granted to" if action == "add" else "revoked from"
+        await self._changed(interaction, f"**{level}** {verb} {role.mention}")
+
+    @config.command(name="ticket_category", description="Set the name of the ticket category")
+    @require_access(Access.FULL_ADMIN, DENIED)
+    async def config_ticket_category(self, interaction: discord.Interaction, name: app_commands.Range[str, 1, 90]):
+        self.store.set(interaction.guild_id, "ticket_category_name", name)
+        await self._changed(interaction, f"Ticket category set to `{name}` (overflow: `{name}-2`, ...)")
+
+    @config.command(name="welcome_message", description="Set the welcome message of a ticket type")
+    @app_commands.choices(ticket_type=[app_commands.Choice(name=name, value=name) for name in TICKET_TYPES])
+    @require_access(Access.FULL_ADMIN, DENIED)
+    async def config_welcome_message(self, interaction: discord.Interaction, ticket_type: str,
+                                     message: app_commands.Range[str, 1, 1500]):
+        messages = dict(self.store.get(interaction.guild_id)["ticket_welcome_messages"])
+        messages[ticket_type] = message.replace("\\n", "\n")
+        self.store.set(interaction.guild_id, "ticket_welcome_messages", messages)
+        await self._changed(interaction, f"{ticket_type.title()} ticket message updated")
+
+    @config.command(name="reset", description="Reset one setting (or all of them) to the default")
+    @app_commands.choices(setting=[app_commands.Choice(name="all", value="all")] +
+                                  [app_commands.Choice(name=key, value=key) for key in SETTINGS])
+    @require_access(Access.FULL_ADMIN, DENIED)
+    async def config_reset(self, interaction: discord.Interaction, setting: str):
+        self.store.reset(interaction.guild_id, None if setting == "all" else setting)
+        await self._changed(interaction, f"Reset {'every setting' if setting == 'all' else f'`{setting}`'} to the default")
+
+
+async def setup(bot):
+    await bot.add_cog(Settings(bot))
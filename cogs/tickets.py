@@ -0,0 +1,557 @@
+"""Ticket system: panel, per-user ticket channels, scheduled close with Reopen."""
+import asyncio
+import functools
+import re
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from config import TICKET_WELCOME_MESSAGES
+from core.outbound import Priority, outbound
+from core.permissions import Access, require_access, resolver
+from core.storage import load_json, save_json_later
+
+TICKET_TYPES = tuple(TICKET_WELCOME_MESSAGES)
+TICKET_PANELS_FILE = "ticket_panels.json"
+TICKET_PANEL_SCAN_LIMIT = 25  # history fallback when the stored panel message is gone
+TICKET_CLOSE_DELAY = 10  # seconds between "Close Ticket" and the channel being deleted
+TICKET_CATEGORY_CHANNEL_LIMIT = 50  # Discord's per-category channel limit
+TICKET_TOPIC_OWNER_RE = re.compile(r"Owner: (\d+)")
+TICKET_TOPIC_TYPE_RE = re.compile(r"Type: (\w+)")
+
+
+@functools.lru_cache(maxsize=64)
+def category_pattern(name: str):
+    """Matches the guild's ticket category and its overflow categories: tickets, tickets-2, ..."""
+    return re.compile(rf"{re.escape(name)}(?:-(\d+))?")
+
+class TicketView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    @discord.ui.button(label="Support Ticket", style=discord.ButtonStyle.blurple, custom_id="support_ticket")
+    async def support_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        ticket_system = interaction.client.get_cog('TicketSystem')
+        if ticket_system:
+            await ticket_system.create_ticket(interaction, "support", "🛠️ Support Ticket")
+
+    @discord.ui.button(label="Invite Rewards", style=discord.ButtonStyle.green, custom_id="invite_ticket")
+    async def invite_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        ticket_system = interaction.client.get_cog('TicketSystem')
+        if ticket_system:
+            await ticket_system.create_ticket(interaction, "invite", "🎁 Invite Rewards")
+
+    @discord.ui.button(label="Giveaway Claim", style=discord.ButtonStyle.gray, custom_id="giveaway_ticket")
+    async def giveaway_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        ticket_system = interaction.client.get_cog('TicketSystem')
+        if ticket_system:
+            await ticket_system.create_ticket(interaction, "giveaway", "🎉 Giveaway Claim")
+
+class CloseTicketView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    @discord.ui.button(label="Close Ticket", style=discord.ButtonStyle.red, custom_id="close_ticket")
+    async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # Check if user has ticket admin access
+        if not resolver.has(interaction.user, Access.SUPPORT):
+            await interaction.response.send_message("❌ You don't have permission to close tickets.", ephemeral=True)
+            return
+
+        await interaction.response.defer()
+        ticket_system = interaction.client.get_cog('TicketSystem')
+        if ticket_system:
+            await ticket_system.close_ticket(interaction)
+
+class ReopenTicketView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    @discord.ui.button(label="Reopen", style=discord.ButtonStyle.green, custom_id="reopen_ticket")
+    async def reopen_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        ticket_system = interaction.client.get_cog('TicketSystem')
+        if ticket_system:
+            await ticket_system.reopen_ticket(interaction)
+
+class TicketSystem(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Handed over across reloads; see cogs/__init__.py
+        self.state = state = bot.state.get("tickets")
+        self.ticket_data = state.setdefault("ticket_data", {})
+        self.user_tickets = state.setdefault("user_tickets", {})            # (guild_id, user_id) -> channel_id of their open ticket
+        self._creating = state.setdefault("creating", set())                # (guild_id, user_id) of tickets being created
+        self._category_ids = state.setdefault("category_ids", {})          # guild_id -> ticket category IDs (tickets, tickets-2, ...)
+        self._category_locks = state.setdefault("category_locks", {})      # guild_id -> lock making category choice/creation single-flight
+        self._category_pending = state.setdefault("category_pending", {})  # category_id -> ticket channels being created in it
+        self._category_unseen = state.setdefault("category_unseen", {})    # category_id -> IDs of created channels not in category.channels yet
+        self.panels = {}  # "guild_id" -> {"channel_id": message_id}
+        self._views = []
+
+    async def cog_load(self):
+        self.bot.scheduler.register("close_ticket", self.finish_close)
+        if "panels" not in self.state:
+            # Panels of guilds another cluster owns are written back as stored
+            self.state["panels"], self.state["foreign_panels"] = {}, {}
+            for guild_id, panels in load_json(TICKET_PANELS_FILE, {}).items():
+                owned = self.bot.cluster.owns_guild(int(guild_id))
+                self.state["panels" if owned else "foreign_panels"][guild_id] = panels
+        self.panels = self.state["panels"]
+        # Adding them again replaces the persistent views of a previous load
+        self._views = [TicketView(), CloseTicketView(), ReopenTicketView()]
+        for view in self._views:
+            self.bot.add_view(view)
+        if self.bot.is_ready():
+            self._rebuild_index_once()
+
+    async def cog_unload(self):
+        self.bot.scheduler.unregister("close_ticket", self.finish_close)
+        for view in self._views:
+            view.stop()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._rebuild_index_once()
+
+    def _rebuild_index_once(self):
+        if not self.state.get("index_rebuilt"):
+            self.state["index_rebuilt"] = True
+            self.rebuild_index()
+
+    @commands.Cog.listener()
+    async def on_guild_config_update(self, guild_id: int, key: str):
+        if key in (None, "ticket_category_name"):
+            self._category_ids.pop(guild_id, None)
+
+    # ---------------------------
+    # Ticket index
+    # ---------------------------
+    def _track_ticket(self, channel_id: int, data: dict):
+        self.ticket_data[channel_id] = data
+        if not data['closed']:
+            self.user_tickets[(data['guild_id'], data['user_id'])] = channel_id
+
+    def _untrack_ticket(self, channel_id: int):
+        data = self.ticket_data.pop(channel_id, None)
+        if data is None:
+            return
+        key = (data['guild_id'], data['user_id'])
+        if self.user_tickets.get(key) == channel_id:
+            del self.user_tickets[key]
+
+    def rebuild_index(self):
+        """Rebuild ticket_data and the user index from the ticket category channels (one pass)"""
+        for guild in self.bot.guilds:
+            for category in self._ticket_categories(guild):
+                for channel in category.text_channels:
+                    data = self._parse_ticket_channel(channel)
+                    if data:
+                        self._track_ticket(channel.id, data)
+        print(f"✅ Rebuilt ticket index: {len(self.user_tickets)} open ticket(s)")
+
+    # ---------------------------
+    # Ticket categories
+    # ---------------------------
+    def _ticket_categories(self, guild: discord.Guild):
+        """Cached ticket categories of a guild, in overflow order"""
+        ids = self._category_ids.get(guild.id)
+        if ids is None:
+            pattern = category_pattern(self.bot.guild_config.get(guild.id)["ticket_category_name"])
+            found = []
+            for category in guild.categories:
+                match = pattern.fullmatch(category.name)
+                if match:
+                    found.append((int(match.group(1) or 1), category.id))
+            ids = self._category_ids[guild.id] = [category_id for _, category_id in sorted(found)]
+
+        categories = []
+        for category_id in ids:
+            category = guild.get_channel(category_id)
+            if isinstance(category, discord.CategoryChannel):
+                categories.append(category)
+        return categories
+
+    def _has_room(self, category: discord.CategoryChannel) -> bool:
+        unseen = self._category_unseen.get(category.id)
+        if unseen:
+            # Until its CHANNEL_CREATE arrives, a new channel is missing from category.channels
+            unseen.difference_update(channel.id for channel in category.channels)
+            if not unseen:
+                del self._category_unseen[category.id]
+        used = len(category.channels) + self._category_pending.get(category.id, 0) + len(unseen or ())
+        return used < TICKET_CATEGORY_CHANNEL_LIMIT
+
+    async def get_ticket_category(self, guild: discord.Guild) -> discord.CategoryChannel:
+        """Pick a ticket category with room and reserve a slot in it (creating tickets-N if all are full)"""
+        lock = self._category_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            categories = self._ticket_categories(guild)
+            category = next((c for c in categories if self._has_room(c)), None)
+            if category is None:
+                base_name = self.bot.guild_config.get(guild.id)["ticket_category_name"]
+                pattern = category_pattern(base_name)
+                numbers = [int(pattern.fullmatch(c.name).group(1) or 1)
+                           for c in categories if pattern.fullmatch(c.name)]
+                name = base_name if not numbers else f"{base_name}-{max(numbers) + 1}"
+                overwrites = {
+                    guild.default_role: discord.PermissionOverwrite(view_channel=False),
+                    guild.me: discord.PermissionOverwrite(view_channel=True, manage_channels=True)
+                }
+                category = await guild.create_category(name, overwrites=overwrites)
+                self._category_ids.setdefault(guild.id, []).append(category.id)
+            self._category_pending[category.id] = self._category_pending.get(category.id, 0) + 1
+            return category
+
+    def _release_category_slot(self, category_id: int):
+        remaining = self._category_pending.get(category_id, 0) - 1
+        if remaining > 0:
+            self._category_pending[category_id] = remaining
+        else:
+            self._category_pending.pop(category_id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if isinstance(channel, discord.CategoryChannel):
+            ids = self._category_ids.get(channel.guild.id)
+            if ids and channel.id in ids:
+                ids.remove(channel.id)
+            self._category_unseen.pop(channel.id, None)
+        elif channel.category_id in self._category_unseen:
+            # Deleted before the gateway reported it in its category
+            self._category_unseen[channel.category_id].discard(channel.id)
+
+    def _parse_ticket_channel(self, channel: discord.TextChannel):
+        """Recover owner and type from the channel topic, falling back to overwrites and name"""
+        topic = channel.topic or ""
+        owner_match = TICKET_TOPIC_OWNER_RE.search(topic)
+        type_match = TICKET_TOPIC_TYPE_RE.search(topic)
+
+        user_id = int(owner_match.group(1)) if owner_match else None
+        if user_id is None:
+            for target in channel.overwrites:
+                # Uncached members come back as discord.Object(type=discord.Member)
+                is_member = isinstance(target, discord.Member) or getattr(target, 'type', None) is discord.Member
+                if is_member and target.id != self.bot.user.id and not getattr(target, 'bot', False):
+                    user_id = target.id
+                    break
+        if user_id is None:
+            return None
+
+        ticket_type = type_match.group(1) if type_match else channel.name.split("-", 1)[0]
+        if ticket_type not in TICKET_TYPES:
+            ticket_type = "support"
+
+        return {
+            'guild_id': channel.guild.id,
+            'user_id': user_id,
+            'ticket_type': ticket_type,
+            'created_at': channel.created_at.astimezone().replace(tzinfo=None),
+            'closed': f"ticket_close:{channel.id}" in self.bot.scheduler
+        }
+
+    def _save_panels(self):
+        save_json_later(TICKET_PANELS_FILE, lambda: {**self.state["foreign_panels"], **self.panels})
+
+    def _panel_message_id(self, channel):
+        return self.panels.get(str(channel.guild.id), {}).get(str(channel.id))
+
+    def _store_panel(self, channel, message_id):
+        self.panels.setdefault(str(channel.guild.id), {})[str(channel.id)] = message_id
+        self._save_panels()
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        guild_panels = self.panels.get(str(payload.guild_id))
+        if guild_panels and guild_panels.get(str(payload.channel_id)) == payload.message_id:
+            del guild_panels[str(payload.channel_id)]
+            self._save_panels()
+
+    async def create_ticket_panel(self, channel_id):
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return
+
+        embed = discord.Embed(
+            title="🎫 Ticket System",
+            description="**Support Ticket** - Get help from staff.\n"
+                        "**Invite Rewards** - Claim rewards for invites.\n"
+                        "**Giveaway Claim** - Claim giveaway prizes.\n\n"
+                        "Click one of the buttons below to create a ticket.",
+            color=0x3498db)
+        embed.set_footer(text="PVB Bot - Ticket System")
+
+        view = TicketView()
+
+        # Stored panel: edit it directly, no history scan
+        message_id = self._panel_message_id(channel)
+        if message_id:
+            try:
+                return await channel.get_partial_message(message_id).edit(embed=embed, view=view)
+            except discord.NotFound:
+                pass
+
+        # Stored message gone (or panel predates stored locations): bounded scan for an old panel
+        existing_message = None
+        async with outbound.slot(Priority.BACKGROUND, bucket=f"channel:{channel.id}"):
+            async for message in channel.history(limit=TICKET_PANEL_SCAN_LIMIT):
+                if message.author == self.bot.user and message.embeds:
+                    if "Ticket System" in (message.embeds[0].title or ""):
+                        existing_message = message
+                        break
+
+        if existing_message:
+            # Update existing message silently (no new message)
+            message = await existing_message.edit(embed=embed, view=view)
+        else:
+            # Send new message only if no existing panel found
+            message = await channel.send(embed=embed, view=view)
+        self._store_panel(channel, message.id)
+        return message
+
+    async def create_ticket(self, interaction: discord.Interaction, ticket_type: str, ticket_name: str):
+        user = interaction.user
+        guild = interaction.guild
+
+        key = (guild.id, user.id)
+        channel_id = self.user_tickets.get(key)
+        if channel_id is not None:
+            channel = guild.get_channel(channel_id)
+            if channel:
+                await interaction.followup.send(f"You already have an open ticket: {channel.mention}", ephemeral=True)
+                return
+            self._untrack_ticket(channel_id)
+
+        if key in self._creating:
+            await interaction.followup.send("⏳ Your ticket is already being created.", ephemeral=True)
+            return
+        self._creating.add(key)
+        try:
+            await self._create_ticket(interaction, ticket_type, ticket_name)
+        finally:
+            self._creating.discard(key)
+
+    async def _create_ticket(self, interaction: discord.Interaction, ticket_type: str, ticket_name: str):
+        user = interaction.user
+        guild = interaction.guild
+        settings = self.bot.guild_config.get(guild.id)
+
+        category = await self.get_ticket_category(guild)
+
+        channel_name = f"{ticket_type}-{user.name}-{user.discriminator}".lower().replace(" ", "-")
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            user: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True),
+            guild.me: discord.PermissionOverwrite(view_channel=True, manage_channels=True)
+        }
+
+        # Add support role IDs instead of role names
+        for role_id in settings["full_admin_role_ids"] + settings["support_role_ids"]:
+            role = guild.get_role(role_id)
+            if role:
+                overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True, manage_messages=True)
+
+        try:
+            ticket_channel = await category.create_text_channel(
+                name=channel_name,
+                overwrites=overwrites,
+                topic=f"{ticket_name} for {user.display_name} | Created at {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                      f" | Owner: {user.id} | Type: {ticket_type}"
+            )
+            # Keeps counting against the category until the gateway adds it to category.channels
+            self._category_unseen.setdefault(category.id, set()).add(ticket_channel.id)
+        finally:
+            self._release_category_slot(category.id)
+
+        self._track_ticket(ticket_channel.id, {
+            'guild_id': guild.id,
+            'user_id': user.id,
+            'ticket_type': ticket_type,
+            'created_at': datetime.now(),
+            'closed': False
+        })
+
+        welcome_message = settings["ticket_welcome_messages"].get(ticket_type, "Welcome to your ticket!")
+        embed = discord.Embed(
+            title=ticket_name,
+            description=f"Hello {user.mention}!\n\n{welcome_message}\n\n"
+                        f"**Ticket Type:** {ticket_name}\n"
+                        f"**Created:** <t:{int(datetime.now().timestamp())}:F>\n"
+                        f"**User:** {user.display_name}",
+            color=0x3498db)
+
+        if ticket_type == "support":
+            embed.add_field(
+                name="📝 Support Instructions",
+                value="Please describe your issue in detail. Include:\n• What happened\n• When it occurred\n• Any error messages",
+                inline=False)
+        elif ticket_type == "invite":
+            embed.add_field(
+                name="🎁 Invite Rewards",
+                value="Please provide:\n• Your invite code\n• Number of invites\n• Screenshots if available",
+                inline=False)
+        elif ticket_type == "giveaway":
+            embed.add_field(
+                name="🎉 Giveaway Claim",
+                value="Please provide:\n• Giveaway ID or name\n• Your username\n• Proof of winning",
+                inline=False)
+
+        close_view = CloseTicketView()
+        await ticket_channel.send(embed=embed, view=close_view)
+        await interaction.followup.send(f"✅ Ticket created: {ticket_channel.mention}", ephemeral=True)
+
+        log_embed = discord.Embed(
+            title="🎫 Ticket Created",
+            description=f"**Type:** {ticket_name}\n"
+                        f"**User:** {user.mention} ({user.id})\n"
+                        f"**Channel:** {ticket_channel.mention}\n"
+                        f"**Time:** <t:{int(datetime.now().timestamp())}:F>",
+            color=0x00ff00)
+        await self.bot.send_log(embed=log_embed, guild=guild)
+
+    async def close_ticket(self, interaction: discord.Interaction, channel_id: int = None):
+        channel = interaction.channel if not channel_id else self.bot.get_channel(channel_id)
+        if not channel:
+            await interaction.followup.send("❌ Channel not found.", ephemeral=True)
+            return
+
+        ticket_data = self.ticket_data.get(channel.id)
+        if not ticket_data:
+            await interaction.followup.send("❌ This channel is not a valid ticket.", ephemeral=True)
+            return
+
+        if ticket_data['closed']:
+            await interaction.followup.send("❌ This ticket is already closed.", ephemeral=True)
+            return
+
+        ticket_data['closed'] = True
+        self.user_tickets.pop((ticket_data['guild_id'], ticket_data['user_id']), None)
+
+        # The close itself is a scheduler job: one message now, no countdown edits,
+        # and it still happens after a restart unless someone presses Reopen
+        close_at = datetime.now(timezone.utc) + timedelta(seconds=TICKET_CLOSE_DELAY)
+        self.bot.scheduler.schedule(f"ticket_close:{channel.id}", close_at, "close_ticket", {
+            "channel_id": channel.id,
+            "closed_by_id": interaction.user.id,
+            "user_id": ticket_data['user_id'],
+            "ticket_type": ticket_data['ticket_type'],
+            "created_at": ticket_data['created_at'].timestamp()
+        }, guild_id=channel.guild.id)
+
+        await channel.send(f"🔒 **This ticket will close <t:{int(close_at.timestamp())}:R>.**", view=ReopenTicketView())
+
+    async def reopen_ticket(self, interaction: discord.Interaction):
+        """Cancel a pending close (ticket owner or support staff)"""
+        channel = interaction.channel
+        ticket_data = self.ticket_data.get(channel.id)
+        if not ticket_data:
+            await interaction.response.send_message("❌ This channel is not a valid ticket.", ephemeral=True)
+            return
+
+        if interaction.user.id != ticket_data['user_id'] and not resolver.has(interaction.user, Access.SUPPORT):
+            await interaction.response.send_message("❌ You don't have permission to reopen this ticket.", ephemeral=True)
+            return
+
+        if not self.bot.scheduler.cancel(f"ticket_close:{channel.id}"):
+            await interaction.response.send_message("❌ This ticket is not scheduled to close.", ephemeral=True)
+            return
+
+        ticket_data['closed'] = False
+        self._track_ticket(channel.id, ticket_data)
+        await interaction.response.edit_message(content=f"🔓 **Ticket reopened by {interaction.user.mention}.**", view=None)
+
+    async def finish_close(self, channel_id: int, closed_by_id: int, user_id: int, ticket_type: str, created_at: float):
+        """Scheduler job: log, notify the ticket owner and delete the channel"""
+        self._untrack_ticket(channel_id)
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return
+
+        # Not necessarily cached (MEMBER_CACHE=lazy): fall back to fetching them
+        user = await self.bot.members.fetch(channel.guild, user_id)
+        closed_by = await self.bot.members.fetch(channel.guild, closed_by_id)
+
+        log_embed = discord.Embed(
+            title="🎫 Ticket Closed",
+            description=f"**Type:** {ticket_type.title()} Ticket\n"
+                        f"**User:** {user.mention if user else 'Unknown'} ({user_id})\n"
+                        f"**Channel:** #{channel.name}\n"
+                        f"**Closed by:** <@{closed_by_id}>\n"
+                        f"**Duration:** {datetime.now() - datetime.fromtimestamp(created_at)}",
+            color=0xff0000)
+        await self.bot.send_log(embed=log_embed, guild=channel.guild)
+
+        try:
+            if user:
+                try:
+                    user_embed = discord.Embed(
+                        title="🎫 Ticket Closed",
+                        description=f"Your {ticket_type} ticket has been closed.\n"
+                                    f"**Closed by:** {closed_by.display_name if closed_by else 'Staff'}\n"
+                                    f"**Channel:** #{channel.name}",
+                        color=0xff0000)
+                    await user.send(embed=user_embed)
+                except:
+                    pass
+        except:
+            pass
+
+        await channel.delete()
+
+    # ---------------------------
+    # Commands
+    # ---------------------------
+    # SLASH COMMAND - TICKET SETUP
+    @app_commands.command(name="ticket_setup", description="Setup the ticket system in a channel")
+    @require_access(Access.TICKET_ADMIN, "❌ You don't have permission to setup tickets!")
+    async def ticket_setup_slash(self, interaction: discord.Interaction, channel: discord.TextChannel = None):
+        """Setup ticket system using slash command"""
+        # Answer within Discord's 3-second window before touching the panel message
+        await interaction.response.defer(ephemeral=True)
+        target_channel = channel or interaction.channel
+        await self.create_ticket_panel(target_channel.id)
+        await interaction.followup.send(f"✅ Ticket panel created/updated in {target_channel.mention}", ephemeral=True)
+
+    # SLASH COMMAND - TICKET CLOSE
+    @app_commands.command(name="ticket_close", description="Close the current ticket")
+    @require_access(Access.TICKET_ADMIN, "❌ You don't have permission to close tickets!")
+    async def ticket_close_slash(self, interaction: discord.Interaction):
+        """Close ticket using slash command"""
+        await self.close_ticket(interaction, interaction.channel.id)
+
+    # ORIGINAL TICKET COMMANDS (with updated permissions)
+    @commands.command(name='ticketsetup')
+    @require_access(Access.TICKET_ADMIN)
+    async def ticketsetup(self, ctx, channel: discord.TextChannel = None):
+        """Setup the ticket system in a channel"""
+        target_channel = channel or ctx.channel
+        await self.create_ticket_panel(target_channel.id)
+        await ctx.send(f"✅ Ticket panel created/updated in {target_channel.mention}")
+
+    @commands.command(name='ticketclose')
+    @require_access(Access.TICKET_ADMIN)
+    async def ticketclose(self, ctx):
+        """Close the current ticket (for staff)"""
+        await self.close_ticket(ctx, ctx.channel.id)
+
+    @commands.command(name='ticketmessage')
+    @require_access(Access.TICKET_ADMIN)
+    async def ticketmessage(self, ctx, ticket_type: str, *, message: str):
+        """Customize ticket welcome messages"""
+        if ticket_type not in TICKET_TYPES:
+            await ctx.send("❌ Invalid ticket type. Use: support, invite, or giveaway")
+            return
+
+        # Stored per guild, so it survives restarts (same setting as /config welcome_message)
+        messages = dict(self.bot.guild_config.get(ctx.guild.id)["ticket_welcome_messages"])
+        messages[ticket_type] = message
+        self.bot.guild_config.set(ctx.guild.id, "ticket_welcome_messages", messages)
+        await ctx.send(f"✅ {ticket_type.title()} ticket message updated!")
+
+
+async def setup(bot):
+    await bot.add_cog(TicketSystem(bot))
@@ -0,0 +1,155 @@
+"""Utility commands: timers, help and the ``,,ps vru`` link."""
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.durations import parse_duration_to_seconds
+from core.outbound import Priority, outbound
+
+PS_VRU_TRIGGER = ",,ps vru"
+
+
+class Utility(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # user_id -> due timestamp; mirrors the scheduler's "timer" jobs
+        self.active_timers = bot.state.get("active_timers")
+
+    async def cog_load(self):
+        self.bot.scheduler.register("timer", self.finish_timer)
+        self.active_timers.clear()
+        for _, due, payload in self.bot.scheduler.jobs("timer"):
+            self.active_timers[payload["user_id"]] = due
+        self.bot.message_dispatcher.add_trigger(PS_VRU_TRIGGER, self.ps_vru)
+
+    async def cog_unload(self):
+        self.bot.scheduler.unregister("timer", self.finish_timer)
+        self.bot.message_dispatcher.remove_trigger(PS_VRU_TRIGGER)
+
+    # SLASH COMMAND - TIMER
+    @app_commands.command(name="timer", description="Start a timer")
+    async def timer_slash(self, interaction: discord.Interaction, duration: str, message: str = None):
+        """Start a timer using slash command"""
+        seconds = parse_duration_to_seconds(duration)
+        if seconds is None:
+            await interaction.response.send_message("❌ Invalid duration format. Use: 30s, 10m, 2h, 1d", ephemeral=True)
+            return
+
+        await interaction.response.send_message(f"⏱️ Timer started for **{duration}** — I'll remind you when it's done, {interaction.user.mention}.")
+
+        due = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+        self.bot.scheduler.schedule(f"timer:{interaction.user.id}", due, "timer", {
+            "channel_id": interaction.channel.id,
+            "user_id": interaction.user.id,
+            "duration": duration,
+            "message": message
+        }, guild_id=interaction.guild_id)
+        self.active_timers[interaction.user.id] = due.timestamp()
+
+    async def finish_timer(self, channel_id: int, user_id: int, duration: str, message: str = None):
+        """Scheduler job: post the timer reminder"""
+        self.active_timers.pop(user_id, None)
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return
+        content = f"⏰ **Timer finished** ({duration}) — <@{user_id}>"
+        if message:
+            content += f"\n{message}"
+        await outbound.submit(Priority.USER, lambda: channel.send(content), bucket=f"channel:{channel_id}")
+
+    # SLASH COMMAND - END TIMER
+    @app_commands.command(name="end_timer", description="Stop your active timer")
+    async def end_timer_slash(self, interaction: discord.Interaction):
+        """End timer using slash command"""
+        user_id = interaction.user.id
+        if self.bot.scheduler.cancel(f"timer:{user_id}"):
+            self.active_timers.pop(user_id, None)
+            await interaction.response.send_message(f"⏹️ Timer stopped, {interaction.user.mention}")
+        else:
+            await interaction.response.send_message("❌ You don't have an active timer.", ephemeral=True)
+
+    # SLASH COMMAND - HELP
+    @app_commands.command(name="help", description="Show all available commands")
+    async def help_slash(self, interaction: discord.Interaction):
+        """Show help using slash command"""
+        embed = discord.Embed(title="✨ BOT COMMANDS PANEL", description="All available slash commands with role permissions", color=0x2F3136)
+
+        divider = "───────────────────────────────"
+
+        # Giveaway Commands
+        embed.add_field(name=f"{divider}\n🎁 GIVEAWAY COMMANDS\n{divider}", value="\u200b", inline=False)
+        embed.add_field(name="/giveaway_create", value="Create a new giveaway\n`prize`, `duration`, `winners`, `host`\n👑 Full Admins + 🎉 Giveaway Role", inline=True)
+        embed.add_field(name="/giveaway_end", value="End a giveaway early\n`giveaway_id`\n👑 Full Admins + 🎉 Giveaway Role", inline=True)
+        embed.add_field(name="/giveaway_list", value="List all active giveaways\n👥 Everyone", inline=True)
+        embed.add_field(name="/giveaway_reroll", value="Reroll winners\n`giveaway_id`, `winners`\n👑 Full Admins + 🎉 Giveaway Role", inline=True)
+
+        # Moderation Commands
+        embed.add_field(name=f"{divider}\n🔐 MODERATION COMMANDS\n{divider}", value="\u200b", inline=False)
+        embed.add_field(name="/timeout", value="Timeout a user\n`user`, `duration`, `reason`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/ban", value="Ban a user\n`user`, `reason`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/massban", value="Ban many users (raids)\n`ids`, `id_file`, `joined_within`, `dry_run`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/modlog", value="Moderation history\n`user`, `moderator`, `within`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/kick", value="Kick a user\n`user`, `reason`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/give_role", value="Give role to user\n`user`, `role`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/remove_role", value="Remove role from user\n`user`, `role`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/bulk_role", value="Add/remove a role for many members\n`add`, `remove`, `jobs`, `cancel`\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/change_nickname", value="Change nickname\n`user`, `nickname`\n👑 Full Admins Only", inline=True)
+
+        # An embed holds at most 25 fields: the rest goes into a second one
+        embeds = [embed]
+        embed = discord.Embed(color=0x2F3136)
+        embeds.append(embed)
+
+        # Utility Commands
+        embed.add_field(name=f"{divider}\n⚙️ UTILITY COMMANDS\n{divider}", value="\u200b", inline=False)
+        embed.add_field(name="/timer", value="Start a timer\n`duration`, `message`\n👥 Everyone", inline=True)
+        embed.add_field(name="/end_timer", value="Stop your timer\n👥 Everyone", inline=True)
+        embed.add_field(name="/afk", value="Set yourself as AFK\n`reason`\n👥 Everyone", inline=True)
+        embed.add_field(name="/help", value="Show this help menu\n👥 Everyone", inline=True)
+
+        # Ticket Commands
+        embed.add_field(name=f"{divider}\n🎫 TICKET COMMANDS\n{divider}", value="\u200b", inline=False)
+        embed.add_field(name="/ticket_setup", value="Setup ticket system\n`channel`\n👑 Full Admins + 🎫 Ticket Admin", inline=True)
+        embed.add_field(name="/ticket_close", value="Close current ticket\n👑 Full Admins + 🎫 Ticket Admin", inline=True)
+
+        # Configuration Commands
+        embed.add_field(name=f"{divider}\n🛠️ CONFIGURATION COMMANDS\n{divider}", value="\u200b", inline=False)
+        embed.add_field(name="/config show", value="Show this server's settings\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/config log_channel · role", value="Set the log channel / role permissions\n👑 Full Admins Only", inline=True)
+        embed.add_field(name="/config ticket_category · welcome_message · reset", value="Ticket settings and resets\n👑 Full Admins Only", inline=True)
+
+        # Role Legend
+        embed.add_field(name=f"{divider}\n🔑 ROLE PERMISSIONS\n{divider}", value="\u200b", inline=False)
+        embed.add_field(name="👑 Full Admins", value="Can use ALL commands", inline=True)
+        embed.add_field(name="🎫 Ticket Admin", value="Can only use ticket commands", inline=True)
+        embed.add_field(name="🎉 Giveaway Role", value="Can only use giveaway commands", inline=True)
+
+        embed.set_footer(text="💡 Use slash commands for better experience!")
+        await interaction.response.send_message(embeds=embeds, ephemeral=True)
+
+    # PS VRU command
+    async def ps_vru(self, message):
+        if not message.author.guild_permissions.administrator:
+            await message.channel.send("❌ You must be an **Administrator** to use this command.")
+            return
+
+        try:
+            await message.delete()
+        except Exception:
+            pass
+
+        await message.channel.send(
+            "🌐 **Join vru's PVB Private Server!**\n"
+            "👉 Click here: "
+            "[Server Link](<https://www.roblox.com/share?code=a3f72c3d9218634dac40fdd73df44c6e&type=Server>)\n"
+            "🔗 Or use the raw link:\n"
+            "https://www.roblox.com/share?code=a3f72c3d9218634dac40fdd73df44c6e&type=Server"
+        )
+
+        await self.bot.send_log(f"🌐 **PS VRU Command Used by** {message.author.mention}", guild=message.guild)
+
+
+async def setup(bot):
+    await bot.add_cog(Utility(bot))
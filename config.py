@@ -0,0 +1,24 @@
+"""Bot configuration: log channel, role IDs, ticket texts and giveaway bonus entries.
+
+The log channel, role lists and ticket settings are defaults; a guild can
+override them with /config (stored by core/guildconfig.py).
+"""
+
+LOG_CHANNEL_ID = 1418106413640581191
+
+# ROLE IDS FOR COMMAND ACCESS
+FULL_ADMIN_ROLE_IDS = [1417941498028101765, 1402332135536197773, 1376250853870010479]  # Full access to everything
+TICKET_ADMIN_ROLE_IDS = FULL_ADMIN_ROLE_IDS + [1420001481322401893]  # Full admins + ticket admin
+GIVEAWAY_ROLE_IDS = FULL_ADMIN_ROLE_IDS + [1435640529525149837]  # Full admins + giveaway role
+SUPPORT_ROLE_IDS = FULL_ADMIN_ROLE_IDS + [1420001481322401893]  # Full admins + ticket admin (can close tickets)
+
+# TICKETS
+TICKET_CATEGORY_NAME = "tickets"
+TICKET_WELCOME_MESSAGES = {
+    "support": "👋 **Welcome to Support Ticket!**\n\nPlease describe your issue in detail and our support team will assist you shortly.",
+    "invite": "🎁 **Welcome to Invite Rewards!**\n\nPlease provide your invite details and we'll process your rewards.",
+    "giveaway": "🎉 **Welcome to Giveaway Claim!**\n\nPlease provide the giveaway details and proof of winning."
+}
+
+# BONUS GIVEAWAY ENTRIES PER ROLE (role_id: extra entries on top of the base entry)
+GIVEAWAY_BONUS_ENTRIES = {}
@@ -0,0 +1 @@
+"""Shared infrastructure used by the bot's command modules."""
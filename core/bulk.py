@@ -0,0 +1,137 @@
+"""Helpers for bulk moderation jobs: a bounded worker pool and a live progress message.
+
+The pool keeps at most ``concurrency`` REST calls in flight. discord.py
+already serializes requests per rate-limit bucket and sleeps on (and retries)
+429s, so a small pool fills the bucket without hammering it and needs no
+backoff of its own. Progress edits are sent from their own task, so workers
+never wait on the (rate-limited) message edit.
+"""
+import asyncio
+import re
+import time
+
+import discord
+
+from core.outbound import Priority, outbound
+
+SNOWFLAKE_RE = re.compile(r"(?<!\d)\d{15,21}(?!\d)")
+MAX_ID_FILE_BYTES = 1024 * 1024
+
+
+def parse_ids(text: str) -> list:
+    """Unique snowflakes in ``text`` (IDs, mentions, one per line, comma separated ...), in order"""
+    return list(dict.fromkeys(int(match) for match in SNOWFLAKE_RE.findall(text or "")))
+
+
+async def read_id_attachment(attachment: discord.Attachment) -> list:
+    if attachment.size > MAX_ID_FILE_BYTES:
+        raise ValueError(f"attachment is larger than {MAX_ID_FILE_BYTES // 1024} KB")
+    return parse_ids((await attachment.read()).decode("utf-8", errors="ignore"))
+
+
+class ProgressMessage:
+    """One message edited in place, at most once every ``interval`` seconds.
+
+    Edits are cosmetic: ``update()`` only records the latest content and returns;
+    a background task sends it at background priority once the interval has
+    passed, so newer content simply replaces older one. The final (``force``)
+    update is sent right away as a user one and awaited.
+    """
+
+    def __init__(self, edit, interval: float = 2.0):
+        self._edit = edit  # async callable(content)
+        self.interval = interval
+        self._last = 0.0
+        self._broken = False
+        self._content = None  # latest content not sent yet
+        self._task = None
+        self._sending = False
+
+    async def update(self, content: str, force: bool = False):
+        if self._broken:
+            return
+        if not force:
+            self._content = content
+            if self._task is None or self._task.done():
+                self._task = asyncio.ensure_future(self._send_later())
+            return
+        self._content = None
+        if self._task is not None and not self._task.done():
+            if self._sending:
+                await self._task  # an older edit landing after the final one would overwrite it
+            else:
+                self._task.cancel()
+        await self._send(content, Priority.USER)
+
+    async def _send_later(self):
+        # Until no newer content came in while the last edit was being sent
+        while self._content is not None and not self._broken:
+            delay = self._last + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            content, self._content = self._content, None
+            if content is None:
+                return
+            self._sending = True
+            try:
+                await self._send(content, Priority.BACKGROUND)
+            finally:
+                self._sending = False
+
+    async def _send(self, content: str, priority: Priority):
+        self._last = time.monotonic()
+        try:
+            await outbound.submit(priority, lambda: self._edit(content), coalesce_key=("progress", id(self)))
+        except discord.HTTPException as e:
+            if e.status in (401, 404):
+                self._broken = True  # message deleted or interaction token expired: keep working silently
+            else:
+                print(f"❌ Failed to update progress message: {e}")
+        except Exception as e:
+            print(f"❌ Failed to update progress message: {e!r}")
+
+
+class WorkerPool:
+    """Run ``worker(item)`` for every item with at most ``concurrency`` calls in flight.
+
+    ``on_result(item, result, error)`` is called after each item. ``stop()``
+    lets the running calls finish and skips the rest.
+    """
+
+    def __init__(self, worker, concurrency: int = 4, on_result=None):
+        self.worker = worker
+        self.concurrency = max(1, concurrency)
+        self.on_result = on_result
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    async def run(self, items):
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+        await asyncio.gather(*(self._run_worker(queue) for _ in range(self.concurrency)))
+
+    async def _run_worker(self, queue: asyncio.Queue):
+        while not self._stopped:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = error = None
+            try:
+                result = await self.worker(item)
+            except Exception as e:
+                error = e
+            if self.on_result is not None:
+                await self.on_result(item, result, error)
+
+
+def format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
@@ -0,0 +1,202 @@
+"""Append-only moderation case log in SQLite (WAL), indexed for per-user history.
+
+Every moderation action becomes a case row. ``record()`` only appends to an
+in-memory batch and returns the case number right away; a background task
+writes batches with one transaction each in a worker thread, so command
+latency does not change. Queries read through a separate connection (WAL lets
+it run alongside the writer) and merge the cases that are still pending, so a
+case shows up in ``/modlog`` the moment it is recorded.
+"""
+import asyncio
+import json
+import sqlite3
+import time
+
+CASE_ACTIONS = ("timeout", "ban", "kick", "role_add", "role_remove", "nickname")
+
+_COLUMNS = ("case_id", "guild_id", "action", "target_id", "moderator_id", "reason", "details", "created_at")
+
+
+class Case:
+    __slots__ = _COLUMNS
+
+    def __init__(self, case_id, guild_id, action, target_id, moderator_id, reason=None, details=None, created_at=None):
+        self.case_id = case_id
+        self.guild_id = guild_id
+        self.action = action
+        self.target_id = target_id
+        self.moderator_id = moderator_id
+        self.reason = reason
+        self.details = details
+        self.created_at = created_at if created_at is not None else time.time()
+
+    def row(self) -> tuple:
+        return (self.case_id, self.guild_id, self.action, self.target_id, self.moderator_id, self.reason,
+                json.dumps(self.details) if self.details is not None else None, self.created_at)
+
+    @classmethod
+    def from_row(cls, row):
+        case = cls(*row)
+        if case.details is not None:
+            case.details = json.loads(case.details)
+        return case
+
+
+def next_case_id(last_id: int, offset: int = 0, step: int = 1) -> int:
+    """The first case number above ``last_id`` that is ``offset`` modulo ``step``"""
+    next_id = last_id + 1
+    return next_id + (offset - next_id) % step
+
+
+class CaseLog:
+    def __init__(self, path: str, flush_interval: float = 1.0, batch_size: int = 500,
+                 id_offset: int = 0, id_step: int = 1):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        # Clusters interleave case numbers (id_step = cluster count, id_offset = cluster id)
+        # so a guild moved to another cluster keeps unique ones
+        self.id_offset = id_offset
+        self.id_step = id_step
+        self._reader = None
+        self._writer = None   # only used from the flush thread (and stop())
+        self._pending = []    # recorded cases not written yet, oldest first
+        self._next_id = 1
+        self._wakeup = None
+        self._task = None
+        self._stopping = False
+        self.stats = {"recorded": 0, "written": 0, "batches": 0, "write_failures": 0}
+
+    def open(self):
+        self._writer = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.executescript(
+            "CREATE TABLE IF NOT EXISTS cases ("
+            " case_id INTEGER PRIMARY KEY, guild_id INTEGER NOT NULL, action TEXT NOT NULL,"
+            " target_id INTEGER NOT NULL, moderator_id INTEGER, reason TEXT, details TEXT,"
+            " created_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS cases_by_target ON cases (guild_id, target_id, case_id);"
+            "CREATE INDEX IF NOT EXISTS cases_by_moderator ON cases (guild_id, moderator_id, case_id);"
+            "CREATE INDEX IF NOT EXISTS cases_by_time ON cases (guild_id, created_at);")
+        self._reader = sqlite3.connect(self.path, isolation_level=None)
+        self._next_id = next_case_id(self._reader.execute("SELECT MAX(case_id) FROM cases").fetchone()[0] or 0,
+                                     self.id_offset, self.id_step)
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the writer and write everything still pending"""
+        if self._task is not None:
+            # Not cancelled: that would not stop a batch being written in the worker thread,
+            # and the writes below would run on the same connection alongside it
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        while self._pending:
+            if not self._write_batch(self._pending[:self.batch_size]):
+                break
+            del self._pending[:self.batch_size]
+
+    def close(self):
+        for db in (self._reader, self._writer):
+            if db is not None:
+                db.close()
+        self._reader = self._writer = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # ---------------------------
+    # Writing
+    # ---------------------------
+    def record(self, guild_id: int, action: str, target_id: int, moderator_id: int = None,
+               reason: str = None, details: dict = None) -> int:
+        """Queue a case without waiting on the database; returns its case number"""
+        if action not in CASE_ACTIONS:
+            raise ValueError(f"Unknown case action: {action}")
+        case = Case(self._next_id, guild_id, action, target_id, moderator_id, reason, details)
+        self._next_id += self.id_step
+        self._pending.append(case)
+        self.stats["recorded"] += 1
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return case.case_id
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._pending and not self._stopping:
+                batch = self._pending[:self.batch_size]
+                if not await asyncio.to_thread(self._write_batch, batch):
+                    break  # keep the batch pending and retry on the next tick
+                # New cases are only ever appended, so the batch is still the head
+                del self._pending[:len(batch)]
+
+    def _write_batch(self, batch) -> bool:
+        try:
+            with self._writer:
+                self._writer.execute("BEGIN")
+                self._writer.executemany(
+                    f"INSERT OR IGNORE INTO cases ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    [case.row() for case in batch])
+        except sqlite3.Error as e:
+            print(f"❌ Failed to write {len(batch)} moderation case(s): {e}")
+            self.stats["write_failures"] += 1
+            return False
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        return True
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def history(self, guild_id: int, target_id: int = None, moderator_id: int = None, since: float = None,
+                limit: int = 10, offset: int = 0) -> tuple:
+        """Newest-first cases of one guild, filtered by target, moderator and/or time: ``(cases, total)``"""
+        def matches(case):
+            return (case.guild_id == guild_id
+                    and (target_id is None or case.target_id == target_id)
+                    and (moderator_id is None or case.moderator_id == moderator_id)
+                    and (since is None or case.created_at >= since))
+
+        conditions, params = ["guild_id = ?"], [guild_id]
+        for column, value in (("target_id", target_id), ("moderator_id", moderator_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if self._pending:
+            # Pending cases are the newest ids; a batch being written right now must not count twice
+            conditions.append("case_id < ?")
+            params.append(self._pending[0].case_id)
+        where = " AND ".join(conditions)
+
+        pending = [case for case in reversed(self._pending) if matches(case)]
+        stored = self._reader.execute(f"SELECT COUNT(*) FROM cases WHERE {where}", params).fetchone()[0]
+        cases = pending[offset:offset + limit]
+        if len(cases) < limit:
+            rows = self._reader.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM cases WHERE {where} ORDER BY case_id DESC LIMIT ? OFFSET ?",
+                params + [limit - len(cases), max(0, offset - len(pending))])
+            cases += map(Case.from_row, rows)
+        return cases, stored + len(pending)
+
+    def get(self, case_id: int):
+        for case in self._pending:
+            if case.case_id == case_id:
+                return case
+        row = self._reader.execute(f"SELECT {', '.join(_COLUMNS)} FROM cases WHERE case_id = ?", (case_id,)).fetchone()
+        return Case.from_row(row) if row else None
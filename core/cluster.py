@@ -0,0 +1,328 @@
+"""Shard and cluster layout.
+
+A cluster is one bot process running a range of gateway shards through
+``AutoShardedBot``. ``launcher.py`` starts one process per cluster and passes
+the layout in through the environment:
+
+- ``SHARD_COUNT``: total shards across all clusters (``auto`` asks Discord);
+  unset means the classic single-connection ``commands.Bot``
+- ``SHARD_IDS``: comma-separated shards this process runs (default: all)
+- ``CLUSTER_ID`` / ``CLUSTER_COUNT``: this process's index and the total
+
+Discord routes a guild to shard ``(guild_id >> 22) % shard_count``, so a
+cluster only ever sees its own guilds. Each cluster keeps its state in its
+own data directory; records of guilds it does not own are left as stored.
+When the layout changes, ``partition_cluster_data`` (run by the launcher
+before any cluster starts) moves every per-guild record to the directory of
+the cluster that owns it now.
+
+``DISCORD_API_BASE`` and ``DISCORD_GATEWAY_URL`` point the client at another
+REST/gateway endpoint, e.g. ``tools/fake_gateway.py`` for local testing.
+"""
+import glob
+import json
+import os
+import shutil
+import sqlite3
+
+LAYOUT_FILE = "cluster_layout.json"
+
+# Data files made of per-guild records: name -> (key of the record map, None when the records
+# are the document itself, function(key, record) -> guild id or None when unknown).
+# A record without a guild goes to every cluster, like the whole file did before.
+PARTITIONED_FILES = {
+    "giveaways.json": ("giveaways", lambda key, record: record.get("guild_id")),
+    "giveaway_entries.jsonl": (None, lambda key, record: record[0]),
+    "role_jobs.json": ("jobs", lambda key, record: record.get("guild_id")),
+    "role_job_targets.jsonl": (None, lambda key, record: record[0]),
+    "ticket_panels.json": (None, lambda key, record: int(key)),
+    "scheduler.json": (None, lambda key, record: record.get("guild_id")),
+}
+
+# SQLite databases made of per-guild rows: name -> (table, integer key renumbered when rows
+# from two old clusters collide, or None). Every row has a guild_id.
+PARTITIONED_DBS = {
+    "guild_config.db": ("guild_settings", None),
+    "moderation_cases.db": ("cases", "case_id"),
+}
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % shard_count
+
+
+def shard_ranges(shard_count: int, cluster_count: int) -> list:
+    """Split ``range(shard_count)`` into ``cluster_count`` contiguous, near-equal ranges"""
+    cluster_count = max(1, min(cluster_count, shard_count))
+    size, extra = divmod(shard_count, cluster_count)
+    ranges, start = [], 0
+    for index in range(cluster_count):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def _int_list(raw: str) -> list:
+    return [int(part) for part in raw.replace(" ", "").split(",") if part]
+
+
+class ClusterConfig:
+    def __init__(self, shard_count=None, shard_ids=None, cluster_id: int = 0, cluster_count: int = 1,
+                 auto_shard: bool = False):
+        self.shard_count = shard_count
+        self.shard_ids = shard_ids
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self.auto_shard = auto_shard
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        raw_count = environ.get("SHARD_COUNT", "").strip().lower()
+        auto_shard = raw_count == "auto"
+        shard_count = int(raw_count) if raw_count and not auto_shard else None
+        shard_ids = _int_list(environ.get("SHARD_IDS", "")) or None
+        if shard_ids is not None and shard_count is None:
+            raise ValueError("SHARD_IDS requires a numeric SHARD_COUNT")
+        return cls(shard_count=shard_count, shard_ids=shard_ids,
+                   cluster_id=int(environ.get("CLUSTER_ID", 0)),
+                   cluster_count=int(environ.get("CLUSTER_COUNT", 1)),
+                   auto_shard=auto_shard)
+
+    @property
+    def sharded(self) -> bool:
+        return self.auto_shard or self.shard_count is not None
+
+    @property
+    def is_primary(self) -> bool:
+        """The cluster that does process-wide work once (e.g. the global command sync)"""
+        return self.cluster_id == 0
+
+    def bot_kwargs(self) -> dict:
+        if self.shard_count is None:
+            return {}
+        kwargs = {"shard_count": self.shard_count}
+        if self.shard_ids is not None:
+            kwargs["shard_ids"] = self.shard_ids
+        return kwargs
+
+    def owns_guild(self, guild_id) -> bool:
+        if guild_id is None or self.shard_count is None or self.shard_ids is None:
+            return True
+        return shard_for_guild(int(guild_id), self.shard_count) in self.shard_ids
+
+    def describe(self) -> str:
+        if not self.sharded:
+            return "unsharded"
+        shards = "auto" if self.shard_count is None else (
+            f"{self.shard_ids[0]}-{self.shard_ids[-1]}" if self.shard_ids else f"0-{self.shard_count - 1}")
+        return f"cluster {self.cluster_id}/{self.cluster_count}, shards {shards} of {self.shard_count or 'auto'}"
+
+
+def apply_endpoint_overrides(environ=os.environ):
+    """Point discord.py at ``DISCORD_API_BASE`` / ``DISCORD_GATEWAY_URL`` when set"""
+    import discord
+    import yarl
+
+    api_base = environ.get("DISCORD_API_BASE")
+    if api_base:
+        discord.http.Route.BASE = api_base.rstrip("/")
+    gateway = environ.get("DISCORD_GATEWAY_URL")
+    if gateway:
+        discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(gateway)
+
+
+def cluster_data_dir(base_dir: str, cluster_id: int) -> str:
+    return os.path.join(base_dir, f"cluster-{cluster_id}")
+
+
+def _read_records(path: str):
+    """(header, {key: record}) of a partitioned file; JSON lines are keyed by line number"""
+    name = os.path.basename(path)
+    records_key, _ = PARTITIONED_FILES[name]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if name.endswith(".jsonl"):
+                return {}, {index: json.loads(line) for index, line in enumerate(f) if line.strip()}
+            document = json.load(f)
+    except FileNotFoundError:
+        return {}, {}
+    if records_key is None:
+        return {}, document
+    header = {key: value for key, value in document.items() if key != records_key}
+    return header, document.get(records_key, {})
+
+
+def _write_records(path: str, header: dict, records: dict):
+    name = os.path.basename(path)
+    records_key, _ = PARTITIONED_FILES[name]
+    with open(path, "w", encoding="utf-8") as f:
+        if name.endswith(".jsonl"):
+            f.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in records.values())
+        else:
+            json.dump(records if records_key is None else {**header, records_key: records}, f, separators=(",", ":"))
+
+
+def partition_cluster_data(base_dir: str, shard_count: int, ranges: list) -> bool:
+    """Give every cluster directory the per-guild records of the guilds it owns under ``ranges``.
+
+    The layout that wrote the cluster directories is kept in ``LAYOUT_FILE``; a
+    record is taken from the directory of the cluster that owned its guild
+    then (on the first clustered start: from ``base_dir``). New files are
+    staged first and only moved into place once all of them are written, so an
+    interrupted run is finished (or redone) by the next one. Rows of the
+    databases in ``PARTITIONED_DBS`` move the same way. Other files
+    (``*.json``, ``*.db``) are copied from ``base_dir`` into new directories.
+    Returns False when the layout did not change.
+    """
+    staging = os.path.join(base_dir, ".partition")
+    if os.path.isfile(os.path.join(staging, LAYOUT_FILE)):
+        _commit_staging(base_dir, staging)
+    shutil.rmtree(staging, ignore_errors=True)
+
+    layout = {"shard_count": shard_count, "clusters": ranges}
+    try:
+        with open(os.path.join(base_dir, LAYOUT_FILE), "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    except FileNotFoundError:
+        previous = None
+    if previous == layout:
+        return False
+
+    if previous is not None:
+        sources = [(cluster_data_dir(base_dir, cluster_id), previous["shard_count"], set(shard_ids))
+                   for cluster_id, shard_ids in enumerate(previous["clusters"])]
+    elif any(os.path.isdir(cluster_data_dir(base_dir, cluster_id)) for cluster_id in range(len(ranges))):
+        # Directories from before the layout was recorded: assume they match it
+        sources = None
+    else:
+        sources = [(base_dir, None, None)]
+
+    for cluster_id in range(len(ranges)):
+        cluster_dir = cluster_data_dir(base_dir, cluster_id)
+        if not os.path.isdir(cluster_dir):
+            os.makedirs(cluster_dir)
+            for pattern in ("*.json", "*.db"):
+                for path in glob.glob(os.path.join(base_dir, pattern)):
+                    name = os.path.basename(path)
+                    if name not in PARTITIONED_FILES and name not in PARTITIONED_DBS and name != LAYOUT_FILE:
+                        shutil.copy2(path, cluster_dir)
+
+    if sources is not None:
+        owners = [set(shard_ids) for shard_ids in ranges]
+        for name, (_, guild_of) in PARTITIONED_FILES.items():
+            merged_header = {}
+            records = [{} for _ in ranges]
+            for source_dir, source_count, source_shards in sources:
+                header, stored = _read_records(os.path.join(source_dir, name))
+                for key, value in header.items():
+                    if key == "next_id":
+                        # Interleaved ID counters (id = counter * cluster_count + cluster_id):
+                        # scaled so new IDs stay above every ID handed out before
+                        merged_header[key] = max(merged_header.get(key, 1), value * len(sources))
+                    else:
+                        merged_header.setdefault(key, value)
+                for key, record in stored.items():
+                    guild_id = guild_of(key, record)
+                    if guild_id is not None and source_shards is not None and \
+                            shard_for_guild(int(guild_id), source_count) not in source_shards:
+                        continue  # a stale copy; the owner's directory has the current one
+                    for cluster_id, shard_ids in enumerate(owners):
+                        if guild_id is None or shard_for_guild(int(guild_id), shard_count) in shard_ids:
+                            # JSON lines keep their order per source; they can't collide across sources
+                            record_key = (source_dir, key) if name.endswith(".jsonl") else key
+                            records[cluster_id].setdefault(record_key, record)
+            for cluster_id in range(len(ranges)):
+                target_dir = os.path.join(staging, str(cluster_id))
+                os.makedirs(target_dir, exist_ok=True)
+                _write_records(os.path.join(target_dir, name), merged_header, records[cluster_id])
+        for name in PARTITIONED_DBS:
+            for cluster_id, shard_ids in enumerate(ranges):
+                target_dir = os.path.join(staging, str(cluster_id))
+                os.makedirs(target_dir, exist_ok=True)
+                _partition_db(os.path.join(target_dir, name), sources, shard_count, shard_ids,
+                              cluster_id, len(ranges))
+
+    os.makedirs(staging, exist_ok=True)
+    with open(os.path.join(staging, LAYOUT_FILE), "w", encoding="utf-8") as f:
+        json.dump(layout, f)
+    _commit_staging(base_dir, staging)
+    shutil.rmtree(staging, ignore_errors=True)
+    return True
+
+
+def _partition_db(path: str, sources: list, shard_count: int, shard_ids: list, cluster_id: int,
+                  cluster_count: int):
+    """Write the rows of ``sources`` that belong to ``shard_ids`` into a new database at ``path``"""
+    name = os.path.basename(path)
+    table, renumbered = PARTITIONED_DBS[name]
+    source_paths = [(os.path.join(source_dir, name), source_count, source_shards)
+                    for source_dir, source_count, source_shards in sources]
+    source_paths = [source for source in source_paths if os.path.isfile(source[0])]
+    if not source_paths:
+        return  # the store creates an empty one on open
+
+    def read(source_path, sql, params=()):
+        source = sqlite3.connect(source_path)
+        try:
+            source.create_function("shard_for_guild", 2, shard_for_guild)
+            return source.execute(sql, params).fetchall()
+        finally:
+            source.close()
+
+    schema = read(source_paths[0][0], "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL"
+                                      " AND type IN ('table', 'index') ORDER BY type DESC")
+    db = sqlite3.connect(path, isolation_level=None)
+    try:
+        db.execute("BEGIN")
+        for (sql,) in schema:
+            db.execute(sql)
+        columns = [row[1] for row in db.execute(f"PRAGMA table_info({table})")]
+        insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        collided = []
+        for source_path, source_count, source_shards in source_paths:
+            conditions = [f"shard_for_guild(guild_id, ?) IN ({', '.join('?' * len(shard_ids))})"]
+            params = [shard_count, *shard_ids]
+            if source_shards is not None:
+                # Only the guilds the source owned; its other rows are stale copies
+                conditions.append(f"shard_for_guild(guild_id, ?) IN ({', '.join('?' * len(source_shards))})")
+                params += [source_count, *source_shards]
+            rows = read(source_path, f"SELECT {', '.join(columns)} FROM {table} WHERE {' AND '.join(conditions)}",
+                        params)
+            for row in rows:
+                try:
+                    db.execute(insert, row)
+                except sqlite3.IntegrityError:
+                    if renumbered is None:
+                        raise
+                    collided.append(row)
+        if collided:
+            # Clusters that shared one copy of the database handed out the same numbers:
+            # the later rows get new ones from this cluster's interleaved sequence
+            key = columns.index(renumbered)
+            next_key = db.execute(f"SELECT MAX({renumbered}) FROM {table}").fetchone()[0] + 1
+            for row in collided:
+                next_key += (cluster_id - next_key) % cluster_count
+                db.execute(insert, row[:key] + (next_key,) + row[key + 1:])
+                next_key += 1
+            print(f"⚠️ Renumbered {len(collided)} row(s) of {name} in cluster {cluster_id} that collided")
+        db.execute("COMMIT")
+    finally:
+        db.close()
+
+
+def _commit_staging(base_dir: str, staging: str):
+    for entry in os.listdir(staging):
+        if entry == LAYOUT_FILE:
+            continue
+        cluster_dir = cluster_data_dir(base_dir, int(entry))
+        for name in os.listdir(os.path.join(staging, entry)):
+            if name in PARTITIONED_DBS:
+                # A journal left next to the old database would be applied to the new one
+                for suffix in ("-wal", "-shm", "-journal"):
+                    try:
+                        os.remove(os.path.join(cluster_dir, name + suffix))
+                    except FileNotFoundError:
+                        pass
+            os.replace(os.path.join(staging, entry, name), os.path.join(cluster_dir, name))
+    os.replace(os.path.join(staging, LAYOUT_FILE), os.path.join(base_dir, LAYOUT_FILE))
@@ -0,0 +1,67 @@
+"""Sync the slash command tree only when it actually changed.
+
+``tree.sync()`` is a heavily rate-limited bulk overwrite. The serialized tree
+(the same payload ``sync`` would upload) is hashed per sync target and the hash
+is kept in the data directory, so restarts and reconnects with an unchanged
+tree cost no REST calls at all.
+
+Targets are global by default; set ``SYNC_GUILD_IDS`` (comma-separated) to
+sync the global commands into those guilds instead, which applies instantly
+and is handy while developing.
+"""
+import hashlib
+import json
+import os
+
+import discord
+
+from core.storage import load_json, save_json
+
+SYNC_STATE_FILE = "command_sync.json"
+
+
+def sync_guild_ids() -> list:
+    raw = os.environ.get("SYNC_GUILD_IDS", "")
+    return [int(part) for part in raw.replace(" ", "").split(",") if part]
+
+
+def _payload(command, tree):
+    try:
+        return command.to_dict(tree)
+    except TypeError:
+        # discord.py < 2.4 serializes without the tree
+        return command.to_dict()
+
+
+def tree_hash(tree, guild=None) -> str:
+    """Stable hash of the payload ``tree.sync(guild=guild)`` would upload"""
+    payload = [_payload(command, tree) for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+async def sync_tree(tree, force: bool = False) -> list:
+    """Sync every target whose hash changed (or all of them with ``force``).
+
+    Returns ``(target, synced_count)`` pairs; a count of ``None`` means the
+    target was already up to date and nothing was sent.
+    """
+    state = load_json(SYNC_STATE_FILE, {})
+    guild_ids = sync_guild_ids()
+    targets = [("guild:%d" % guild_id, discord.Object(id=guild_id)) for guild_id in guild_ids] or [("global", None)]
+
+    results = []
+    for name, guild in targets:
+        if guild is not None:
+            tree.copy_global_to(guild=guild)
+        digest = tree_hash(tree, guild)
+        key = f"{tree.client.application_id}:{name}"
+        if not force and state.get(key) == digest:
+            results.append((name, None))
+            continue
+        synced = await tree.sync(guild=guild)
+        state[key] = digest
+        save_json(SYNC_STATE_FILE, state)
+        results.append((name, len(synced)))
+    return results
@@ -0,0 +1,109 @@
+"""Automatic deferral for slash commands that are slow to answer.
+
+Discord drops an interaction that gets no response within 3 seconds. Every
+slash command handled by ``InstrumentedTree`` gets a timer: if the handler has
+not responded ``budget`` seconds in (1.5s by default, ``AUTO_DEFER_SECONDS``),
+the interaction is deferred for it. Handlers keep calling
+``interaction.response.*`` as usual; once deferred, ``send_message`` turns into
+a followup and ``defer`` into a no-op, so no handler needs to know whether the
+timer fired.
+
+``@auto_defer(...)`` sets a command's own budget, makes the deferral ephemeral
+(for commands that answer privately) or turns it off (commands that open a
+modal, which can't follow a deferral).
+"""
+import asyncio
+
+import discord
+
+from core.metrics import registry
+
+DEFAULT_BUDGET = 1.5
+
+auto_deferrals = registry.counter(
+    "bot_command_auto_deferred_total", "Slash commands deferred automatically after the response budget", ("command",))
+
+
+def auto_defer(budget: float = None, ephemeral: bool = False, enabled: bool = True):
+    """Per-command deferral policy; put it below ``@app_commands.command``"""
+    def decorator(func):
+        func.__auto_defer__ = {"budget": budget, "ephemeral": ephemeral, "enabled": enabled}
+        return func
+    return decorator
+
+
+def schedule_auto_defer(interaction: discord.Interaction, default_budget: float):
+    """Arm the deferral timer of an application command interaction"""
+    command = interaction.command
+    policy = getattr(getattr(command, "callback", None), "__auto_defer__", None) or {}
+    if not policy.get("enabled", True) or default_budget is None:
+        return
+    budget = policy.get("budget") or default_budget
+    loop = asyncio.get_running_loop()
+    interaction.extras["auto_defer_timer"] = loop.call_later(
+        budget, lambda: asyncio.ensure_future(_defer(interaction, policy.get("ephemeral", False))))
+
+
+def cancel_auto_defer(interaction: discord.Interaction):
+    timer = interaction.extras.pop("auto_defer_timer", None)
+    if timer is not None:
+        timer.cancel()
+
+
+async def _defer(interaction: discord.Interaction, ephemeral: bool):
+    extras = interaction.extras
+    if extras.get("responding") or interaction.response.is_done():
+        return
+    extras["auto_defer"] = asyncio.current_task()
+    try:
+        await discord.InteractionResponse.defer(interaction.response, thinking=True, ephemeral=ephemeral)
+    except discord.HTTPException as e:
+        print(f"❌ Auto-defer of /{extras.get('command_name', 'unknown')} failed: {e}")
+        return
+    extras["auto_deferred_ephemeral"] = ephemeral
+    auto_deferrals.inc(extras.get("command_name", "unknown"))
+
+
+class AutoDeferResponse(discord.InteractionResponse):
+    """InteractionResponse that routes calls made after an automatic deferral"""
+
+    __slots__ = ()
+
+    async def _auto_deferred(self) -> bool:
+        """True when the timer already answered; otherwise stops the timer from doing so"""
+        extras = self._parent.extras
+        task = extras.get("auto_defer")
+        if task is None:
+            extras["responding"] = True
+            cancel_auto_defer(self._parent)
+            return False
+        if task is not asyncio.current_task():
+            await asyncio.shield(task)
+        return "auto_deferred_ephemeral" in extras
+
+    async def defer(self, *args, **kwargs):
+        if await self._auto_deferred():
+            return None
+        return await super().defer(*args, **kwargs)
+
+    async def send_message(self, content=None, *, delete_after: float = None, ephemeral: bool = False, **kwargs):
+        if not await self._auto_deferred():
+            return await super().send_message(content, delete_after=delete_after, ephemeral=ephemeral, **kwargs)
+        followup = self._parent.followup
+        if ephemeral and not self._parent.extras["auto_deferred_ephemeral"]:
+            # The first followup would take over the public "thinking" message: drop it first
+            try:
+                await self._parent.delete_original_response()
+            except discord.HTTPException:
+                pass
+        if content is not None:
+            kwargs["content"] = content
+        message = await followup.send(ephemeral=ephemeral, wait=True, **kwargs)
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+        return message
+
+    async def send_modal(self, *args, **kwargs):
+        if await self._auto_deferred():
+            raise discord.InteractionResponded(self._parent)
+        return await super().send_modal(*args, **kwargs)
@@ -0,0 +1,56 @@
+"""Staged on_message dispatcher with cheap early exits.
+
+Most messages in a busy guild are plain chat that no feature cares about, so
+the pipeline is ordered from cheapest to most expensive check:
+
+1. bot authors are dropped;
+2. optional stages (e.g. AFK handling) run only while their ``enabled`` guard
+   is truthy, so they cost nothing when there is no state to act on;
+3. anything that does not start with the command prefix stops here, before
+   any lowercasing;
+4. static triggers (whole-message commands like ``,,ps vru``) are one dict
+   lookup on the lowercased content;
+5. everything else goes to ``process_commands``.
+"""
+
+
+class MessageDispatcher:
+    def __init__(self, prefix: str, process_commands):
+        self.prefix = prefix
+        self.process_commands = process_commands
+        self.triggers = {}
+        self._stages = []
+
+    def add_stage(self, handler, enabled=None):
+        """Run ``handler(message)`` for every message while ``enabled()`` is truthy"""
+        self._stages.append((handler, enabled))
+
+    def remove_stage(self, handler):
+        self._stages = [(h, enabled) for h, enabled in self._stages if h != handler]
+
+    def add_trigger(self, text: str, handler):
+        """Run ``handler(message)`` when the whole message equals ``text`` (case-insensitive)"""
+        self.triggers[text.lower()] = handler
+
+    def remove_trigger(self, text: str):
+        self.triggers.pop(text.lower(), None)
+
+    async def dispatch(self, message):
+        if message.author.bot:
+            return
+
+        for handler, enabled in self._stages:
+            if enabled is None or enabled():
+                await handler(message)
+
+        # str.strip() returns the same object when there is nothing to strip
+        content = message.content.strip()
+        if not content.startswith(self.prefix):
+            return
+
+        trigger = self.triggers.get(content.lower())
+        if trigger is not None:
+            await trigger(message)
+            return
+
+        await self.process_commands(message)
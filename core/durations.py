@@ -0,0 +1,49 @@
+"""Duration strings used by commands (``30s``, ``10m``, ``1h 30m`` ...)."""
+import re
+
+_SHORT_DURATION_RE = re.compile(r"^(\d+)\s*([smhd])$")
+_SHORT_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_UNITS = {
+    's': 1, 'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1,
+    'm': 60, 'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
+    'd': 86400, 'day': 86400, 'days': 86400
+}
+
+
+def parse_duration_to_seconds(s: str):
+    """Strict single-unit form (``30s``, ``10m``, ``2h``, ``1d``); None when invalid"""
+    m = _SHORT_DURATION_RE.match(s.strip().lower())
+    if not m:
+        return None
+    return int(m.group(1)) * _SHORT_UNITS[m.group(2)]
+
+
+def parse_duration(duration: str) -> int:
+    """Lenient multi-part form (``1h 30m``, ``2 days``); bare numbers are minutes, 0 when invalid"""
+    duration = duration.lower().strip()
+    total_seconds = 0
+    parts = duration.split()
+
+    for part in parts:
+        num_str = ''
+        unit_str = ''
+        for char in part:
+            if char.isdigit():
+                num_str += char
+            else:
+                unit_str += char
+
+        if not num_str:
+            continue
+
+        num = int(num_str)
+        unit_str = unit_str.strip()
+
+        if unit_str in _UNITS:
+            total_seconds += num * _UNITS[unit_str]
+        elif not unit_str:
+            total_seconds += num * 60
+
+    return total_seconds if total_seconds > 0 else 0
@@ -0,0 +1,169 @@
+"""Compact giveaway entrant store with weighted winner draws.
+
+User IDs live in an ``array('Q')`` with a dict index (user id -> slot), and the
+per-entrant weights in a Fenwick tree, so adding, removing and drawing an
+entrant are all O(log n). A weight is the number of entries a user holds
+(1 + role bonus entries).
+"""
+import random
+from array import array
+
+
+class EntrantPool:
+    def __init__(self):
+        self._ids = array('Q')
+        self._weights = array('q')
+        self._tree = array('q', [0])  # 1-indexed Fenwick tree over _weights
+        self._index = {}
+
+    # ---------------------------
+    # Construction / persistence
+    # ---------------------------
+    @classmethod
+    def from_entries(cls, ids, weights=None):
+        """Build a pool in O(n) from parallel id / weight sequences"""
+        pool = cls()
+        for user_id, weight in zip(ids, weights or [1] * len(ids)):
+            if user_id in pool._index or weight <= 0:
+                continue
+            pool._index[user_id] = len(pool._ids)
+            pool._ids.append(user_id)
+            pool._weights.append(weight)
+        tree = array('q', [0])
+        tree.extend(pool._weights)
+        size = len(tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree[parent] += tree[i]
+        pool._tree = tree
+        return pool
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of ``to_dict``; a plain list of IDs is accepted as equal-weight entries"""
+        if isinstance(data, dict):
+            return cls.from_entries(data.get("ids", []), data.get("weights"))
+        return cls.from_entries(list(data))
+
+    def to_dict(self):
+        return {"ids": self._ids.tolist(), "weights": self._weights.tolist()}
+
+    # ---------------------------
+    # Membership
+    # ---------------------------
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, user_id):
+        return user_id in self._index
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    @property
+    def total_weight(self) -> int:
+        return self._prefix(len(self._ids))
+
+    def weight_of(self, user_id: int) -> int:
+        slot = self._index.get(user_id)
+        return 0 if slot is None else self._weights[slot]
+
+    def add(self, user_id: int, weight: int = 1):
+        """Add an entrant, or update the weight of an existing one"""
+        slot = self._index.get(user_id)
+        if slot is not None:
+            self._update(slot, weight - self._weights[slot])
+            self._weights[slot] = weight
+            return
+        slot = len(self._ids)
+        self._index[user_id] = slot
+        self._ids.append(user_id)
+        self._weights.append(weight)
+        # New Fenwick node n covers (n - lowbit(n), n]
+        n = slot + 1
+        self._tree.append(weight + self._prefix(n - 1) - self._prefix(n - (n & -n)))
+
+    def discard(self, user_id: int):
+        """Remove an entrant (swap-remove keeps the arrays dense)"""
+        slot = self._index.pop(user_id, None)
+        if slot is None:
+            return
+        last = len(self._ids) - 1
+        # Zero the last node, then pop it; it covers a range ending at itself only
+        last_weight = self._weights[last]
+        self._update(last, -last_weight)
+        if slot != last:
+            moved_id = self._ids[last]
+            self._update(slot, last_weight - self._weights[slot])
+            self._ids[slot] = moved_id
+            self._weights[slot] = last_weight
+            self._index[moved_id] = slot
+        self._ids.pop()
+        self._weights.pop()
+        self._tree.pop()
+
+    # ---------------------------
+    # Drawing
+    # ---------------------------
+    def draw(self, k: int, exclude=(), rng=random):
+        """Draw up to ``k`` distinct winners, weighted by entries, skipping ``exclude``"""
+        removed = []
+        try:
+            for user_id in exclude:
+                slot = self._index.get(user_id)
+                if slot is not None and self._weights[slot] > 0:
+                    removed.append((slot, self._weights[slot]))
+                    self._update(slot, -self._weights[slot])
+                    self._weights[slot] = 0
+
+            winners = []
+            for _ in range(k):
+                total = self._prefix(len(self._ids))
+                if total <= 0:
+                    break
+                slot = self._find(rng.randrange(total))
+                winners.append(self._ids[slot])
+                removed.append((slot, self._weights[slot]))
+                self._update(slot, -self._weights[slot])
+                self._weights[slot] = 0
+            return winners
+        finally:
+            for slot, weight in removed:
+                self._update(slot, weight)
+                self._weights[slot] = weight
+
+    # ---------------------------
+    # Fenwick tree internals (slots are 0-based, tree is 1-based)
+    # ---------------------------
+    def _update(self, slot: int, delta: int):
+        if not delta:
+            return
+        tree = self._tree
+        i = slot + 1
+        size = len(tree)
+        while i < size:
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, n: int) -> int:
+        tree = self._tree
+        total = 0
+        while n > 0:
+            total += tree[n]
+            n -= n & -n
+        return total
+
+    def _find(self, target: int) -> int:
+        """Return the slot whose cumulative weight range contains ``target``"""
+        tree = self._tree
+        size = len(tree)
+        pos = 0
+        step = 1 << (size - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < size and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return pos
@@ -0,0 +1,107 @@
+"""Per-guild settings stored in SQLite behind an in-memory cache.
+
+Every guild starts from the defaults in config.py; ``/config`` writes only the
+keys a guild overrides. Reads go through ``get()``, which returns the merged
+settings from a dict cache (loaded from the database on first use), so the hot
+paths (``send_log``, permission checks, ticket creation) never touch SQLite.
+Writes go to the database first and then drop the guild's cache entry.
+"""
+import json
+import sqlite3
+
+# key -> kind, used to validate writes and to render /config show
+SETTINGS = {
+    "log_channel_id": "channel",
+    "full_admin_role_ids": "roles",
+    "ticket_admin_role_ids": "roles",
+    "giveaway_role_ids": "roles",
+    "support_role_ids": "roles",
+    "ticket_category_name": "text",
+    "ticket_welcome_messages": "messages",
+}
+
+
+class GuildConfigStore:
+    def __init__(self, path: str, defaults: dict):
+        unknown = set(defaults) - set(SETTINGS)
+        if unknown:
+            raise ValueError(f"Unknown guild settings: {', '.join(sorted(unknown))}")
+        self.path = path
+        self.defaults = defaults
+        self._db = None
+        self._cache = {}      # guild_id -> merged settings (never mutated in place)
+        self._listeners = []  # callback(guild_id, key) after every write
+
+    def open(self):
+        """Open the database and preload every guild that has overrides"""
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS guild_settings ("
+            " guild_id INTEGER NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (guild_id, key))")
+        overrides = {}
+        for guild_id, key, value in self._db.execute("SELECT guild_id, key, value FROM guild_settings"):
+            if key in SETTINGS:
+                overrides.setdefault(guild_id, {})[key] = json.loads(value)
+        self._cache = {guild_id: self._merge(values) for guild_id, values in overrides.items()}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self):
+        """Guilds currently cached"""
+        return len(self._cache)
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    @property
+    def configured_guilds(self) -> list:
+        """Guilds with at least one override (after ``open()``, until evicted)"""
+        return [guild_id for guild_id, settings in self._cache.items() if settings is not self.defaults]
+
+    def _merge(self, overrides: dict) -> dict:
+        return {**self.defaults, **overrides} if overrides else self.defaults
+
+    def overrides(self, guild_id: int) -> dict:
+        """The keys this guild has set explicitly (reads the database)"""
+        if self._db is None or guild_id is None:
+            return {}
+        rows = self._db.execute("SELECT key, value FROM guild_settings WHERE guild_id = ?", (guild_id,))
+        return {key: json.loads(value) for key, value in rows if key in SETTINGS}
+
+    def get(self, guild_id) -> dict:
+        """Settings for ``guild_id`` (defaults for DMs / unknown guilds); treat as read-only"""
+        if guild_id is None:
+            return self.defaults
+        settings = self._cache.get(guild_id)
+        if settings is None:
+            settings = self._cache[guild_id] = self._merge(self.overrides(guild_id))
+        return settings
+
+    def set(self, guild_id: int, key: str, value):
+        if key not in SETTINGS:
+            raise KeyError(key)
+        self._db.execute(
+            "INSERT INTO guild_settings (guild_id, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value",
+            (guild_id, key, json.dumps(value)))
+        self._changed(guild_id, key)
+
+    def reset(self, guild_id: int, key: str = None):
+        """Drop one override (or all of them) so the guild falls back to the defaults"""
+        if key is None:
+            self._db.execute("DELETE FROM guild_settings WHERE guild_id = ?", (guild_id,))
+        else:
+            self._db.execute("DELETE FROM guild_settings WHERE guild_id = ? AND key = ?", (guild_id, key))
+        self._changed(guild_id, key)
+
+    def _changed(self, guild_id: int, key):
+        self._cache.pop(guild_id, None)
+        for callback in self._listeners:
+            try:
+                callback(guild_id, key)
+            except Exception as e:
+                print(f"❌ Guild config listener failed: {e}")
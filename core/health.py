@@ -0,0 +1,111 @@
+"""Health endpoints served from the bot's own event loop (aiohttp, no extra thread).
+
+``/healthz`` is liveness: the process and its loop are answering and the client
+has not been closed. ``/readyz`` is readiness: the gateway is connected, the
+heartbeat latency is sane and the scheduler is keeping up with due jobs.
+"""
+import math
+import os
+
+from aiohttp import web
+
+
+class HealthServer:
+    def __init__(self, bot, scheduler=None, host: str = "0.0.0.0", port: int = None,
+                 max_latency: float = 5.0, max_overdue: int = 25):
+        self.bot = bot
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port if port is not None else int(os.environ.get("PORT", 8080))
+        self.max_latency = max_latency
+        self.max_overdue = max_overdue
+        self.app = web.Application()
+        self.app.router.add_get("/", self._home)
+        self.app.router.add_get("/healthz", self._healthz)
+        self.app.router.add_get("/readyz", self._readyz)
+        self._runner = None
+
+    def add_route(self, path: str, handler):
+        """Expose another GET endpoint on the same server (must be called before start)"""
+        self.app.router.add_get(path, handler)
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"✅ Health server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ---------------------------
+    # State
+    # ---------------------------
+    def gateway_connected(self) -> bool:
+        shards = getattr(self.bot, "shards", None)
+        if shards is not None:  # AutoShardedBot: every shard of this process must be up
+            return bool(shards) and not any(shard.is_closed() for shard in shards.values())
+        ws = self.bot.ws
+        return ws is not None and ws.open
+
+    @staticmethod
+    def _latency_ms(latency):
+        return None if math.isnan(latency) or math.isinf(latency) else round(latency * 1000, 1)
+
+    def status(self) -> dict:
+        status = {
+            "client_closed": self.bot.is_closed(),
+            "ready": self.bot.is_ready(),
+            "gateway_connected": self.gateway_connected(),
+            "latency_ms": self._latency_ms(self.bot.latency),
+            "guilds": len(self.bot.guilds),
+        }
+        shards = getattr(self.bot, "shards", None)
+        if shards is not None:
+            status["shards"] = {
+                str(shard_id): {"connected": not shard.is_closed(), "latency_ms": self._latency_ms(shard.latency)}
+                for shard_id, shard in shards.items()
+            }
+        cluster = getattr(self.bot, "cluster", None)
+        if cluster is not None and cluster.sharded:
+            status["cluster"] = cluster.describe()
+        if self.scheduler is not None:
+            status["scheduler_jobs"] = len(self.scheduler)
+            status["scheduler_overdue"] = self.scheduler.overdue_count()
+        return status
+
+    def readiness_problems(self, status: dict) -> list:
+        problems = []
+        if not status["ready"]:
+            problems.append("not ready")
+        if not status["gateway_connected"]:
+            problems.append("gateway disconnected")
+        if status["latency_ms"] is None:
+            problems.append("no heartbeat yet")
+        elif status["latency_ms"] > self.max_latency * 1000:
+            problems.append("heartbeat latency too high")
+        if status.get("scheduler_overdue", 0) > self.max_overdue:
+            problems.append("scheduler backlog")
+        return problems
+
+    # ---------------------------
+    # Handlers
+    # ---------------------------
+    async def _home(self, request):
+        if self.bot.is_closed():
+            return web.Response(text="❌ Bot is stopped", status=503)
+        return web.Response(text="🤖 Bot is running!")
+
+    async def _healthz(self, request):
+        status = self.status()
+        return web.json_response(status, status=503 if status["client_closed"] else 200)
+
+    async def _readyz(self, request):
+        status = self.status()
+        problems = self.readiness_problems(status)
+        status["problems"] = problems
+        return web.json_response(status, status=503 if problems else 200)
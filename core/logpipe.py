@@ -0,0 +1,255 @@
+"""Queue-backed log dispatcher shared by every log site.
+
+Log events are queued without waiting on Discord. A single sender drains the
+queue and packs consecutive events for the same channel into one message (up to
+10 embeds plus merged text), so a burst of moderation or giveaway events costs a
+handful of REST calls instead of one each. When the log channel is unreachable
+the events are spooled to disk and replayed once sending works again (at most
+once per ``replay_interval``). Events that can never be delivered (the channel
+is gone, or the bot may not post there: 403/404) are counted as dead instead.
+"""
+import asyncio
+import json
+import os
+
+import aiohttp
+import discord
+
+from core.outbound import Priority, outbound
+from core.storage import data_path
+
+MAX_CONTENT = 2000
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+MAX_SPOOL_BYTES = 5 * 1024 * 1024
+
+
+class LogEntry:
+    __slots__ = ("channel_id", "content", "embed", "file")
+
+    def __init__(self, channel_id, content=None, embed=None, file=None):
+        self.channel_id = channel_id
+        self.content = content[:MAX_CONTENT] if content else None
+        self.embed = embed
+        self.file = file
+
+    def to_json(self):
+        return {
+            "channel_id": self.channel_id,
+            "content": self.content,
+            "embed": self.embed.to_dict() if self.embed else None,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        embed = discord.Embed.from_dict(data["embed"]) if data.get("embed") else None
+        return cls(data["channel_id"], data.get("content"), embed)
+
+
+class LogDispatcher:
+    def __init__(self, get_channel, maxsize: int = 1000, linger: float = 0.5, spool_file: str = "log_spool.jsonl",
+                 is_ready=None, replay_interval: float = 60.0):
+        self.get_channel = get_channel
+        self.is_ready = is_ready or (lambda: True)  # before ready a missing channel may just not be cached yet
+        self.maxsize = maxsize
+        self.linger = linger
+        self.spool_file = spool_file
+        self.replay_interval = replay_interval
+        self.stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "messages_sent": 0,
+            "entries_sent": 0,
+            "send_failures": 0,
+            "spooled": 0,
+            "replayed": 0,
+            "dead": 0,
+            "max_depth": 0,
+        }
+        self._queue = None       # created in start() so it binds to the bot's loop
+        self._early = []
+        self._carry = None
+        self._sending = None     # batch being sent, spooled if stop() interrupts it
+        self._task = None
+        self._spool_pending = os.path.exists(data_path(spool_file))
+        self._next_replay = 0.0
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def submit(self, channel_id: int, content: str = None, embed: discord.Embed = None, file: discord.File = None) -> bool:
+        """Queue a log event without waiting; returns False when it had to be dropped"""
+        entry = LogEntry(channel_id, content, embed, file)
+        if self._queue is None:
+            self._early.append(entry)
+            self.stats["enqueued"] += 1
+            return True
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["enqueued"] += 1
+        self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+        return True
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else len(self._early)
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        for entry in self._early:
+            self._queue.put_nowait(entry)
+        self._early.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the sender and spool anything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        leftover = list(self._sending or ()) + ([self._carry] if self._carry else [])
+        self._sending = self._carry = None
+        while self._queue is not None and not self._queue.empty():
+            leftover.append(self._queue.get_nowait())
+        if leftover:
+            self._spool(leftover)
+
+    def replay_spool(self):
+        """Re-queue spooled events; whatever does not fit stays on disk"""
+        if not self._spool_pending or self._queue is None:
+            return
+        self._next_replay = asyncio.get_running_loop().time() + self.replay_interval
+        path = data_path(self.spool_file)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            self._spool_pending = False
+            return
+
+        remaining = []
+        for line in lines:
+            if remaining or self._queue.full():
+                remaining.append(line)
+                continue
+            try:
+                self._queue.put_nowait(LogEntry.from_json(json.loads(line)))
+                self.stats["replayed"] += 1
+            except ValueError:
+                continue
+
+        if remaining:
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(remaining)
+        else:
+            os.remove(path)
+            self._spool_pending = False
+
+    # ---------------------------
+    # Sender
+    # ---------------------------
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._carry is not None:
+                first, self._carry = self._carry, None
+            else:
+                first = await self._queue.get()
+            batch = [first]
+
+            deadline = loop.time() + self.linger
+            while first.file is None:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not self._fits(batch, entry):
+                    self._carry = entry
+                    break
+                batch.append(entry)
+
+            self._sending = batch
+            try:
+                await self._send(batch)
+            except Exception as e:
+                # The sender must outlive any single batch, or every later log waits until it's dropped
+                print(f"❌ Log sender failed: {e!r}")
+                self.stats["send_failures"] += 1
+                self._spool(batch)
+            # Not in a finally: when stop() cancels the send, the batch must still be there to spool
+            self._sending = None
+
+    @staticmethod
+    def _fits(batch, entry) -> bool:
+        if entry.file is not None or entry.channel_id != batch[0].channel_id:
+            return False
+        embeds = [e.embed for e in batch if e.embed] + ([entry.embed] if entry.embed else [])
+        if len(embeds) > MAX_EMBEDS or sum(len(e) for e in embeds) > MAX_EMBED_CHARS:
+            return False
+        texts = [e.content for e in batch if e.content] + ([entry.content] if entry.content else [])
+        return sum(len(t) + 1 for t in texts) - 1 <= MAX_CONTENT
+
+    async def _send(self, batch):
+        channel = self.get_channel(batch[0].channel_id)
+        if not channel:
+            if self.is_ready():
+                self._dead(batch, "channel not found")
+            else:
+                self._spool(batch)
+            return
+
+        content = "\n".join(e.content for e in batch if e.content) or None
+        embeds = [e.embed for e in batch if e.embed]
+        try:
+            # Lowest priority: logs wait while users are waiting on replies
+            await outbound.submit(Priority.BACKGROUND, lambda: channel.send(content, file=batch[0].file, embeds=embeds),
+                                  bucket=f"channel:{channel.id}")
+        except (discord.Forbidden, discord.NotFound) as e:
+            # Retrying won't help: spooling would only replay them forever
+            self._dead(batch, f"{e.status} {e.text or ''}".strip())
+            return
+        except (discord.HTTPException, aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+            # Network errors (no HTTP status) too: spool until the log channel is reachable again
+            print(f"Failed to send log: {e!r}")
+            self.stats["send_failures"] += 1
+            self._spool(batch)
+            return
+
+        self.stats["messages_sent"] += 1
+        self.stats["entries_sent"] += len(batch)
+        if self._spool_pending and asyncio.get_running_loop().time() >= self._next_replay:
+            self.replay_spool()
+
+    def _dead(self, batch, reason: str):
+        self.stats["dead"] += len(batch)
+        print(f"❌ Dropped {len(batch)} log event(s) for channel {batch[0].channel_id}: {reason}")
+
+    def _spool(self, batch):
+        path = data_path(self.spool_file)
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > MAX_SPOOL_BYTES:
+                self.stats["dropped"] += len(batch)
+                return
+            with open(path, "a", encoding="utf-8") as f:
+                for entry in batch:
+                    record = entry.to_json()
+                    if entry.file is not None:
+                        record["content"] = f"{entry.content or ''}\n(attachment `{entry.file.filename}` not kept)".strip()
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"❌ Failed to spool logs: {e}")
+            self.stats["dropped"] += len(batch)
+            return
+        self.stats["spooled"] += len(batch)
+        self._spool_pending = True
@@ -0,0 +1,120 @@
+"""Member cache policy and on-demand member lookups.
+
+``MEMBER_CACHE`` picks how much of each guild's member list discord.py keeps:
+
+- ``full``: chunk every guild at startup and cache every member (discord.py's default)
+- ``joined``: no startup chunking; cache members seen joining or being updated
+- ``lazy``: no startup chunking and no member cache at all; members the bot
+  needs are fetched on demand and kept in a bounded LRU (``MEMBER_LRU_SIZE``)
+
+Commands still get full member objects from their interaction or message
+payloads. Code that looks a member up by ID uses ``MemberLookup`` instead of
+``guild.get_member`` so it keeps working when the member is not cached.
+"""
+import asyncio
+import os
+from collections import OrderedDict
+
+import discord
+
+from core.metrics import registry
+
+MEMBER_CACHE_MODES = ("full", "joined", "lazy")
+
+lookups_total = registry.counter("bot_member_lookups_total", "Member lookups by ID", ("result",))
+
+
+def member_cache_options(mode: str, intents: discord.Intents) -> dict:
+    """Client keyword arguments (chunking and cache flags) for a ``MEMBER_CACHE`` mode"""
+    if mode not in MEMBER_CACHE_MODES:
+        raise ValueError(f"MEMBER_CACHE must be one of {', '.join(MEMBER_CACHE_MODES)}, not {mode!r}")
+    if mode == "full":
+        return {"chunk_guilds_at_startup": True, "member_cache_flags": discord.MemberCacheFlags.from_intents(intents)}
+    if mode == "joined":
+        flags = discord.MemberCacheFlags.from_intents(intents)
+        flags.voice = False
+        return {"chunk_guilds_at_startup": False, "member_cache_flags": flags}
+    return {"chunk_guilds_at_startup": False, "member_cache_flags": discord.MemberCacheFlags.none()}
+
+
+def install_raw_member_update(connection):
+    """Dispatch ``on_raw_member_update(guild_id, user_id)`` for every GUILD_MEMBER_UPDATE.
+
+    discord.py only dispatches ``on_member_update`` for cached members, so
+    without a member cache role changes would otherwise go unnoticed.
+    """
+    original = connection.parsers["GUILD_MEMBER_UPDATE"]
+
+    def parse_guild_member_update(data):
+        connection.dispatch("raw_member_update", int(data["guild_id"]), int(data["user"]["id"]))
+        original(data)
+
+    connection.parsers["GUILD_MEMBER_UPDATE"] = parse_guild_member_update
+
+
+class MemberLookup:
+    def __init__(self, max_size: int = 5000):
+        self.max_size = max_size
+        self._lru = OrderedDict()  # (guild_id, user_id) -> Member, least recently used first
+        self._inflight = {}        # (guild_id, user_id) -> fetch task shared by concurrent lookups
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        return cls(max_size=int(environ.get("MEMBER_LRU_SIZE", 5000)))
+
+    def __len__(self):
+        return len(self._lru)
+
+    def remember(self, member: discord.Member):
+        key = (member.guild.id, member.id)
+        self._lru[key] = member
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def forget(self, guild_id: int, user_id: int = None):
+        """Drop one member, or every member of a guild"""
+        if user_id is not None:
+            self._lru.pop((guild_id, user_id), None)
+        else:
+            for key in [key for key in self._lru if key[0] == guild_id]:
+                del self._lru[key]
+
+    def get(self, guild: discord.Guild, user_id: int):
+        """Cached member (discord.py's cache, then the LRU) or None, without any request"""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        key = (guild.id, user_id)
+        member = self._lru.get(key)
+        if member is not None:
+            self._lru.move_to_end(key)
+        return member
+
+    async def fetch(self, guild: discord.Guild, user_id: int):
+        """Cached member, else one ``GET /guilds/{id}/members/{id}``; None if they left"""
+        member = self.get(guild, user_id)
+        if member is not None:
+            lookups_total.inc("cached")
+            return member
+
+        key = (guild.id, user_id)
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._fetch(guild, user_id))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, guild: discord.Guild, user_id: int):
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            lookups_total.inc("missing")
+            return None
+        except discord.HTTPException as e:
+            lookups_total.inc("error")
+            print(f"❌ Failed to fetch member {user_id} of guild {guild.id}: {e}")
+            return None
+        lookups_total.inc("fetched")
+        self.remember(member)
+        return member
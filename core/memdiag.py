@@ -0,0 +1,269 @@
+"""Memory and state footprint diagnostics (``,,mem`` and ``/debug/memory``).
+
+A report has four parts:
+
+- process: RSS and garbage collector counters
+- state: entry counts and deep byte sizes of every ``bot.state`` store plus the
+  stores main.py registers (scheduler, config cache, permission cache ...)
+- discord_cache: sizes of discord.py's caches (guilds, members, messages ...)
+- tracemalloc: the top allocation sites, when tracing is on
+
+Tracing is off by default (it slows allocations down); ``start_tracing()``
+turns it on at runtime. Named snapshots can then be diffed against each other
+or against "now" to find what grew in between, without a restart.
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+
+MAX_SNAPSHOTS = 4
+DEEP_SIZE_OBJECT_LIMIT = 2_000_000  # stop walking a store after this many objects
+TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+_CONTAINERS = (dict, list, tuple, set, frozenset, deque)
+_OWN_PACKAGES = ("core", "cogs")
+
+
+def deep_sizeof(obj, limit: int = DEEP_SIZE_OBJECT_LIMIT) -> tuple:
+    """Bytes reachable from ``obj``, counting shared objects once: ``(bytes, complete)``.
+
+    Walks builtin containers and objects of this bot's own classes (core/,
+    cogs/). Other objects (discord models, locks, tasks) are counted shallowly:
+    following them would walk the whole client state.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        if len(seen) >= limit:
+            return total, False
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, _CONTAINERS):
+            stack.extend(current)
+        elif type(current).__module__.split(".", 1)[0] in _OWN_PACKAGES:
+            if hasattr(current, "__dict__"):
+                stack.append(current.__dict__)
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total, True
+
+
+def process_memory() -> dict:
+    rss = None
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    if rss is None:
+        try:
+            import resource
+            # Peak, not current, where /proc is unavailable (kB on Linux, bytes on macOS)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            rss = peak if sys.platform == "darwin" else peak * 1024
+        except ImportError:
+            pass
+    return {"rss_bytes": rss, "gc_counts": list(gc.get_count()), "gc_objects": len(gc.get_objects())}
+
+
+def _entry_count(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def _stat_line(stat) -> dict:
+    frame = stat.traceback[0]
+    return {"site": f"{frame.filename}:{frame.lineno}", "bytes": stat.size, "count": stat.count}
+
+
+def _diff_line(stat) -> dict:
+    frame = stat.traceback[0]
+    return {"site": f"{frame.filename}:{frame.lineno}", "bytes": stat.size, "bytes_diff": stat.size_diff,
+            "count_diff": stat.count_diff}
+
+
+class MemoryDiagnostics:
+    def __init__(self, bot, stores: dict = None):
+        self.bot = bot
+        self.stores = dict(stores or {})  # name -> zero-argument callable returning the store
+        self._snapshots = OrderedDict()  # name -> (taken_at, tracemalloc.Snapshot)
+
+    # ---------------------------
+    # State and caches
+    # ---------------------------
+    def _state_items(self):
+        """(name, store) for every state store; dict stores with string keys are split per key"""
+        for name in self.bot.state:
+            value = self.bot.state.peek(name)
+            if isinstance(value, dict) and value and all(isinstance(key, str) for key in value):
+                for key, inner in value.items():
+                    if _entry_count(inner) is not None and not isinstance(inner, str):
+                        yield f"{name}.{key}", inner
+            else:
+                yield name, value
+        for name, getter in self.stores.items():
+            yield name, getter()
+
+    def state_report(self) -> list:
+        rows = []
+        for name, store in self._state_items():
+            size, complete = deep_sizeof(store)
+            rows.append({"store": name, "entries": _entry_count(store), "bytes": size, "complete": complete})
+        rows.sort(key=lambda row: row["bytes"], reverse=True)
+        return rows
+
+    def discord_cache_report(self) -> dict:
+        bot = self.bot
+        guilds = bot.guilds
+        return {
+            "guilds": len(guilds),
+            "channels": sum(len(guild.channels) for guild in guilds),
+            "threads": sum(len(guild.threads) for guild in guilds),
+            "roles": sum(len(guild.roles) for guild in guilds),
+            "members": sum(len(guild.members) for guild in guilds),
+            "users": len(bot.users),
+            "messages": len(bot.cached_messages),
+            "emojis": len(bot.emojis),
+            "stickers": len(bot.stickers),
+            "private_channels": len(bot.private_channels),
+            "persistent_views": len(bot.persistent_views),
+        }
+
+    # ---------------------------
+    # tracemalloc
+    # ---------------------------
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop_tracing(self):
+        """Stop tracing and drop the snapshots (they can't be compared with new ones)"""
+        tracemalloc.stop()
+        self._snapshots.clear()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+
+    def top_allocations(self, limit: int = 10, group_by: str = "lineno") -> list:
+        if not tracemalloc.is_tracing():
+            return []
+        return [_stat_line(stat) for stat in self._snapshot().statistics(group_by)[:limit]]
+
+    def snapshot(self, name: str) -> int:
+        """Keep a named snapshot (the oldest is dropped past MAX_SNAPSHOTS); returns traced bytes"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start it first")
+        self._snapshots.pop(name, None)
+        snapshot = self._snapshot()
+        self._snapshots[name] = (time.time(), snapshot)
+        while len(self._snapshots) > MAX_SNAPSHOTS:
+            self._snapshots.popitem(last=False)
+        return sum(stat.size for stat in snapshot.statistics("filename"))
+
+    def snapshots(self) -> list:
+        return [{"name": name, "taken_at": taken_at} for name, (taken_at, _) in self._snapshots.items()]
+
+    def diff(self, old: str, new: str = None, limit: int = 10, group_by: str = "lineno") -> dict:
+        """What grew between snapshot ``old`` and ``new`` (or now)"""
+        if old not in self._snapshots:
+            raise KeyError(old)
+        if new is not None and new not in self._snapshots:
+            raise KeyError(new)
+        old_taken, old_snapshot = self._snapshots[old]
+        if new is None:
+            new_taken, new_snapshot = time.time(), self._snapshot()
+        else:
+            new_taken, new_snapshot = self._snapshots[new]
+        stats = new_snapshot.compare_to(old_snapshot, group_by)
+        return {
+            "from": old, "to": new or "now", "seconds": round(new_taken - old_taken, 1),
+            "bytes_diff": sum(stat.size_diff for stat in stats),
+            "top": [_diff_line(stat) for stat in stats[:limit]],
+        }
+
+    # ---------------------------
+    # Report
+    # ---------------------------
+    def report(self, top: int = 10) -> dict:
+        return {
+            "process": process_memory(),
+            "state": self.state_report(),
+            "discord_cache": self.discord_cache_report(),
+            "tracemalloc": {
+                "tracing": self.tracing,
+                "traced_bytes": tracemalloc.get_traced_memory()[0] if self.tracing else None,
+                "snapshots": self.snapshots(),
+                "top": self.top_allocations(top),
+            },
+        }
+
+
+def format_bytes(size) -> str:
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _short_site(site: str) -> str:
+    path, _, line = site.rpartition(":")
+    parts = path.replace("\\", "/").split("/")
+    return f"{'/'.join(parts[-2:])}:{line}"
+
+
+def format_report(report: dict) -> str:
+    process = report["process"]
+    lines = [f"RSS {format_bytes(process['rss_bytes'])} | GC objects {process['gc_objects']:,} | "
+             f"GC counts {process['gc_counts']}", "", "State stores:"]
+    for row in report["state"]:
+        entries = "-" if row["entries"] is None else f"{row['entries']:,}"
+        partial = "+" if not row["complete"] else ""
+        lines.append(f"  {row['store']:<28} {entries:>9} {format_bytes(row['bytes']) + partial:>11}")
+    lines += ["", "discord.py caches:",
+              "  " + ", ".join(f"{name} {count:,}" for name, count in report["discord_cache"].items())]
+    trace = report["tracemalloc"]
+    lines.append("")
+    if not trace["tracing"]:
+        lines.append("tracemalloc: off (`,,mem trace start`)")
+    else:
+        lines.append(f"tracemalloc: {format_bytes(trace['traced_bytes'])} traced, "
+                     f"snapshots: {', '.join(s['name'] for s in trace['snapshots']) or 'none'}")
+        lines += format_allocations(trace["top"])
+    return "\n".join(lines)
+
+
+def format_allocations(stats: list) -> list:
+    return [f"  {format_bytes(stat['bytes']):>10} {stat['count']:>8,}  {_short_site(stat['site'])}" for stat in stats]
+
+
+def format_diff(diff: dict) -> str:
+    lines = [f"{diff['from']} → {diff['to']} ({diff['seconds']}s): {format_bytes(diff['bytes_diff'])} net"]
+    lines += [f"  {('+' if stat['bytes_diff'] >= 0 else '') + format_bytes(stat['bytes_diff']):>11} "
+              f"{stat['count_diff']:>+8,}  {_short_site(stat['site'])}"
+              for stat in diff["top"]]
+    return "\n".join(lines)
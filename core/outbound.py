@@ -0,0 +1,203 @@
+"""Priority classes for the bot's own outbound REST calls.
+
+discord.py sends every call as soon as it is made, so a burst of log messages
+or progress edits competes with the replies users are waiting for. Calls made
+through ``outbound`` are admitted by priority instead:
+
+- ``INTERACTION``: interaction responses and followups; never queued. They are
+  not submitted here: ``track_interactions`` counts them as they pass through
+  the HTTP client so the classes below make room for them.
+- ``USER``: messages and edits people are looking at (giveaway results,
+  reminders); admitted while fewer than ``max_in_flight`` calls are running.
+- ``BACKGROUND``: logs, progress edits and history scans; only admitted while
+  the client is nearly idle (``background_limit`` calls in flight).
+
+Calls that name a ``bucket`` (e.g. ``"channel:<id>"``) run one at a time per
+bucket, so a backlog for one channel (or one discord.py is sleeping on after a
+429) holds a single slot instead of all of them. Calls with a ``coalesce_key``
+that are still queued are replaced by a newer call with the same key, so only
+the latest edit of a message is sent.
+"""
+import asyncio
+import contextlib
+import enum
+import time
+from collections import deque
+
+from core.metrics import registry
+
+outbound_wait = registry.histogram(
+    "bot_outbound_wait_seconds", "Time outbound calls waited for admission, per priority", ("priority",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+outbound_calls = registry.counter(
+    "bot_outbound_calls_total", "Outbound calls by priority and result (ok, error, coalesced)", ("priority", "result"))
+
+
+class CallCancelled(Exception):
+    """The call was cancelled while running (e.g. on shutdown); raised to everyone awaiting it"""
+
+
+class Priority(enum.IntEnum):
+    INTERACTION = 0
+    USER = 1
+    BACKGROUND = 2
+
+
+class _Request:
+    __slots__ = ("priority", "call", "bucket", "coalesce_key", "future", "queued_at")
+
+    def __init__(self, priority, call, bucket, coalesce_key, future):
+        self.priority = priority
+        self.call = call  # zero-argument callable returning an awaitable; None for slot()
+        self.bucket = bucket
+        self.coalesce_key = coalesce_key
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+
+class OutboundScheduler:
+    def __init__(self, max_in_flight: int = 8, background_limit: int = 2):
+        self.max_in_flight = max_in_flight
+        self.background_limit = background_limit
+        self._queues = {priority: deque() for priority in Priority}
+        self._in_flight = {priority: 0 for priority in Priority}
+        self._busy_buckets = set()
+        self._coalescing = {}  # coalesce_key -> queued request
+        self.stats = {"max_depth": 0, "coalesced": 0}
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    async def submit(self, priority: Priority, call, bucket: str = None, coalesce_key=None):
+        """Run ``call()`` once admitted and return its result (or raise its error)"""
+        request = self._coalescing.get(coalesce_key) if coalesce_key is not None else None
+        if request is not None:
+            request.call = call
+            if priority < request.priority:
+                self._queues[request.priority].remove(request)
+                request.priority = priority
+                self._queues[priority].append(request)
+            self.stats["coalesced"] += 1
+            outbound_calls.inc(Priority(priority).name.lower(), "coalesced")
+        else:
+            request = self._enqueue(priority, call, bucket, coalesce_key)
+        # Shielded: a caller giving up does not cancel a call others may share
+        return await asyncio.shield(request.future)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: Priority, bucket: str = None):
+        """Hold one admission slot for a series of calls (e.g. paging through ``channel.history``)"""
+        request = self._enqueue(priority, None, bucket, None)
+        try:
+            await request.future
+        except asyncio.CancelledError:
+            if not request.future.cancelled():
+                self._release(request)  # admitted just as the waiter was cancelled
+            raise
+        try:
+            yield
+        finally:
+            self._release(request)
+
+    @contextlib.contextmanager
+    def track(self, priority: Priority):
+        """Count a call made outside the scheduler as in flight"""
+        self._in_flight[priority] += 1
+        try:
+            yield
+        finally:
+            self._in_flight[priority] -= 1
+            self._pump()
+
+    def track_interactions(self, http):
+        """Wrap ``bot.http.request`` so interaction responses and followups count as in flight"""
+        original = http.request
+
+        async def request(route, **kwargs):
+            if not route.path.startswith(("/interactions/", "/webhooks/")):
+                return await original(route, **kwargs)
+            with self.track(Priority.INTERACTION):
+                return await original(route, **kwargs)
+
+        http.request = request
+
+    def depth(self) -> dict:
+        return {priority.name.lower(): len(queue) for priority, queue in self._queues.items()}
+
+    def in_flight(self) -> dict:
+        return {priority.name.lower(): count for priority, count in self._in_flight.items()}
+
+    # ---------------------------
+    # Admission
+    # ---------------------------
+    def _enqueue(self, priority, call, bucket, coalesce_key) -> _Request:
+        request = _Request(Priority(priority), call, bucket, coalesce_key, asyncio.get_running_loop().create_future())
+        self._queues[request.priority].append(request)
+        if call is not None:
+            # Nobody may be left awaiting a shielded call; don't warn about its unretrieved error
+            request.future.add_done_callback(lambda future: future.cancelled() or future.exception())
+        if coalesce_key is not None:
+            self._coalescing[coalesce_key] = request
+        self.stats["max_depth"] = max(self.stats["max_depth"], sum(len(queue) for queue in self._queues.values()))
+        self._pump()
+        return request
+
+    def _admits(self, priority: Priority, running: int) -> bool:
+        if priority is Priority.INTERACTION:
+            return True
+        return running < (self.max_in_flight if priority is Priority.USER else self.background_limit)
+
+    def _pump(self):
+        for priority, queue in self._queues.items():
+            skipped = deque()
+            while queue:
+                running = sum(self._in_flight.values())
+                if not self._admits(priority, running):
+                    break
+                request = queue.popleft()
+                if request.future.cancelled():
+                    continue  # slot() waiter cancelled while queued
+                if request.bucket is not None and request.bucket in self._busy_buckets:
+                    skipped.append(request)  # keeps its place behind the call running on its bucket
+                    continue
+                self._start(request)
+            skipped.extend(queue)
+            self._queues[priority] = skipped
+
+    def _start(self, request: _Request):
+        self._in_flight[request.priority] += 1
+        if request.bucket is not None:
+            self._busy_buckets.add(request.bucket)
+        if request.coalesce_key is not None and self._coalescing.get(request.coalesce_key) is request:
+            del self._coalescing[request.coalesce_key]
+        outbound_wait.observe(time.perf_counter() - request.queued_at, request.priority.name.lower())
+        if request.call is None:
+            request.future.set_result(None)
+        else:
+            asyncio.ensure_future(self._run(request))
+
+    async def _run(self, request: _Request):
+        try:
+            result = await request.call()
+        except asyncio.CancelledError:
+            # Callers await a shielded future: fail it like any other call, or they wait forever
+            outbound_calls.inc(request.priority.name.lower(), "error")
+            if not request.future.done():
+                request.future.set_exception(CallCancelled(f"{request.priority.name.lower()} call cancelled"))
+            raise
+        except Exception as e:
+            outbound_calls.inc(request.priority.name.lower(), "error")
+            request.future.set_exception(e)
+        else:
+            outbound_calls.inc(request.priority.name.lower(), "ok")
+            request.future.set_result(result)
+        finally:
+            self._release(request)
+
+    def _release(self, request: _Request):
+        self._in_flight[request.priority] -= 1
+        self._busy_buckets.discard(request.bucket)
+        self._pump()
+
+
+outbound = OutboundScheduler()
@@ -0,0 +1,70 @@
+"""Previous / next buttons for slash command results that span several pages.
+
+Pages are built on demand by ``render(page) -> (embed, page_count)``, so only
+the page on screen is ever queried or formatted.
+"""
+import discord
+
+
+class Paginator(discord.ui.View):
+    def __init__(self, render, owner_id: int, page_count: int, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.render = render
+        self.owner_id = owner_id
+        self.page = 0
+        self.page_count = page_count
+        self.message = None
+        self._refresh_buttons()
+
+    @classmethod
+    async def send(cls, interaction: discord.Interaction, render, ephemeral: bool = False):
+        """Send page 1; buttons are only attached when there is more than one page"""
+        embed, page_count = render(0)
+        if page_count <= 1:
+            await interaction.response.send_message(embed=embed, ephemeral=ephemeral)
+            return
+        view = cls(render, interaction.user.id, page_count)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=ephemeral)
+        view.message = await interaction.original_response()
+
+    def _refresh_buttons(self):
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+        self.page_label.label = f"{self.page + 1}/{self.page_count}"
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message("❌ Only the person who ran the command can turn pages.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        page = max(0, page)
+        embed, self.page_count = self.render(page)
+        if page >= self.page_count > 0:
+            # Fewer results than when the view was sent
+            page = self.page_count - 1
+            embed, self.page_count = self.render(page)
+        self.page = page
+        self._refresh_buttons()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.gray)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.gray, disabled=True)
+    async def page_label(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.gray)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        if self.message is None:
+            return
+        try:
+            await self.message.edit(view=None)
+        except discord.HTTPException:
+            pass
@@ -0,0 +1,127 @@
+"""Precomputed permission resolver shared by prefix and slash commands.
+
+Role ID lists are compiled once into a ``role_id -> Access`` bitmask table (a
+default one, plus one per guild that configured its own roles), so resolving a
+member is one dict lookup per role they hold. The resolved level is cached per
+member and invalidated from the member/role update events.
+"""
+import enum
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+
+class Access(enum.IntFlag):
+    NONE = 0
+    FULL_ADMIN = 1
+    TICKET_ADMIN = 2
+    GIVEAWAY = 4
+    SUPPORT = 8
+    MODERATION = 16
+    ALL = FULL_ADMIN | TICKET_ADMIN | GIVEAWAY | SUPPORT | MODERATION
+
+
+class AccessDenied(app_commands.CheckFailure):
+    """Raised by slash command checks; carries the message shown to the user"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class PermissionResolver:
+    MAX_CACHED = 50_000
+
+    def __init__(self):
+        self._role_masks = {}
+        self._guild_masks = {}  # guild_id -> role table replacing the default one
+        self._cache = {}
+
+    def __len__(self):
+        """Members with a cached access level"""
+        return len(self._cache)
+
+    def compile(self, grants: dict, guild_id: int = None):
+        """Build a role table from ``{Access.X: [role_id, ...]}`` and drop the cached levels it affects.
+
+        Without ``guild_id`` this is the default table for every guild without its own.
+        """
+        masks = {}
+        for level, role_ids in grants.items():
+            for role_id in role_ids:
+                masks[role_id] = masks.get(role_id, Access.NONE) | level
+        if guild_id is None:
+            self._role_masks = masks
+        else:
+            self._guild_masks[guild_id] = masks
+        self.invalidate(guild_id)
+
+    def forget_guild(self, guild_id: int):
+        """Return a guild to the default role table"""
+        self._guild_masks.pop(guild_id, None)
+        self.invalidate(guild_id)
+
+    def resolve(self, member) -> Access:
+        """Return the member's access bits (Administrator permission grants everything)"""
+        guild = getattr(member, "guild", None)
+        if guild is None:
+            return Access.NONE
+        key = (guild.id, member.id)
+        level = self._cache.get(key)
+        if level is not None:
+            return level
+
+        if member.guild_permissions.administrator:
+            level = Access.ALL
+        else:
+            level = Access.NONE
+            masks = self._guild_masks.get(guild.id, self._role_masks)
+            for role in member.roles:
+                level |= masks.get(role.id, Access.NONE)
+
+        if len(self._cache) >= self.MAX_CACHED:
+            self._cache.clear()
+        self._cache[key] = level
+        return level
+
+    def has(self, member, level: Access) -> bool:
+        return bool(self.resolve(member) & level)
+
+    def invalidate(self, guild_id: int = None, member_id: int = None):
+        """Forget cached levels for one member, one guild, or everything"""
+        if guild_id is None:
+            self._cache.clear()
+        elif member_id is not None:
+            self._cache.pop((guild_id, member_id), None)
+        else:
+            for key in [key for key in self._cache if key[0] == guild_id]:
+                del self._cache[key]
+
+
+resolver = PermissionResolver()
+
+DEFAULT_DENIED_MESSAGE = "❌ You don't have permission to use this command!"
+
+
+def require_access(level: Access, message: str = DEFAULT_DENIED_MESSAGE):
+    """Check decorator usable on both prefix commands and app (slash) commands"""
+
+    def app_predicate(interaction: discord.Interaction) -> bool:
+        if resolver.has(interaction.user, level):
+            return True
+        raise AccessDenied(message)
+
+    def ctx_predicate(ctx: commands.Context) -> bool:
+        return resolver.has(ctx.author, level)
+
+    def decorator(func):
+        if isinstance(func, commands.Command):
+            return commands.check(ctx_predicate)(func)
+        if isinstance(func, (app_commands.Command, app_commands.ContextMenu)):
+            return app_commands.check(app_predicate)(func)
+        # Plain callback: attach both so either command decorator picks its own up
+        func = app_commands.check(app_predicate)(func)
+        return commands.check(ctx_predicate)(func)
+
+    return decorator
@@ -0,0 +1,200 @@
+"""Restart-safe scheduler that owns every delayed action of the bot.
+
+Jobs are identified by a string key (``giveaway:12``, ``timer:<user_id>`` ...),
+name a registered handler and carry a JSON payload. A single loop task sleeps
+until the earliest job is due, so thousands of pending giveaways or timers cost
+one heap entry each instead of one suspended coroutine each. Jobs are stored
+on disk and re-armed on startup; overdue jobs fire immediately.
+
+Jobs scheduled with a ``guild_id`` only run in the cluster that owns that
+guild; the others keep them in the file untouched.
+"""
+import asyncio
+import heapq
+import time
+from datetime import datetime
+
+from core.storage import flush_pending_writes, load_json, save_json_later
+
+
+class Scheduler:
+    def __init__(self, filename: str = "scheduler.json", owns_guild=None):
+        self.filename = filename
+        self.owns_guild = owns_guild or (lambda guild_id: True)
+        self._handlers = {}
+        self._jobs = {}   # key -> {"due": float, "seq": int, "handler": str, "payload": dict, "guild_id": int}
+        self._foreign = {}  # key -> stored job of a guild another cluster owns (saved back as is)
+        self._heap = []   # (due, seq, key); entries whose seq no longer matches are stale
+        self._seq = 0
+        self._wakeup = None  # created in start() so it binds to the bot's loop
+        self._task = None
+        self._running = set()
+        self._loaded = False
+        self._parked = {}  # handler name -> keys that came due while it was unregistered
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def register(self, name: str, handler):
+        """Register the coroutine function that runs jobs scheduled under ``name``"""
+        self._handlers[name] = handler
+        parked = self._parked.pop(name, None)
+        if parked:
+            for key in parked:
+                job = self._jobs.get(key)
+                if job is not None:
+                    heapq.heappush(self._heap, (job["due"], job["seq"], key))
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def unregister(self, name: str, handler=None):
+        """Drop the handler for ``name`` (only if it is still ``handler``, when given).
+
+        Jobs that come due while no handler is registered are kept and run as
+        soon as one registers again, e.g. after an extension reload.
+        """
+        if handler is None or self._handlers.get(name) == handler:
+            self._handlers.pop(name, None)
+
+    def schedule(self, key: str, when, handler: str, payload: dict = None, guild_id: int = None):
+        """Schedule (or reschedule) job ``key`` to run ``handler(**payload)`` at ``when``.
+
+        ``when`` is an aware datetime or a UNIX timestamp; ``guild_id`` is the
+        guild the job acts on (None for jobs any cluster may run).
+        """
+        due = when.timestamp() if isinstance(when, datetime) else float(when)
+        self._seq += 1
+        self._jobs[key] = {"due": due, "seq": self._seq, "handler": handler, "payload": payload or {}, "guild_id": guild_id}
+        heapq.heappush(self._heap, (due, self._seq, key))
+        if self._wakeup is not None and self._heap[0][2] == key:
+            self._wakeup.set()
+        self._save()
+
+    def cancel(self, key: str) -> bool:
+        """Cancel job ``key``; returns False when no such job is pending"""
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return False
+        # Lazy deletion: the heap entry is skipped when popped. Compact once
+        # stale entries dominate so the heap stays O(pending jobs).
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._jobs):
+            self._heap = [(j["due"], j["seq"], k) for k, j in self._jobs.items()]
+            heapq.heapify(self._heap)
+        self._save()
+        return True
+
+    def get(self, key: str):
+        """Return ``(due_timestamp, handler, payload)`` for a pending job, or None"""
+        job = self._jobs.get(key)
+        if job is None:
+            return None
+        return job["due"], job["handler"], job["payload"]
+
+    def jobs(self, handler: str = None):
+        """Iterate ``(key, due_timestamp, payload)`` over pending jobs"""
+        for key, job in list(self._jobs.items()):
+            if handler is None or job["handler"] == handler:
+                yield key, job["due"], job["payload"]
+
+    def overdue_count(self) -> int:
+        """Number of pending jobs whose due time has already passed"""
+        now = time.time()
+        return sum(1 for job in self._jobs.values() if job["due"] <= now)
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __contains__(self, key):
+        return key in self._jobs
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def load(self):
+        """Load persisted jobs; must happen before anything new is scheduled"""
+        if self._loaded:
+            return
+        self._loaded = True
+        stored = load_json(self.filename, {})
+        for key, job in stored.items():
+            if key in self._jobs:
+                continue
+            if not self.owns_guild(job.get("guild_id")):
+                self._foreign[key] = job
+                continue
+            self._seq += 1
+            self._jobs[key] = {"due": job["due"], "seq": self._seq, "handler": job["handler"],
+                               "payload": job.get("payload", {}), "guild_id": job.get("guild_id")}
+            self._heap.append((job["due"], self._seq, key))
+        heapq.heapify(self._heap)
+
+    def start(self):
+        """Start the timer loop; jobs that came due while offline fire right away"""
+        if self._task is not None:
+            return
+        self.load()
+        if self._jobs:
+            print(f"✅ Scheduler re-armed {len(self._jobs)} job(s) ({self.overdue_count()} overdue)")
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        flush_pending_writes()
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+    def _save(self):
+        save_json_later(self.filename, self._snapshot)
+
+    def _snapshot(self):
+        jobs = dict(self._foreign)
+        for key, job in self._jobs.items():
+            jobs[key] = {"due": job["due"], "handler": job["handler"], "payload": job["payload"]}
+            if job["guild_id"] is not None:
+                jobs[key]["guild_id"] = job["guild_id"]
+        return jobs
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            fired = False
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, key = heapq.heappop(self._heap)
+                job = self._jobs.get(key)
+                if job is None or job["seq"] != seq:
+                    continue
+                if job["handler"] not in self._handlers:
+                    self._parked.setdefault(job["handler"], set()).add(key)
+                    continue
+                del self._jobs[key]
+                self._dispatch(key, job)
+                fired = True
+            if fired:
+                self._save()
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self, key: str, job: dict):
+        handler = self._handlers[job["handler"]]
+        task = asyncio.get_running_loop().create_task(self._invoke(key, handler, job["payload"]))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _invoke(self, key: str, handler, payload: dict):
+        try:
+            await handler(**payload)
+        except Exception as e:
+            print(f"❌ Scheduled job {key} failed: {e}")
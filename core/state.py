@@ -0,0 +1,34 @@
+"""State that outlives extension reloads.
+
+Extensions keep their in-memory stores (active giveaways, AFK users, ticket
+index ...) in named entries of ``bot.state`` instead of module globals. A
+reloaded extension re-imports its module, but ``bot.state`` is owned by the
+bot, so the new cog instance picks up the same objects the old one used.
+"""
+
+
+class StateRegistry:
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, name: str, factory=dict):
+        """Return the state stored under ``name``, creating it with ``factory()`` first time"""
+        try:
+            return self._entries[name]
+        except KeyError:
+            value = self._entries[name] = factory()
+            return value
+
+    def peek(self, name: str, default=None):
+        """Return the state under ``name`` without creating it"""
+        return self._entries.get(name, default)
+
+    def discard(self, name: str):
+        """Drop ``name`` so the next load starts fresh"""
+        self._entries.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
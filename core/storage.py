@@ -0,0 +1,139 @@
+"""Small JSON persistence helpers for bot state kept on local disk."""
+import asyncio
+import json
+import os
+import tempfile
+
+DATA_DIR = os.environ.get("BOT_DATA_DIR", "data")
+
+# name -> (producer callable, on_saved callback) waiting for a debounced write
+_pending_writes = {}
+# name -> records waiting for a debounced append
+_pending_appends = {}
+
+
+def data_path(name: str) -> str:
+    """Return the on-disk path for ``name`` inside the data directory"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, name)
+
+
+def load_json(name: str, default):
+    """Load a JSON document, returning ``default`` when it is missing or unreadable"""
+    path = data_path(name)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        print(f"❌ Failed to read {path}: {e}")
+        return default
+
+
+def save_json(name: str, data):
+    """Atomically replace a JSON document (write to a temp file, then rename)"""
+    _replace(name, lambda f: json.dump(data, f, separators=(",", ":")))
+
+
+def save_jsonl(name: str, records):
+    """Atomically replace a JSON lines file with ``records``, one per line"""
+    _replace(name, lambda f: f.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+
+
+def _replace(name: str, write):
+    path = data_path(name)
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_json_later(name: str, producer, delay: float = 1.0, on_saved=None):
+    """Coalesce bursts of writes to ``name`` into one write after ``delay`` seconds.
+
+    ``producer`` is called when the write happens, so it always sees the latest state.
+    ``on_saved`` (if given) runs right after the document was written successfully.
+    Without a running event loop the document is written immediately.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _pending_writes[name] = (producer, on_saved)
+        _flush_one(name)
+        return
+
+    already_pending = name in _pending_writes
+    _pending_writes[name] = (producer, on_saved)
+    if not already_pending:
+        loop.call_later(delay, _flush_one, name)
+
+
+def _flush_one(name: str):
+    producer, on_saved = _pending_writes.pop(name, (None, None))
+    if producer is None:
+        return
+    try:
+        save_json(name, producer())
+    except Exception as e:
+        print(f"❌ Failed to save {name}: {e}")
+        return
+    if on_saved is not None:
+        on_saved()
+
+
+def append_jsonl_later(name: str, record, delay: float = 1.0):
+    """Queue one JSON line for ``name``; queued lines are appended together after ``delay`` seconds"""
+    queued = _pending_appends.setdefault(name, [])
+    queued.append(record)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _flush_appends(name)
+        return
+    if len(queued) == 1:
+        loop.call_later(delay, _flush_appends, name)
+
+
+def _flush_appends(name: str):
+    records = _pending_appends.pop(name, None)
+    if not records:
+        return
+    try:
+        with open(data_path(name), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+    except OSError as e:
+        print(f"❌ Failed to append {len(records)} record(s) to {name}: {e}")
+
+
+def load_jsonl(name: str) -> list:
+    """Read a JSON lines file; missing files are empty and unreadable lines are skipped"""
+    path = data_path(name)
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    pass  # torn last line of a crash mid-append
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"❌ Failed to read {path}: {e}")
+    return records
+
+
+def flush_pending_writes():
+    """Write every debounced document and append now (used on shutdown)"""
+    for name in list(_pending_appends):
+        _flush_appends(name)
+    for name in list(_pending_writes):
+        _flush_one(name)
@@ -0,0 +1,110 @@
+"""Hooks that feed the metrics registry from discord.py.
+
+- ``InstrumentedTree`` times every slash command: time to first interaction
+  response and total handler time. It also arms the automatic deferral of
+  core/deferral.py for each command.
+- ``instrument_http`` counts the bot's REST calls per route and the 429s that
+  discord.py handles internally (it only logs them, so they are picked up from
+  the ``discord.http`` logger with the current route kept in a context var).
+"""
+import contextvars
+import logging
+import time
+
+import discord
+from discord import app_commands
+
+from core.deferral import DEFAULT_BUDGET, AutoDeferResponse, cancel_auto_defer, schedule_auto_defer
+from core.metrics import registry
+
+command_first_response = registry.histogram(
+    "bot_command_first_response_seconds", "Time from receiving a slash command to its first interaction response", ("command",))
+command_duration = registry.histogram(
+    "bot_command_duration_seconds", "Total slash command handler time", ("command", "status"))
+rest_requests = registry.counter(
+    "bot_rest_requests_total", "REST calls made by the bot, per route", ("route",))
+rest_errors = registry.counter(
+    "bot_rest_errors_total", "REST calls that raised, per route and HTTP status", ("route", "status"))
+rest_rate_limited = registry.counter(
+    "bot_rest_rate_limited_total", "429 responses received (retried internally by discord.py), per route", ("route",))
+rest_duration = registry.histogram(
+    "bot_rest_request_duration_seconds", "REST call duration including rate-limit waits, per route", ("route",))
+
+_current_route = contextvars.ContextVar("current_route", default="unknown")
+
+
+# ---------------------------
+# Slash commands
+# ---------------------------
+class TimedInteractionResponse(AutoDeferResponse):
+    """InteractionResponse that records when the first response is sent"""
+
+    __slots__ = ("_timed_type",)
+
+    @property
+    def _response_type(self):
+        return self._timed_type
+
+    @_response_type.setter
+    def _response_type(self, value):
+        if value is not None and getattr(self, "_timed_type", None) is None:
+            extras = self._parent.extras
+            started = extras.get("started_at")
+            if started is not None and "first_response_at" not in extras:
+                extras["first_response_at"] = time.perf_counter()
+                command_first_response.observe(extras["first_response_at"] - started, extras.get("command_name", "unknown"))
+        self._timed_type = value
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    auto_defer_budget = DEFAULT_BUDGET  # seconds; None turns automatic deferral off
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is not discord.InteractionType.application_command:
+            return True
+        interaction.extras["started_at"] = time.perf_counter()
+        interaction.extras["command_name"] = interaction.command.qualified_name if interaction.command else "unknown"
+        if not interaction.response.is_done():
+            interaction._cs_response = TimedInteractionResponse(interaction)
+            schedule_auto_defer(interaction, self.auto_defer_budget)
+        return True
+
+    @staticmethod
+    def record_finish(interaction: discord.Interaction, status: str):
+        """Record total handler time; called on completion and from the error handler"""
+        cancel_auto_defer(interaction)
+        started = interaction.extras.get("started_at")
+        if started is not None and "finished" not in interaction.extras:
+            interaction.extras["finished"] = True
+            command_duration.observe(time.perf_counter() - started, interaction.extras.get("command_name", "unknown"), status)
+
+
+# ---------------------------
+# REST calls
+# ---------------------------
+class _RateLimitLogHandler(logging.Handler):
+    def emit(self, record):
+        if "responded with 429" in str(record.msg):
+            rest_rate_limited.inc(_current_route.get())
+
+
+def instrument_http(http):
+    """Wrap ``bot.http.request`` to count calls, errors and 429s per route"""
+    original = http.request
+
+    async def request(route, **kwargs):
+        key = route.key
+        rest_requests.inc(key)
+        token = _current_route.set(key)
+        started = time.perf_counter()
+        try:
+            return await original(route, **kwargs)
+        except discord.HTTPException as e:
+            rest_errors.inc(key, e.status)
+            raise
+        finally:
+            rest_duration.observe(time.perf_counter() - started, key)
+            _current_route.reset(token)
+
+    http.request = request
+    logging.getLogger("discord.http").addHandler(_RateLimitLogHandler(logging.WARNING))
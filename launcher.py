@@ -0,0 +1,159 @@
+"""Run the bot as several cluster processes, each owning a range of shards.
+
+    python launcher.py --shards 8 --clusters 2
+    python launcher.py --shards auto --clusters 4
+
+Every cluster is a normal ``main.py`` process configured through the
+environment (see core/cluster.py). Each gets its own data directory
+(``<BOT_DATA_DIR>/cluster-<n>``, seeded from the single-process data on first
+start and repartitioned whenever the shard or cluster count changes) and
+health port (``PORT + n``). Crashed clusters are restarted with a
+backoff; Ctrl+C / SIGTERM stops them all.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from core.cluster import cluster_data_dir, partition_cluster_data, shard_ranges
+
+IDENTIFY_INTERVAL = 5.0  # seconds per identify per max_concurrency bucket (Discord limit)
+
+
+def recommended_gateway(token: str) -> dict:
+    """GET /gateway/bot: recommended shard count and session start limits"""
+    api_base = os.environ.get("DISCORD_API_BASE", "https://discord.com/api/v10").rstrip("/")
+    request = urllib.request.Request(f"{api_base}/gateway/bot", headers={
+        "Authorization": f"Bot {token}",
+        "User-Agent": "DiscordBot (launcher, 1.0)",
+    })
+    with urllib.request.urlopen(request, timeout=15) as response:
+        return json.load(response)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--shards", default=os.environ.get("SHARD_COUNT", "auto"),
+                        help="total shard count, or 'auto' for Discord's recommendation")
+    parser.add_argument("--clusters", type=int, default=int(os.environ.get("CLUSTER_COUNT", 1)),
+                        help="number of worker processes")
+    parser.add_argument("--stagger", type=float, default=None,
+                        help="seconds between cluster starts (default: enough for the identify rate limit)")
+    parser.add_argument("--script", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py"))
+    return parser.parse_args(argv)
+
+
+class Cluster:
+    def __init__(self, cluster_id: int, env: dict, script: str):
+        self.cluster_id = cluster_id
+        self.env = env
+        self.script = script
+        self.process = None
+        self.restarts = 0
+        self.started_at = 0.0
+        self.next_start = 0.0
+
+    def start(self):
+        self.process = subprocess.Popen([sys.executable, self.script], env=self.env)
+        self.started_at = time.monotonic()
+        print(f"🚀 Cluster {self.cluster_id} started (pid {self.process.pid}, shards {self.env['SHARD_IDS']})")
+
+    def poll(self):
+        return None if self.process is None else self.process.poll()
+
+
+def build_clusters(args) -> tuple:
+    token = os.environ.get("BOTTOKEN", "")
+    max_concurrency = 1
+    if args.shards == "auto":
+        gateway = recommended_gateway(token)
+        shard_count = gateway["shards"]
+        max_concurrency = gateway.get("session_start_limit", {}).get("max_concurrency", 1)
+    else:
+        shard_count = int(args.shards)
+
+    base_dir = os.environ.get("BOT_DATA_DIR", "data")
+    base_port = int(os.environ.get("PORT", 8080))
+    ranges = shard_ranges(shard_count, args.clusters)
+    if partition_cluster_data(base_dir, shard_count, ranges):
+        print(f"📁 Partitioned the data in {base_dir} for {len(ranges)} cluster(s)")
+    clusters = []
+    for cluster_id, shard_ids in enumerate(ranges):
+        data_dir = cluster_data_dir(base_dir, cluster_id)
+        env = dict(os.environ,
+                   SHARD_COUNT=str(shard_count),
+                   SHARD_IDS=",".join(map(str, shard_ids)),
+                   CLUSTER_ID=str(cluster_id),
+                   CLUSTER_COUNT=str(len(ranges)),
+                   BOT_DATA_DIR=data_dir,
+                   PORT=str(base_port + cluster_id))
+        clusters.append(Cluster(cluster_id, env, args.script))
+
+    stagger = args.stagger
+    if stagger is None:
+        # A cluster identifies its shards one after another; let it finish before the next starts
+        stagger = max(len(shard_ids) for shard_ids in ranges) * IDENTIFY_INTERVAL / max_concurrency
+    print(f"✅ {shard_count} shard(s) over {len(clusters)} cluster(s), {stagger:.0f}s between starts")
+    return clusters, stagger
+
+
+def supervise(clusters: list, stagger: float):
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index, cluster in enumerate(clusters):
+        if stopping:
+            break
+        if index:
+            time.sleep(stagger)
+        cluster.start()
+
+    while not stopping:
+        time.sleep(1)
+        now = time.monotonic()
+        for cluster in clusters:
+            code = cluster.poll()
+            if code is None or cluster.process is None:
+                continue
+            if cluster.next_start == 0.0:
+                # Back off up to 60s, but reset once a run lasted more than 5 minutes
+                if now - cluster.started_at > 300:
+                    cluster.restarts = 0
+                delay = min(60, 2 ** cluster.restarts)
+                cluster.restarts += 1
+                cluster.next_start = now + delay
+                print(f"⚠️ Cluster {cluster.cluster_id} exited with code {code}; restarting in {delay}s")
+            elif now >= cluster.next_start:
+                cluster.next_start = 0.0
+                cluster.start()
+
+    print("🛑 Stopping clusters...")
+    for cluster in clusters:
+        if cluster.poll() is None and cluster.process is not None:
+            cluster.process.terminate()
+    for cluster in clusters:
+        if cluster.process is not None:
+            try:
+                cluster.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                cluster.process.kill()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    clusters, stagger = build_clusters(args)
+    supervise(clusters, stagger)
+
+
+if __name__ == "__main__":
+    main()
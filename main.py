@@ -1,14 +1,36 @@
+import time
+STARTED_AT = time.perf_counter()  # cold-start timing includes the imports below
+
 import discord
+from aiohttp import web
 from discord.ext import commands
-from discord import ui
 import asyncio
-import re
-from datetime import datetime, timedelta, timezone
-import random
-from flask import Flask
-from threading import Thread
 import os
 
+from config import (FULL_ADMIN_ROLE_IDS, GIVEAWAY_ROLE_IDS, LOG_CHANNEL_ID, SUPPORT_ROLE_IDS,
+                    TICKET_ADMIN_ROLE_IDS, TICKET_CATEGORY_NAME, TICKET_WELCOME_MESSAGES)
+from core.cases import CaseLog
+from core.cluster import ClusterConfig, apply_endpoint_overrides
+from core.commandsync import sync_tree
+from core.dispatch import MessageDispatcher
+from core.guildconfig import GuildConfigStore
+from core.health import HealthServer
+from core.logpipe import LogDispatcher
+from core.memdiag import MemoryDiagnostics, format_allocations, format_diff, format_report
+from core.members import MemberLookup, install_raw_member_update, member_cache_options
+from core.metrics import registry
+from core.outbound import outbound
+from core.permissions import Access, AccessDenied, require_access, resolver
+from core.scheduler import Scheduler
+from core.state import StateRegistry
+from core.storage import data_path
+from core.telemetry import InstrumentedTree, instrument_http
+
+# Features live in cogs/; BOT_EXTENSIONS (comma-separated module names) loads a subset
+DEFAULT_EXTENSIONS = ["cogs.tickets", "cogs.giveaways", "cogs.moderation", "cogs.utility", "cogs.afk", "cogs.settings",
+                      "cogs.rolejobs"]
+EXTENSIONS = [name.strip() for name in os.environ.get("BOT_EXTENSIONS", ",".join(DEFAULT_EXTENSIONS)).split(",") if name.strip()]
+
 # Token handling for Replit
 TOKEN = os.environ['BOTTOKEN']
 
@@ -17,1060 +39,457 @@ if not TOKEN:
     print("💡 Please add DISCORD_BOT_TOKEN to your Replit Secrets")
     exit(1)
 
-# Flask web server for uptime (keep this for Replit too)
-app = Flask('')
-
-@app.route('/')
-def home():
-    return "🤖 Bot is running!"
-
-def run():
-    app.run(host='0.0.0.0', port=8080)
-
-def keep_alive():
-    server = Thread(target=run)
-    server.start()
-
-# Start the web server (important for Replit to keep bot alive)
-keep_alive()
-
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 intents.guilds = True
 intents.reactions = True
 
-bot = commands.Bot(command_prefix=",,", intents=intents)
+# SHARD_COUNT switches to AutoShardedBot; launcher.py runs several of these processes
+cluster = ClusterConfig.from_env()
+apply_endpoint_overrides()
+bot_class = commands.AutoShardedBot if cluster.sharded else commands.Bot
+# MEMBER_CACHE=full|joined|lazy (core/members.py): lazy skips chunking and fetches members on demand
+member_cache_mode = os.environ.get("MEMBER_CACHE", "full").strip().lower()
+bot = bot_class(command_prefix=",,", intents=intents, tree_cls=InstrumentedTree,
+                **member_cache_options(member_cache_mode, intents), **cluster.bot_kwargs())
 bot.remove_command("help")
+# Slash commands that haven't answered after this many seconds are deferred for them (core/deferral.py)
+bot.tree.auto_defer_budget = float(os.environ.get("AUTO_DEFER_SECONDS", 1.5)) or None
+bot.cluster = cluster
+bot.members = MemberLookup.from_env()
+install_raw_member_update(bot._connection)
+
+# Single timer loop for every delayed action (giveaway endings, timers, ticket closes)
+scheduler = Scheduler(owns_guild=cluster.owns_guild)
+bot.scheduler = scheduler
+
+# In-memory state of the extensions, kept here so it survives ,,ext reload
+bot.state = StateRegistry()
+
+# Per-guild settings (/config); config.py provides the defaults. The role lists
+# beyond full admin only hold the extra roles, full admins always have every level
+guild_config = GuildConfigStore(data_path("guild_config.db"), {
+    "log_channel_id": LOG_CHANNEL_ID,
+    "full_admin_role_ids": FULL_ADMIN_ROLE_IDS,
+    "ticket_admin_role_ids": [r for r in TICKET_ADMIN_ROLE_IDS if r not in FULL_ADMIN_ROLE_IDS],
+    "giveaway_role_ids": [r for r in GIVEAWAY_ROLE_IDS if r not in FULL_ADMIN_ROLE_IDS],
+    "support_role_ids": [r for r in SUPPORT_ROLE_IDS if r not in FULL_ADMIN_ROLE_IDS],
+    "ticket_category_name": TICKET_CATEGORY_NAME,
+    "ticket_welcome_messages": TICKET_WELCOME_MESSAGES,
+})
+guild_config.open()
+bot.guild_config = guild_config
+
+# Moderation case log (/modlog): cases are queued and written in batches off the event loop
+case_log = CaseLog(data_path("moderation_cases.db"), id_offset=cluster.cluster_id, id_step=cluster.cluster_count)
+case_log.open()
+bot.case_log = case_log
+
+# Uptime / health web server (important for Replit to keep bot alive); runs on the bot's loop
+health_server = HealthServer(bot, scheduler)
 
-# ---------------------------------------------------------
-LOG_CHANNEL_ID = 1418106413640581191
+# ---------------------------
+# Permission Check Functions
+# ---------------------------
+def access_grants(settings: dict) -> dict:
+    full_admins = settings["full_admin_role_ids"]
+    return {
+        Access.FULL_ADMIN: full_admins,
+        Access.MODERATION: full_admins,
+        Access.TICKET_ADMIN: full_admins + settings["ticket_admin_role_ids"],
+        Access.GIVEAWAY: full_admins + settings["giveaway_role_ids"],
+        Access.SUPPORT: full_admins + settings["support_role_ids"],
+    }
 
-# ROLE IDS FOR COMMAND ACCESS
-FULL_ADMIN_ROLE_IDS = [1417941498028101765, 1402332135536197773, 1376250853870010479]  # Full access to everything
-TICKET_ADMIN_ROLE_IDS = FULL_ADMIN_ROLE_IDS + [1420001481322401893]  # Full admins + ticket admin
-GIVEAWAY_ROLE_IDS = FULL_ADMIN_ROLE_IDS + [1435640529525149837]  # Full admins + giveaway role
+# Role lists are compiled once into role_id -> access bitmask tables: the default
+# one, plus one per guild that set its own roles (recompiled when they change)
+resolver.compile(access_grants(guild_config.defaults))
+for configured_guild_id in guild_config.configured_guilds:
+    resolver.compile(access_grants(guild_config.get(configured_guild_id)), configured_guild_id)
 
-# ---------------------------------------------------------
+def on_guild_config_change(guild_id: int, key: str):
+    if key is None:
+        resolver.forget_guild(guild_id)
+    elif key.endswith("_role_ids"):
+        resolver.compile(access_grants(guild_config.get(guild_id)), guild_id)
+    # Extensions react through a regular listener: on_guild_config_update(guild_id, key)
+    bot.dispatch("guild_config_update", guild_id, key)
 
-# ---------------------------
-# Utility: parse durations
-# ---------------------------
-def parse_duration_to_seconds(s: str):
-    s = s.strip().lower()
-    pattern = r"^(\d+)\s*([smhd])$"
-    m = re.match(pattern, s)
-    if not m:
-        return None
-    val = int(m.group(1))
-    unit = m.group(2)
-    if unit == "s":
-        return val
-    if unit == "m":
-        return val * 60
-    if unit == "h":
-        return val * 3600
-    if unit == "d":
-        return val * 86400
-    return None
+guild_config.add_listener(on_guild_config_change)
 
-# ---------------------------
-# Permission Check Functions
-# ---------------------------
 def has_full_admin_access():
-    async def predicate(ctx):
-        if ctx.author.guild_permissions.administrator:
-            return True
-        user_roles = [role.id for role in ctx.author.roles]
-        return any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS)
-    return commands.check(predicate)
+    return require_access(Access.FULL_ADMIN)
 
 def has_ticket_admin_access():
-    async def predicate(ctx):
-        if ctx.author.guild_permissions.administrator:
-            return True
-        user_roles = [role.id for role in ctx.author.roles]
-        return any(role_id in user_roles for role_id in TICKET_ADMIN_ROLE_IDS)
-    return commands.check(predicate)
+    return require_access(Access.TICKET_ADMIN)
 
 def has_giveaway_access():
-    async def predicate(ctx):
-        if ctx.author.guild_permissions.administrator:
-            return True
-        user_roles = [role.id for role in ctx.author.roles]
-        return any(role_id in user_roles for role_id in GIVEAWAY_ROLE_IDS)
-    return commands.check(predicate)
+    return require_access(Access.GIVEAWAY)
 
 def has_moderation_access():
-    async def predicate(ctx):
-        if ctx.author.guild_permissions.administrator:
-            return True
-        user_roles = [role.id for role in ctx.author.roles]
-        return any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS)
-    return commands.check(predicate)
+    return require_access(Access.MODERATION)
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+    InstrumentedTree.record_finish(interaction, "denied" if isinstance(error, AccessDenied) else "error")
+    if isinstance(error, AccessDenied):
+        if interaction.response.is_done():
+            await interaction.followup.send(error.message, ephemeral=True)
+        else:
+            await interaction.response.send_message(error.message, ephemeral=True)
+        return
+    command_name = interaction.command.name if interaction.command else "unknown"
+    print(f"❌ Error in /{command_name}: {error}")
 
-# ---------------------------
-# Ready event with proper command syncing
-# ---------------------------
+# Cached access levels and looked-up members are dropped whenever a member changes.
+# The raw events fire for uncached members too (MEMBER_CACHE=lazy keeps none)
 @bot.event
-async def on_ready():
-    print(f"✅ Bot is ready! Logged in as {bot.user}")
+async def on_raw_member_update(guild_id: int, user_id: int):
+    resolver.invalidate(guild_id, user_id)
+    bot.members.forget(guild_id, user_id)
 
-    # Sync slash commands with better error handling
-    try:
-        synced = await bot.tree.sync()
-        print(f"✅ Successfully synced {len(synced)} slash command(s)")
+@bot.event
+async def on_raw_member_remove(payload: discord.RawMemberRemoveEvent):
+    resolver.invalidate(payload.guild_id, payload.user.id)
+    bot.members.forget(payload.guild_id, payload.user.id)
 
-        # Print all synced commands for debugging
-        for command in synced:
-            print(f"  - /{command.name}")
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    resolver.invalidate(guild.id)
+    bot.members.forget(guild.id)
 
-    except Exception as e:
-        print(f"❌ Failed to sync slash commands: {e}")
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    if before.permissions != after.permissions:
+        resolver.invalidate(after.guild.id)
 
-    # Add ticket system cog
-    try:
-        await bot.add_cog(TicketSystem(bot))
-        print("✅ TicketSystem cog loaded")
-    except Exception as e:
-        print(f"❌ Failed to load TicketSystem cog: {e}")
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    resolver.invalidate(role.guild.id)
 
-    # Send ready message to log channel
-    log_channel = bot.get_channel(LOG_CHANNEL_ID)
-    if log_channel:
-        try:
-            await log_channel.send("✅ **Bot is now Ready!** 😎")
-        except Exception as e:
-            print(f"Note: Couldn't send ready message to log channel: {e}")
+# ---------------------------
+# Ready event with proper command syncing
+# ---------------------------
+@bot.event
+async def on_ready():
+    # Fires again after every gateway reconnect that could not resume, so it only
+    # reports; one-time startup work lives in setup_hook / start_background_work
+    print(f"✅ Bot is ready! Logged in as {bot.user} ({cluster.describe()}, {len(bot.guilds)} guild(s), member cache: {member_cache_mode})")
 
 # ---------------------------
 # Small helper to send logs
 # ---------------------------
-async def send_log(content: str, file: discord.File = None):
-    log_channel = bot.get_channel(LOG_CHANNEL_ID)
-    if not log_channel:
-        return
-    try:
-        if file:
-            await log_channel.send(content, file=file)
-        else:
-            await log_channel.send(content)
-    except Exception as e:
-        print(f"Failed to send log: {e}")
-
-# ============================================================
-#                       GIVEAWAY SYSTEM
-# ============================================================
-active_giveaways = {}
-giveaway_id_counter = 1
-
-def parse_duration(duration: str) -> int:
-    """Parse duration string to seconds"""
-    units = {
-        's': 1, 'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1,
-        'm': 60, 'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
-        'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
-        'd': 86400, 'day': 86400, 'days': 86400
-    }
-
-    duration = duration.lower().strip()
-    total_seconds = 0
-    parts = duration.split()
-
-    for part in parts:
-        num_str = ''
-        unit_str = ''
-        for char in part:
-            if char.isdigit():
-                num_str += char
-            else:
-                unit_str += char
-
-        if not num_str:
-            continue
-
-        num = int(num_str)
-        unit_str = unit_str.strip()
-
-        if unit_str in units:
-            total_seconds += num * units[unit_str]
-        elif not unit_str:
-            total_seconds += num * 60
-
-    return total_seconds if total_seconds > 0 else 0
-
-async def end_giveaway(giveaway_id: int):
-    """End a giveaway and pick winners"""
-    if giveaway_id not in active_giveaways:
-        return
-
-    giveaway = active_giveaways[giveaway_id]
-    if giveaway['ended']:
-        return
-
-    giveaway['ended'] = True
-
-    try:
-        channel = bot.get_channel(giveaway['channel_id'])
-        if not channel:
-            return
-
-        try:
-            message = await channel.fetch_message(giveaway['message_id'])
-        except discord.NotFound:
-            return
-
-        # Get reaction participants
-        for reaction in message.reactions:
-            if str(reaction.emoji) == "🎉":
-                users = [user async for user in reaction.users() if not user.bot]
-                giveaway['participants'] = [user.id for user in users]
-                break
-
-        participants = giveaway['participants']
-        log_channel = bot.get_channel(LOG_CHANNEL_ID)
-
-        if not participants:
-            embed = discord.Embed(
-                title=f"🎉 **{giveaway['prize']}** 🎉",
-                description=f"**Winners:** No participants 😢\n"
-                            f"**Hosted by:** <@{giveaway['host_id']}>\n\n"
-                            f"Giveaway has ended with no participants.",
-                color=0xff0000)
-            if giveaway.get('image_url'):
-                embed.set_image(url=giveaway['image_url'])
-            await message.edit(embed=embed)
-
-            if log_channel:
-                log_embed = discord.Embed(
-                    title="🎉 Giveaway Ended - No Participants",
-                    description=f"**Prize:** {giveaway['prize']}\n"
-                                f"**Host:** <@{giveaway['host_id']}>\n"
-                                f"**Giveaway ID:** {giveaway_id}\n"
-                                f"**Participants:** 0\n"
-                                f"❌ **No winners** - No one entered the giveaway",
-                    color=0xff0000,
-                    timestamp=datetime.now(timezone.utc))
-                if giveaway.get('image_url'):
-                    log_embed.set_image(url=giveaway['image_url'])
-                await log_channel.send(embed=log_embed)
-
-            await channel.send(f"🎉 Giveaway for **{giveaway['prize']}** ended with no participants!")
-            return
-
-        # Pick winners
-        winners_count = min(len(participants), giveaway['winners'])
-        winners = random.sample(participants, winners_count)
-        winners_mentions = ', '.join([f"<@{winner_id}>" for winner_id in winners])
-
-        # Update embed
-        embed = discord.Embed(
-            title=f"🎉 **{giveaway['prize']}** 🎉",
-            description=f"**Winners:** {winners_mentions}\n"
-                        f"**Participants:** {len(participants)}\n"
-                        f"**Hosted by:** <@{giveaway['host_id']}>\n\n"
-                        f"Congratulations to the winners! 🎊",
-            color=0xffa500)
-        embed.set_footer(text=f"Giveaway ID: {giveaway_id} | Ended")
-
-        if giveaway.get('image_url'):
-            embed.set_image(url=giveaway['image_url'])
-
-        await message.edit(embed=embed)
-        winners_text = f"🎉 **Giveaway Ended!** 🎉\n\n**Prize:** {giveaway['prize']}\n**Winners:** {winners_mentions}\n**Host:** <@{giveaway['host_id']}>\nCongratulations! 🎊"
-        await channel.send(winners_text)
-
-        if log_channel:
-            log_embed = discord.Embed(
-                title="🎉 Giveaway Ended - Winners Selected",
-                description=f"**Prize:** {giveaway['prize']}\n"
-                            f"**Host:** <@{giveaway['host_id']}>\n"
-                            f"**Giveaway ID:** {giveaway_id}\n"
-                            f"**Participants:** {len(participants)}\n"
-                            f"**Winners:** {winners_mentions}",
-                color=0x00ff00,
-                timestamp=datetime.now(timezone.utc))
-            if giveaway.get('image_url'):
-                log_embed.set_image(url=giveaway['image_url'])
-            await log_channel.send(embed=log_embed)
-
-    except Exception as e:
-        print(f"Error ending giveaway {giveaway_id}: {e}")
-
-# SLASH COMMAND FOR GIVEAWAY CREATE
-@bot.tree.command(name="giveaway_create", description="Create a new giveaway")
-async def giveaway_create(interaction: discord.Interaction, prize: str, duration: str, winners: int, host: discord.Member = None):
-    """Create a giveaway using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in GIVEAWAY_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to create giveaways!", ephemeral=True)
-        return
-
-    if host is None:
-        host = interaction.user
-
-    if winners < 1:
-        await interaction.response.send_message("❌ Winners must be at least 1!", ephemeral=True)
-        return
-
-    duration_seconds = parse_duration(duration)
-    if duration_seconds <= 0:
-        await interaction.response.send_message("❌ Please provide a valid duration (e.g., 1h, 30m, 1d, 10s)", ephemeral=True)
-        return
-
-    end_time = datetime.now(timezone.utc) + timedelta(seconds=duration_seconds)
-    global giveaway_id_counter
-    giveaway_id = giveaway_id_counter
-    giveaway_id_counter += 1
-
-    embed = discord.Embed(
-        title=f"🎉 **{prize}** 🎉",
-        description=f"**Winners:** {winners}\n"
-                    f"**Ends:** <t:{int(end_time.timestamp())}:R> (<t:{int(end_time.timestamp())}:F>)\n"
-                    f"**Hosted by:** {host.mention}\n\n"
-                    f"Click the 🎉 button to enter!",
-        color=0x00ff00,
-        timestamp=end_time)
-    embed.set_footer(text=f"Giveaway ID: {giveaway_id} | Ends at")
-
-    await interaction.response.send_message(embed=embed)
-    giveaway_msg = await interaction.original_response()
-    await giveaway_msg.add_reaction("🎉")
-
-    active_giveaways[giveaway_id] = {
-        'message_id': giveaway_msg.id,
-        'channel_id': interaction.channel.id,
-        'prize': prize,
-        'winners': winners,
-        'end_time': end_time,
-        'host_id': host.id,
-        'participants': [],
-        'ended': False,
-        'image_url': None
-    }
-
-    success_msg = f"✅ Giveaway created successfully! ID: `{giveaway_id}`\n**Host:** {host.mention}"
-    await interaction.followup.send(success_msg, ephemeral=True)
-
-    log_channel = bot.get_channel(LOG_CHANNEL_ID)
-    if log_channel:
-        log_embed = discord.Embed(
-            title="🎉 Giveaway Created",
-            description=f"**Prize:** {prize}\n"
-                        f"**Winners:** {winners}\n"
-                        f"**Duration:** {duration}\n"
-                        f"**Ends:** <t:{int(end_time.timestamp())}:F>\n"
-                        f"**Host:** {host.mention}\n"
-                        f"**Created by:** {interaction.user.mention}\n"
-                        f"**Channel:** {interaction.channel.mention}\n"
-                        f"**Giveaway ID:** {giveaway_id}",
-            color=0x00ff00,
-            timestamp=datetime.now(timezone.utc))
-        await log_channel.send(embed=log_embed)
-
-    await asyncio.sleep(duration_seconds)
-    await end_giveaway(giveaway_id)
-
-# SLASH COMMAND FOR GIVEAWAY END
-@bot.tree.command(name="giveaway_end", description="End a giveaway early")
-async def giveaway_end(interaction: discord.Interaction, giveaway_id: int):
-    """End a giveaway early using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in GIVEAWAY_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to end giveaways!", ephemeral=True)
-        return
-
-    if giveaway_id not in active_giveaways:
-        await interaction.response.send_message("❌ Giveaway not found or already ended.", ephemeral=True)
-        return
-
-    giveaway = active_giveaways[giveaway_id]
-    if giveaway['host_id'] != interaction.user.id and not any(role_id in [role.id for role in interaction.user.roles] for role_id in FULL_ADMIN_ROLE_IDS):
-        await interaction.response.send_message("❌ You can only end giveaways that you hosted!", ephemeral=True)
-        return
-
-    await end_giveaway(giveaway_id)
-    await interaction.response.send_message(f"✅ Giveaway `{giveaway_id}` ended successfully!")
-
-# SLASH COMMAND FOR GIVEAWAY LIST
-@bot.tree.command(name="giveaway_list", description="List all active giveaways")
-async def giveaway_list(interaction: discord.Interaction):
-    """List all active giveaways using slash command"""
-    if not active_giveaways:
-        await interaction.response.send_message("📝 No active giveaways!")
-        return
-
-    embed = discord.Embed(title="🎉 Active Giveaways", color=0x00ff00)
-    for giveaway_id, giveaway in active_giveaways.items():
-        if not giveaway['ended']:
-            time_left = giveaway['end_time'] - datetime.now(timezone.utc)
-            hours, remainder = divmod(int(time_left.total_seconds()), 3600)
-            minutes, seconds = divmod(remainder, 60)
-            embed.add_field(
-                name=f"ID: {giveaway_id} - {giveaway['prize']}",
-                value=f"Winners: {giveaway['winners']} | Ends in: {hours}h {minutes}m\nHosted by: <@{giveaway['host_id']}>",
-                inline=False)
-    await interaction.response.send_message(embed=embed)
-
-# SLASH COMMAND FOR GIVEAWAY REROLL
-@bot.tree.command(name="giveaway_reroll", description="Reroll winners for an ended giveaway")
-async def giveaway_reroll(interaction: discord.Interaction, giveaway_id: int, winners: int = 1):
-    """Reroll winners using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in GIVEAWAY_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to reroll giveaways!", ephemeral=True)
-        return
+# Every log site feeds this queue; a background sender batches events into few messages
+log_dispatcher = LogDispatcher(bot.get_channel, is_ready=bot.is_ready)
 
-    if giveaway_id not in active_giveaways:
-        await interaction.response.send_message("❌ Giveaway not found!", ephemeral=True)
+async def send_log(content: str = None, file: discord.File = None, embed: discord.Embed = None, guild: discord.Guild = None):
+    """Log to ``guild``'s configured log channel (the default one for bot-wide events)"""
+    channel_id = guild_config.get(guild.id if guild else None)["log_channel_id"]
+    if not channel_id:
         return
-
-    giveaway = active_giveaways[giveaway_id]
-    if not giveaway['ended']:
-        await interaction.response.send_message("❌ Giveaway hasn't ended yet!", ephemeral=True)
+    # A guild without its own log channel must not leak into another guild's
+    if guild is not None and guild.get_channel(channel_id) is None:
         return
+    log_dispatcher.submit(channel_id, content, embed=embed, file=file)
 
-    if not giveaway['participants']:
-        await interaction.response.send_message("❌ No participants to reroll from!", ephemeral=True)
-        return
-
-    winners_count = min(len(giveaway['participants']), winners)
-    new_winners = random.sample(giveaway['participants'], winners_count)
-    winners_mentions = ', '.join([f"<@{winner_id}>" for winner_id in new_winners])
-
-    await interaction.response.send_message(
-        f"🎉 **Rerolled Winners for** `{giveaway['prize']}`\n\nNew winners: {winners_mentions}\n**Host:** <@{giveaway['host_id']}>")
+bot.send_log = send_log
 
-# ============================================================
-#                    MODERATION SLASH COMMANDS
-# ============================================================
 
-# SLASH COMMAND - TIMEOUT
-@bot.tree.command(name="timeout", description="Timeout a user")
-async def timeout_slash(interaction: discord.Interaction, user: discord.Member, duration: str, reason: str = None):
-    """Timeout a user using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to timeout users!", ephemeral=True)
-        return
+# ---------------------------
+# Message pipeline
+# ---------------------------
+# Staged pipeline: extensions add their stages/triggers (AFK, ,,ps vru); non-prefixed
+# messages stop before any lowercasing or command parsing
+message_dispatcher = MessageDispatcher(bot.command_prefix, bot.process_commands)
+bot.message_dispatcher = message_dispatcher
 
-    seconds = parse_duration_to_seconds(duration)
-    if seconds is None:
-        await interaction.response.send_message("❌ Invalid duration format. Use examples: 30s, 10m, 2h, 1d", ephemeral=True)
-        return
+on_message_seconds = registry.histogram(
+    "bot_on_message_seconds", "on_message processing time",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0))
 
-    until = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+@bot.event
+async def on_message(message):
+    started = time.perf_counter()
+    await message_dispatcher.dispatch(message)
+    on_message_seconds.observe(time.perf_counter() - started)
+
+async def sync_commands_if_changed(force: bool = False) -> list:
+    results = await sync_tree(bot.tree, force=force)
+    for target, count in results:
+        if count is None:
+            print(f"✅ Slash commands unchanged ({target}), skipping sync")
+        else:
+            print(f"✅ Successfully synced {count} slash command(s) ({target})")
+    return results
 
+# Add manual sync command for debugging
+@bot.command(name='sync')
+@has_full_admin_access()
+async def sync_commands(ctx, mode: str = None):
+    """Sync slash commands if the tree changed (`,,sync force` always syncs)"""
     try:
-        await user.edit(timed_out_until=until)
-        await interaction.response.send_message(f"⏳ {user.mention} timed out for {duration}.")
-        await send_log(f"⏳ **Timeout** {user.mention} by {interaction.user.mention} for {duration} — Reason: {reason}")
+        results = await sync_commands_if_changed(force=(mode or "").lower() == "force")
+        lines = []
+        for target, count in results:
+            if count is None:
+                lines.append(f"✅ {target}: unchanged, nothing to sync (use `,,sync force` to sync anyway)")
+            else:
+                lines.append(f"✅ {target}: synced {count} slash command(s)")
+        await ctx.send("\n".join(lines))
     except Exception as e:
-        await interaction.response.send_message("❌ Could not apply timeout (bot missing permission or role hierarchy).", ephemeral=True)
-
-# SLASH COMMAND - BAN
-@bot.tree.command(name="ban", description="Ban a user from the server")
-async def ban_slash(interaction: discord.Interaction, user: discord.Member, reason: str = None):
-    """Ban a user using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to ban users!", ephemeral=True)
-        return
+        await ctx.send(f"❌ Failed to sync commands: {e}")
 
-    try:
-        await interaction.guild.ban(user, reason=reason)
-        await interaction.response.send_message(f"🔨 Banned {user.mention}.")
-        await send_log(f"🔨 **Banned** {user.mention} by {interaction.user.mention} — Reason: {reason}")
-    except Exception as e:
-        await interaction.response.send_message("❌ Could not ban that member (missing permissions / role hierarchy).", ephemeral=True)
-
-# SLASH COMMAND - KICK
-@bot.tree.command(name="kick", description="Kick a user from the server")
-async def kick_slash(interaction: discord.Interaction, user: discord.Member, reason: str = None):
-    """Kick a user using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to kick users!", ephemeral=True)
-        return
+# ---------------------------
+# Extensions (hot reload without dropping the gateway connection)
+# ---------------------------
+def _extension_name(name: str) -> str:
+    return name if "." in name else f"cogs.{name}"
 
-    try:
-        await interaction.guild.kick(user, reason=reason)
-        await interaction.response.send_message(f"⛔ Kicked {user.mention}.")
-        await send_log(f"⛔ **Kicked** {user.mention} by {interaction.user.mention} — Reason: {reason}")
-    except Exception as e:
-        await interaction.response.send_message("❌ Could not kick that member (missing permissions / role hierarchy).", ephemeral=True)
-
-# SLASH COMMAND - GIVE ROLE
-@bot.tree.command(name="give_role", description="Give roles to a user")
-async def give_role_slash(interaction: discord.Interaction, user: discord.Member, role: discord.Role):
-    """Give role to user using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to give roles!", ephemeral=True)
+@bot.command(name='ext')
+@has_full_admin_access()
+async def extension_command(ctx, action: str = "list", name: str = None):
+    """Load, unload or reload a feature extension (`,,ext reload tickets`)"""
+    action = action.lower()
+    if action == "list" or name is None:
+        loaded = set(bot.extensions)
+        lines = [f"{'🟢' if ext in loaded else '⚪'} `{ext}`" for ext in sorted(loaded | set(DEFAULT_EXTENSIONS))]
+        await ctx.send("🧩 **Extensions**\n" + "\n".join(lines) + "\nUsage: `,,ext <load|unload|reload> <name>`")
         return
 
-    try:
-        await user.add_roles(role)
-        await interaction.response.send_message(f"✅ **Role Added!**\n👤 User: {user.mention}\n🎭 Role: {role.name}")
-        await send_log(f"🛠️ **Role Added**\nAdmin: {interaction.user.mention}\nUser: {user.mention}\nRole: {role.name}")
-    except Exception:
-        await interaction.response.send_message("❌ Could not add role (check bot permissions and role hierarchy).", ephemeral=True)
-
-# SLASH COMMAND - REMOVE ROLE
-@bot.tree.command(name="remove_role", description="Remove roles from a user")
-async def remove_role_slash(interaction: discord.Interaction, user: discord.Member, role: discord.Role):
-    """Remove role from user using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to remove roles!", ephemeral=True)
+    handlers = {"load": bot.load_extension, "unload": bot.unload_extension, "reload": bot.reload_extension}
+    if action not in handlers:
+        await ctx.send("❌ Unknown action. Use: load, unload, reload or list")
         return
 
+    extension = _extension_name(name)
+    started = time.perf_counter()
     try:
-        await user.remove_roles(role)
-        await interaction.response.send_message(f"🗑️ **Role Removed!**\n👤 User: {user.mention}\n🎭 Removed: {role.name}")
-        await send_log(f"🗑️ **Role Removed**\nAdmin: {interaction.user.mention}\nUser: {user.mention}\nRemoved: {role.name}")
-    except Exception:
-        await interaction.response.send_message("❌ Could not remove role (check permissions).", ephemeral=True)
-
-# SLASH COMMAND - CHANGE NICKNAME
-@bot.tree.command(name="change_nickname", description="Change a user's nickname")
-async def change_nickname_slash(interaction: discord.Interaction, user: discord.Member, nickname: str):
-    """Change nickname using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in FULL_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to change nicknames!", ephemeral=True)
+        await handlers[action](extension)
+    except commands.ExtensionError as e:
+        await ctx.send(f"❌ Could not {action} `{extension}`: {e}")
         return
+    elapsed_ms = (time.perf_counter() - started) * 1000
 
+    # Only costs a REST call when the extension actually changed the slash commands
     try:
-        await user.edit(nick=nickname)
-        await interaction.response.send_message(f"✏️ Nickname changed for {user.mention} → **{nickname}**")
-        await send_log(f"✏️ **Nickname Changed**\nAdmin: {interaction.user.mention}\nUser: {user.mention}\nNew Nickname: **{nickname}**")
-    except Exception:
-        await interaction.response.send_message("❌ I don't have permission to change that nickname.", ephemeral=True)
-
-# ============================================================
-#                    UTILITY SLASH COMMANDS
-# ============================================================
-
-# SLASH COMMAND - TIMER
-@bot.tree.command(name="timer", description="Start a timer")
-async def timer_slash(interaction: discord.Interaction, duration: str, message: str = None):
-    """Start a timer using slash command"""
-    seconds = parse_duration_to_seconds(duration)
-    if seconds is None:
-        await interaction.response.send_message("❌ Invalid duration format. Use: 30s, 10m, 2h, 1d", ephemeral=True)
-        return
+        results = await sync_commands_if_changed() if cluster.is_primary else []
+        synced = ", ".join(f"{target} ({count})" for target, count in results if count is not None)
+        sync_note = f" Slash commands synced: {synced}." if synced else ""
+    except Exception as e:
+        sync_note = f" ⚠️ Slash command sync failed: {e}"
+    await ctx.send(f"✅ {action.title()}ed `{extension}` in {elapsed_ms:.0f} ms.{sync_note}")
+    await send_log(f"🧩 **Extension {action}ed** `{extension}` by {ctx.author.mention}", guild=ctx.guild)
 
-    await interaction.response.send_message(f"⏱️ Timer started for **{duration}** — I'll remind you when it's done, {interaction.user.mention}.")
+@bot.command(name='logstats')
+@has_full_admin_access()
+async def log_stats(ctx):
+    """Show log pipeline counters (queue depth, drops, spool)"""
+    stats = log_dispatcher.stats
+    await ctx.send(
+        f"📊 **Log pipeline**\n"
+        f"Queued now: {log_dispatcher.depth} (peak {stats['max_depth']})\n"
+        f"Events: {stats['enqueued']} queued, {stats['entries_sent']} sent in {stats['messages_sent']} message(s)\n"
+        f"Dropped: {stats['dropped']} | Send failures: {stats['send_failures']}\n"
+        f"Spooled: {stats['spooled']} | Replayed: {stats['replayed']} | Undeliverable: {stats['dead']}\n"
+        f"Outbound queue: {outbound.depth()} | In flight: {outbound.in_flight()} | "
+        f"Coalesced: {outbound.stats['coalesced']} (peak queue {outbound.stats['max_depth']})")
 
-    async def run_timer():
-        try:
-            await asyncio.sleep(seconds)
-            if message:
-                await interaction.channel.send(f"⏰ **Timer finished** ({duration}) — {interaction.user.mention}\n{message}")
-            else:
-                await interaction.channel.send(f"⏰ **Timer finished** ({duration}) — {interaction.user.mention}")
-        except asyncio.CancelledError:
-            pass
-        finally:
-            active_timers.pop(interaction.user.id, None)
-
-    task = bot.loop.create_task(run_timer())
-    active_timers[interaction.user.id] = task
-
-# SLASH COMMAND - END TIMER
-@bot.tree.command(name="end_timer", description="Stop your active timer")
-async def end_timer_slash(interaction: discord.Interaction):
-    """End timer using slash command"""
-    user_id = interaction.user.id
-    task = active_timers.get(user_id)
-    if task and not task.done():
-        task.cancel()
-        await interaction.response.send_message(f"⏹️ Timer stopped, {interaction.user.mention}")
-        del active_timers[user_id]
-    else:
-        await interaction.response.send_message("❌ You don't have an active timer.", ephemeral=True)
-
-# SLASH COMMAND - AFK
-@bot.tree.command(name="afk", description="Set yourself as AFK")
-async def afk_slash(interaction: discord.Interaction, reason: str = "AFK"):
-    """Set AFK using slash command"""
-    afk_users[interaction.user.id] = {
-        "since": datetime.now(timezone.utc),
-        "reason": reason,
-        "channel": interaction.channel.id,
-        "pinged_by": []
+# ---------------------------
+# Metrics (scraped from /metrics on the health server)
+# ---------------------------
+def _state_sizes():
+    state = bot.state
+    return {
+        ("active_giveaways",): len(state.peek("giveaways", {}).get("active", ())),
+        ("ended_giveaways",): len(state.peek("giveaways", {}).get("ended", ())),
+        ("ticket_data",): len(state.peek("tickets", {}).get("ticket_data", ())),
+        ("afk_users",): sum(len(users) for users in state.peek("afk_users", {}).values()),
+        ("active_timers",): len(state.peek("active_timers", ())),
+        ("scheduler_jobs",): len(scheduler),
     }
-    await interaction.response.send_message(f"💤 {interaction.user.mention} is now AFK: {reason}")
-
-# SLASH COMMAND - HELP
-@bot.tree.command(name="help", description="Show all available commands")
-async def help_slash(interaction: discord.Interaction):
-    """Show help using slash command"""
-    embed = discord.Embed(title="✨ BOT COMMANDS PANEL", description="All available slash commands with role permissions", color=0x2F3136)
-
-    divider = "───────────────────────────────"
-
-    # Giveaway Commands
-    embed.add_field(name=f"{divider}\n🎁 GIVEAWAY COMMANDS\n{divider}", value="\u200b", inline=False)
-    embed.add_field(name="/giveaway_create", value="Create a new giveaway\n`prize`, `duration`, `winners`, `host`\n👑 Full Admins + 🎉 Giveaway Role", inline=True)
-    embed.add_field(name="/giveaway_end", value="End a giveaway early\n`giveaway_id`\n👑 Full Admins + 🎉 Giveaway Role", inline=True)
-    embed.add_field(name="/giveaway_list", value="List all active giveaways\n👥 Everyone", inline=True)
-    embed.add_field(name="/giveaway_reroll", value="Reroll winners\n`giveaway_id`, `winners`\n👑 Full Admins + 🎉 Giveaway Role", inline=True)
-
-    # Moderation Commands
-    embed.add_field(name=f"{divider}\n🔐 MODERATION COMMANDS\n{divider}", value="\u200b", inline=False)
-    embed.add_field(name="/timeout", value="Timeout a user\n`user`, `duration`, `reason`\n👑 Full Admins Only", inline=True)
-    embed.add_field(name="/ban", value="Ban a user\n`user`, `reason`\n👑 Full Admins Only", inline=True)
-    embed.add_field(name="/kick", value="Kick a user\n`user`, `reason`\n👑 Full Admins Only", inline=True)
-    embed.add_field(name="/give_role", value="Give role to user\n`user`, `role`\n👑 Full Admins Only", inline=True)
-    embed.add_field(name="/remove_role", value="Remove role from user\n`user`, `role`\n👑 Full Admins Only", inline=True)
-    embed.add_field(name="/change_nickname", value="Change nickname\n`user`, `nickname`\n👑 Full Admins Only", inline=True)
-
-    # Utility Commands
-    embed.add_field(name=f"{divider}\n⚙️ UTILITY COMMANDS\n{divider}", value="\u200b", inline=False)
-    embed.add_field(name="/timer", value="Start a timer\n`duration`, `message`\n👥 Everyone", inline=True)
-    embed.add_field(name="/end_timer", value="Stop your timer\n👥 Everyone", inline=True)
-    embed.add_field(name="/afk", value="Set yourself as AFK\n`reason`\n👥 Everyone", inline=True)
-    embed.add_field(name="/help", value="Show this help menu\n👥 Everyone", inline=True)
-
-    # Ticket Commands
-    embed.add_field(name=f"{divider}\n🎫 TICKET COMMANDS\n{divider}", value="\u200b", inline=False)
-    embed.add_field(name="/ticket_setup", value="Setup ticket system\n`channel`\n👑 Full Admins + 🎫 Ticket Admin", inline=True)
-    embed.add_field(name="/ticket_close", value="Close current ticket\n👑 Full Admins + 🎫 Ticket Admin", inline=True)
-
-    # Role Legend
-    embed.add_field(name=f"{divider}\n🔑 ROLE PERMISSIONS\n{divider}", value="\u200b", inline=False)
-    embed.add_field(name="👑 Full Admins", value="Can use ALL commands", inline=True)
-    embed.add_field(name="🎫 Ticket Admin", value="Can only use ticket commands", inline=True)
-    embed.add_field(name="🎉 Giveaway Role", value="Can only use giveaway commands", inline=True)
-
-    embed.set_footer(text="💡 Use slash commands for better experience!")
-    await interaction.response.send_message(embed=embed, ephemeral=True)
-
-# ============================================================
-#                    TICKET SYSTEM SLASH COMMANDS
-# ============================================================
-
-# SLASH COMMAND - TICKET SETUP
-@bot.tree.command(name="ticket_setup", description="Setup the ticket system in a channel")
-async def ticket_setup_slash(interaction: discord.Interaction, channel: discord.TextChannel = None):
-    """Setup ticket system using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in TICKET_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to setup tickets!", ephemeral=True)
-        return
-
-    target_channel = channel or interaction.channel
-    ticket_system = bot.get_cog('TicketSystem')
-    if not ticket_system:
-        ticket_system = TicketSystem(bot)
-        await bot.add_cog(ticket_system)
-
-    await ticket_system.create_ticket_panel(target_channel.id)
-    await interaction.response.send_message(f"✅ Ticket panel created/updated in {target_channel.mention}", ephemeral=True)
-
-# SLASH COMMAND - TICKET CLOSE
-@bot.tree.command(name="ticket_close", description="Close the current ticket")
-async def ticket_close_slash(interaction: discord.Interaction):
-    """Close ticket using slash command"""
-    # Check permissions
-    user_roles = [role.id for role in interaction.user.roles]
-    has_access = any(role_id in user_roles for role_id in TICKET_ADMIN_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-    if not has_access:
-        await interaction.response.send_message("❌ You don't have permission to close tickets!", ephemeral=True)
-        return
-
-    ticket_system = bot.get_cog('TicketSystem')
-    if ticket_system:
-        await ticket_system.close_ticket(interaction, interaction.channel.id)
-    else:
-        await interaction.response.send_message("❌ Ticket system not loaded.", ephemeral=True)
-
-# ============================================================
-#                    TICKET SYSTEM (UPDATED)
-# ============================================================
-TICKET_CATEGORY_NAME = "tickets"
-# Updated support roles to include the specific role IDs
-SUPPORT_ROLE_IDS = FULL_ADMIN_ROLE_IDS + [1420001481322401893]  # Full admins + ticket admin
-
-TICKET_WELCOME_MESSAGES = {
-    "support": "👋 **Welcome to Support Ticket!**\n\nPlease describe your issue in detail and our support team will assist you shortly.",
-    "invite": "🎁 **Welcome to Invite Rewards!**\n\nPlease provide your invite details and we'll process your rewards.",
-    "giveaway": "🎉 **Welcome to Giveaway Claim!**\n\nPlease provide the giveaway details and proof of winning."
-}
-
-class TicketView(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
-
-    @discord.ui.button(label="Support Ticket", style=discord.ButtonStyle.blurple, custom_id="support_ticket")
-    async def support_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer()
-        ticket_system = bot.get_cog('TicketSystem')
-        if ticket_system:
-            await ticket_system.create_ticket(interaction, "support", "🛠️ Support Ticket")
-
-    @discord.ui.button(label="Invite Rewards", style=discord.ButtonStyle.green, custom_id="invite_ticket")
-    async def invite_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer()
-        ticket_system = bot.get_cog('TicketSystem')
-        if ticket_system:
-            await ticket_system.create_ticket(interaction, "invite", "🎁 Invite Rewards")
-
-    @discord.ui.button(label="Giveaway Claim", style=discord.ButtonStyle.gray, custom_id="giveaway_ticket")
-    async def giveaway_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer()
-        ticket_system = bot.get_cog('TicketSystem')
-        if ticket_system:
-            await ticket_system.create_ticket(interaction, "giveaway", "🎉 Giveaway Claim")
-
-class CloseTicketView(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
-
-    @discord.ui.button(label="Close Ticket", style=discord.ButtonStyle.red, custom_id="close_ticket")
-    async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        # Check if user has ticket admin access
-        user_roles = [role.id for role in interaction.user.roles]
-        has_access = any(role_id in user_roles for role_id in SUPPORT_ROLE_IDS) or interaction.user.guild_permissions.administrator
-
-        if not has_access:
-            await interaction.response.send_message("❌ You don't have permission to close tickets.", ephemeral=True)
-            return
-
-        await interaction.response.defer()
-        ticket_system = bot.get_cog('TicketSystem')
-        if ticket_system:
-            await ticket_system.close_ticket(interaction)
-
-class TicketSystem(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
-        self.ticket_data = {}
-
-    @commands.Cog.listener()
-    async def on_ready(self):
-        self.bot.add_view(TicketView())
-        self.bot.add_view(CloseTicketView())
-
-    async def create_ticket_panel(self, channel_id):
-        channel = self.bot.get_channel(channel_id)
-        if not channel:
-            return
-
-        existing_message = None
-        async for message in channel.history(limit=100):
-            if message.author == self.bot.user and message.embeds:
-                embed = message.embeds[0]
-                if "Ticket System" in embed.title:
-                    existing_message = message
-                    break
-
-        embed = discord.Embed(
-            title="🎫 Ticket System",
-            description="**Support Ticket** - Get help from staff.\n"
-                        "**Invite Rewards** - Claim rewards for invites.\n"
-                        "**Giveaway Claim** - Claim giveaway prizes.\n\n"
-                        "Click one of the buttons below to create a ticket.",
-            color=0x3498db)
-        embed.set_footer(text="PVB Bot - Ticket System")
-
-        view = TicketView()
-
-        if existing_message:
-            # Update existing message silently (no new message)
-            await existing_message.edit(embed=embed, view=view)
-            return existing_message
-        else:
-            # Send new message only if no existing panel found
-            message = await channel.send(embed=embed, view=view)
-            return message
-
-    async def create_ticket(self, interaction: discord.Interaction, ticket_type: str, ticket_name: str):
-        user = interaction.user
-        guild = interaction.guild
-
-        for channel_id, data in self.ticket_data.items():
-            if data['user_id'] == user.id and not data['closed']:
-                channel = guild.get_channel(channel_id)
-                if channel:
-                    await interaction.followup.send(f"You already have an open ticket: {channel.mention}", ephemeral=True)
-                    return
-
-        category = discord.utils.get(guild.categories, name=TICKET_CATEGORY_NAME)
-        if not category:
-            overwrites = {
-                guild.default_role: discord.PermissionOverwrite(view_channel=False),
-                guild.me: discord.PermissionOverwrite(view_channel=True, manage_channels=True)
-            }
-            category = await guild.create_category(TICKET_CATEGORY_NAME, overwrites=overwrites)
-
-        channel_name = f"{ticket_type}-{user.name}-{user.discriminator}".lower().replace(" ", "-")
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(view_channel=False),
-            user: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True),
-            guild.me: discord.PermissionOverwrite(view_channel=True, manage_channels=True)
-        }
-
-        # Add support role IDs instead of role names
-        for role_id in SUPPORT_ROLE_IDS:
-            role = guild.get_role(role_id)
-            if role:
-                overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True, manage_messages=True)
-
-        ticket_channel = await category.create_text_channel(
-            name=channel_name,
-            overwrites=overwrites,
-            topic=f"{ticket_name} for {user.display_name} | Created at {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        )
-
-        self.ticket_data[ticket_channel.id] = {
-            'user_id': user.id,
-            'ticket_type': ticket_type,
-            'created_at': datetime.now(),
-            'closed': False
-        }
-
-        welcome_message = TICKET_WELCOME_MESSAGES.get(ticket_type, "Welcome to your ticket!")
-        embed = discord.Embed(
-            title=ticket_name,
-            description=f"Hello {user.mention}!\n\n{welcome_message}\n\n"
-                        f"**Ticket Type:** {ticket_name}\n"
-                        f"**Created:** <t:{int(datetime.now().timestamp())}:F>\n"
-                        f"**User:** {user.display_name}",
-            color=0x3498db)
-
-        if ticket_type == "support":
-            embed.add_field(
-                name="📝 Support Instructions",
-                value="Please describe your issue in detail. Include:\n• What happened\n• When it occurred\n• Any error messages",
-                inline=False)
-        elif ticket_type == "invite":
-            embed.add_field(
-                name="🎁 Invite Rewards",
-                value="Please provide:\n• Your invite code\n• Number of invites\n• Screenshots if available",
-                inline=False)
-        elif ticket_type == "giveaway":
-            embed.add_field(
-                name="🎉 Giveaway Claim",
-                value="Please provide:\n• Giveaway ID or name\n• Your username\n• Proof of winning",
-                inline=False)
-
-        close_view = CloseTicketView()
-        await ticket_channel.send(embed=embed, view=close_view)
-        await interaction.followup.send(f"✅ Ticket created: {ticket_channel.mention}", ephemeral=True)
-
-        log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
-        if log_channel:
-            log_embed = discord.Embed(
-                title="🎫 Ticket Created",
-                description=f"**Type:** {ticket_name}\n"
-                            f"**User:** {user.mention} ({user.id})\n"
-                            f"**Channel:** {ticket_channel.mention}\n"
-                            f"**Time:** <t:{int(datetime.now().timestamp())}:F>",
-                color=0x00ff00)
-            await log_channel.send(embed=log_embed)
-
-    async def close_ticket(self, interaction: discord.Interaction, channel_id: int = None):
-        channel = interaction.channel if not channel_id else self.bot.get_channel(channel_id)
-        if not channel:
-            await interaction.followup.send("❌ Channel not found.", ephemeral=True)
-            return
-
-        ticket_data = self.ticket_data.get(channel.id)
-        if not ticket_data:
-            await interaction.followup.send("❌ This channel is not a valid ticket.", ephemeral=True)
-            return
-
-        if ticket_data['closed']:
-            await interaction.followup.send("❌ This ticket is already closed.", ephemeral=True)
-            return
-
-        ticket_data['closed'] = True
-        user = interaction.guild.get_member(ticket_data['user_id'])
-
-        countdown_msg = await channel.send("🔒 **Closing this ticket in 10 seconds...**")
-        for i in range(9, 0, -1):
-            await asyncio.sleep(1)
-            await countdown_msg.edit(content=f"🔒 **Closing this ticket in {i} seconds...**")
-
-        await countdown_msg.edit(content="🔒 **Closing now...**")
-
-        log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
-        if log_channel:
-            log_embed = discord.Embed(
-                title="🎫 Ticket Closed",
-                description=f"**Type:** {ticket_data['ticket_type'].title()} Ticket\n"
-                            f"**User:** {user.mention if user else 'Unknown'} ({ticket_data['user_id']})\n"
-                            f"**Channel:** #{channel.name}\n"
-                            f"**Closed by:** {interaction.user.mention}\n"
-                            f"**Duration:** {datetime.now() - ticket_data['created_at']}",
-                color=0xff0000)
-            await log_channel.send(embed=log_embed)
 
-        try:
-            if user:
-                try:
-                    user_embed = discord.Embed(
-                        title="🎫 Ticket Closed",
-                        description=f"Your {ticket_data['ticket_type']} ticket has been closed.\n"
-                                    f"**Closed by:** {interaction.user.display_name}\n"
-                                    f"**Channel:** #{channel.name}",
-                        color=0xff0000)
-                    await user.send(embed=user_embed)
-                except:
-                    pass
-        except:
-            pass
-
-        await channel.delete()
-        if channel.id in self.ticket_data:
-            del self.ticket_data[channel.id]
-
-# ORIGINAL TICKET COMMANDS (with updated permissions)
-@bot.command(name='ticketsetup')
-@has_ticket_admin_access()
-async def ticketsetup(ctx, channel: discord.TextChannel = None):
-    """Setup the ticket system in a channel"""
-    target_channel = channel or ctx.channel
-    ticket_system = bot.get_cog('TicketSystem')
-    if not ticket_system:
-        ticket_system = TicketSystem(bot)
-        await bot.add_cog(ticket_system)
-
-    await ticket_system.create_ticket_panel(target_channel.id)
-    await ctx.send(f"✅ Ticket panel created/updated in {target_channel.mention}")
-
-@bot.command(name='ticketclose')
-@has_ticket_admin_access()
-async def ticketclose(ctx):
-    """Close the current ticket (for staff)"""
-    ticket_system = bot.get_cog('TicketSystem')
-    if ticket_system:
-        await ticket_system.close_ticket(ctx, ctx.channel.id)
-    else:
-        await ctx.send("❌ Ticket system not loaded.")
-
-@bot.command(name='ticketmessage')
-@has_ticket_admin_access()
-async def ticketmessage(ctx, ticket_type: str, *, message: str):
-    """Customize ticket welcome messages"""
-    if ticket_type not in ["support", "invite", "giveaway"]:
-        await ctx.send("❌ Invalid ticket type. Use: support, invite, or giveaway")
-        return
-
-    TICKET_WELCOME_MESSAGES[ticket_type] = message
-    await ctx.send(f"✅ {ticket_type.title()} ticket message updated!")
-
-# ============================================================
-#                    OTHER COMMANDS (KEEP EXISTING)
-# ============================================================
-
-# Active timers and AFK dictionaries
-active_timers = {}
-afk_users = {}
+registry.gauge("bot_state_entries", "Entries held in in-memory bot state stores", ("store",), callback=_state_sizes)
+registry.gauge("bot_gateway_latency_seconds", "Gateway heartbeat latency", callback=lambda: bot.latency)
+registry.gauge("bot_guilds", "Guilds the bot is in", callback=lambda: len(bot.guilds))
+registry.gauge("bot_shard_latency_seconds", "Gateway heartbeat latency per shard", ("shard",),
+               callback=lambda: {(shard_id,): latency for shard_id, latency in getattr(bot, "latencies", ())})
+registry.gauge("bot_member_cache_entries", "Members held by discord.py's member cache and the lookup LRU", ("cache",),
+               callback=lambda: {("discord",): sum(len(guild.members) for guild in bot.guilds),
+                                 ("lookup_lru",): len(bot.members)})
+registry.gauge("bot_log_queue_depth", "Log events waiting to be sent", callback=lambda: log_dispatcher.depth)
+registry.gauge("bot_log_events", "Log pipeline counters since start", ("event",),
+               callback=lambda: {(name,): value for name, value in log_dispatcher.stats.items()})
+registry.gauge("bot_outbound_queue_depth", "Outbound calls waiting for admission, per priority", ("priority",),
+               callback=lambda: {(priority,): depth for priority, depth in outbound.depth().items()})
+registry.gauge("bot_outbound_in_flight", "Outbound calls running, per priority", ("priority",),
+               callback=lambda: {(priority,): count for priority, count in outbound.in_flight().items()})
+registry.gauge("bot_case_log_pending", "Moderation cases waiting to be written", callback=lambda: case_log.pending)
+registry.gauge("bot_case_log_events", "Moderation case log counters since start", ("event",),
+               callback=lambda: {(name,): value for name, value in case_log.stats.items()})
 
 @bot.event
-async def on_message(message):
-    if message.author.bot:
-        return
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    InstrumentedTree.record_finish(interaction, "ok")
 
-    # AFK check
-    if message.author.id in afk_users:
-        data = afk_users.pop(message.author.id)
-        since = datetime.now(timezone.utc) - data["since"]
-        seconds = int(since.total_seconds())
-        hours, remainder = divmod(seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        pinged_users = data.get("pinged_by", [])
-        pinged_text = ""
-        if pinged_users:
-            mentions = [f"<@{uid}>" for uid in pinged_users]
-            pinged_text = f"\n⚡ You were pinged by: {', '.join(mentions)} in <#{data['channel']}>"
-        await message.channel.send(
-            f"✅ Welcome back {message.author.mention}! You were AFK for {hours}h {minutes}m {seconds}s.{pinged_text}")
-
-    # Mention check for AFK users
-    for user in message.mentions:
-        if user.id in afk_users:
-            data = afk_users[user.id]
-            data["pinged_by"].append(message.author.id)
-            await message.channel.send(f"💤 {user.display_name} is AFK due to the following reason: {data['reason']}")
-
-    # PS VRU command
-    if message.content.lower().strip() == ",,ps vru":
-        if not message.author.guild_permissions.administrator:
-            await message.channel.send("❌ You must be an **Administrator** to use this command.")
-            return
+async def metrics_endpoint(request):
+    return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8",
+                        headers={"X-Prometheus-Format": "0.0.4"})
 
-        try:
-            await message.delete()
-        except Exception:
-            pass
-
-        await message.channel.send(
-            "🌐 **Join vru's PVB Private Server!**\n"
-            "👉 Click here: "
-            "[Server Link](<https://www.roblox.com/share?code=a3f72c3d9218634dac40fdd73df44c6e&type=Server>)\n"
-            "🔗 Or use the raw link:\n"
-            "https://www.roblox.com/share?code=a3f72c3d9218634dac40fdd73df44c6e&type=Server"
-        )
-
-        await send_log(f"🌐 **PS VRU Command Used by** {message.author.mention}")
-        return
+health_server.add_route("/metrics", metrics_endpoint)
 
-    await bot.process_commands(message)
-
-# Add manual sync command for debugging
-@bot.command(name='sync')
+# ---------------------------
+# Memory diagnostics (,,mem and /debug/memory)
+# ---------------------------
+memory_diagnostics = MemoryDiagnostics(bot, stores={
+    "scheduler": lambda: scheduler,
+    "guild_config_cache": lambda: guild_config,
+    "permission_cache": lambda: resolver,
+    "member_lookup_lru": lambda: bot.members,
+})
+
+async def send_code_block(ctx, text: str, limit: int = 1990):
+    """Send ``text`` as code blocks, split on line boundaries to fit Discord's message limit"""
+    chunk = ""
+    for line in text.splitlines():
+        if chunk and len(chunk) + len(line) + 8 > limit:
+            await ctx.send(f"```\n{chunk}```")
+            chunk = ""
+        chunk += line[:limit - 8] + "\n"
+    if chunk:
+        await ctx.send(f"```\n{chunk}```")
+
+@bot.command(name='mem')
 @has_full_admin_access()
-async def sync_commands(ctx):
-    """Manually sync slash commands"""
+async def memory_command(ctx, action: str = None, name: str = None, other: str = None):
+    """Memory report; `,,mem top [n]`, `,,mem trace <start|stop> [frames]`, `,,mem snapshot <name>`, `,,mem diff <name> [name]`"""
+    action = (action or "report").lower()
     try:
-        synced = await bot.tree.sync()
-        await ctx.send(f"✅ Successfully synced {len(synced)} slash command(s)")
-        for command in synced:
-            await ctx.send(f"  - /{command.name}")
-    except Exception as e:
-        await ctx.send(f"❌ Failed to sync commands: {e}")
-
-# Add the cog when bot starts
+        if action == "report":
+            await send_code_block(ctx, format_report(memory_diagnostics.report(top=5)))
+        elif action == "top":
+            if not memory_diagnostics.tracing:
+                await ctx.send("❌ tracemalloc is off. Start it with `,,mem trace start`")
+                return
+            stats = memory_diagnostics.top_allocations(int(name) if name else 15)
+            await send_code_block(ctx, "Top allocation sites:\n" + "\n".join(format_allocations(stats)))
+        elif action == "trace" and name in ("start", "stop"):
+            if name == "start":
+                memory_diagnostics.start_tracing(int(other) if other else 1)
+                await ctx.send("✅ tracemalloc started. Take snapshots with `,,mem snapshot <name>`")
+            else:
+                memory_diagnostics.stop_tracing()
+                await ctx.send("✅ tracemalloc stopped, snapshots dropped")
+        elif action == "snapshot" and name:
+            traced = memory_diagnostics.snapshot(name)
+            await ctx.send(f"📸 Snapshot `{name}` taken ({traced / 1024 / 1024:.1f} MB traced). "
+                           f"Compare later with `,,mem diff {name}`")
+        elif action == "diff" and name:
+            await send_code_block(ctx, format_diff(memory_diagnostics.diff(name, other, limit=15)))
+        else:
+            await ctx.send("❌ Usage: `,,mem`, `,,mem top [n]`, `,,mem trace <start|stop> [frames]`, "
+                           "`,,mem snapshot <name>`, `,,mem diff <name> [name]`")
+    except KeyError as e:
+        await ctx.send(f"❌ Unknown snapshot {e}. Snapshots: "
+                       f"{', '.join(s['name'] for s in memory_diagnostics.snapshots()) or 'none'}")
+    except (RuntimeError, ValueError) as e:
+        await ctx.send(f"❌ {e}")
+
+DEBUG_TOKEN = os.environ.get("DEBUG_TOKEN")
+
+async def debug_memory_endpoint(request):
+    """JSON memory report. ?top=N, ?trace=start|stop, ?snapshot=<name>, ?diff=<name>[&to=<name>]
+
+    Requires ``DEBUG_TOKEN`` (as ?token= or a Bearer header) when set, otherwise loopback only.
+    """
+    if DEBUG_TOKEN:
+        supplied = request.query.get("token") or request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if supplied != DEBUG_TOKEN:
+            return web.json_response({"error": "unauthorized"}, status=401)
+    elif request.remote not in ("127.0.0.1", "::1"):
+        return web.json_response({"error": "set DEBUG_TOKEN to allow remote access"}, status=403)
+
+    query = request.query
+    try:
+        result = {}
+        if query.get("trace") == "start":
+            memory_diagnostics.start_tracing(int(query.get("frames", 1)))
+        elif query.get("trace") == "stop":
+            memory_diagnostics.stop_tracing()
+        if "snapshot" in query:
+            result["snapshot"] = {"name": query["snapshot"], "traced_bytes": memory_diagnostics.snapshot(query["snapshot"])}
+        if "diff" in query:
+            result["diff"] = memory_diagnostics.diff(query["diff"], query.get("to"), limit=int(query.get("top", 10)))
+        result.update(memory_diagnostics.report(top=int(query.get("top", 10))))
+    except KeyError as e:
+        return web.json_response({"error": f"unknown snapshot {e}"}, status=404)
+    except (RuntimeError, ValueError) as e:
+        return web.json_response({"error": str(e)}, status=400)
+    return web.json_response(result)
+
+health_server.add_route("/debug/memory", debug_memory_endpoint)
+
+startup_seconds = registry.gauge("bot_startup_seconds", "Seconds from process start to each startup phase", ("phase",))
+extension_load_seconds = registry.gauge("bot_extension_load_seconds", "Time to load each extension at startup", ("extension",))
+
+# Load the extensions and re-arm scheduled jobs when bot starts
 async def setup_hook():
-    await bot.add_cog(TicketSystem(bot))
+    startup_seconds.set(time.perf_counter() - STARTED_AT, "login")
+    instrument_http(bot.http)
+    outbound.track_interactions(bot.http)
+    await health_server.start()
+
+    # Jobs are loaded first so extensions can read them (e.g. active timers) in cog_load
+    scheduler.load()
+    for extension in EXTENSIONS:
+        started = time.perf_counter()
+        try:
+            await bot.load_extension(extension)
+        except commands.ExtensionError as e:
+            print(f"❌ Failed to load extension {extension}: {e}")
+            continue
+        extension_load_seconds.set(time.perf_counter() - started, extension)
+    startup_seconds.set(time.perf_counter() - STARTED_AT, "setup_hook")
+    log_dispatcher.start()
+    case_log.start()
+    asyncio.create_task(start_background_work())
+
+async def start_background_work():
+    """Run-once startup: sync commands, reconcile giveaways and re-arm scheduled jobs"""
+    await bot.wait_until_ready()
+    ready_after = time.perf_counter() - STARTED_AT
+    startup_seconds.set(ready_after, "ready")
+    print(f"✅ Cold start: ready {ready_after:.2f}s after process start")
+    # Slash commands are global: one cluster syncs them for all
+    if cluster.is_primary:
+        try:
+            await sync_commands_if_changed()
+        except Exception as e:
+            print(f"❌ Failed to sync slash commands: {e}")
+    giveaways = bot.get_cog('Giveaways')
+    try:
+        if giveaways:
+            await giveaways.reconcile_giveaway_entries()
+    except Exception as e:
+        print(f"❌ Failed to reconcile giveaway entries: {e}")
+    scheduler.start()
+    log_dispatcher.replay_spool()
+    await send_log("✅ **Bot is now Ready!** 😎")
 
 bot.setup_hook = setup_hook
 
+_bot_close = bot.close
+
+async def close():
+    # Spool the logs not sent yet and write the cases still queued before the loop goes away
+    await log_dispatcher.stop()
+    await case_log.stop()
+    case_log.close()
+    # Last: stops the job runner and flushes every debounced JSON write (jobs, giveaways ...)
+    await scheduler.stop()
+    await _bot_close()
+
+bot.close = close
+
 # Run the bot
 bot.run(TOKEN)
@@ -0,0 +1,225 @@
+"""Local stand-in for Discord's REST API and gateway, for testing shard/cluster mode.
+
+    python -m tools.fake_gateway --guilds 40 --port 8765
+    DISCORD_API_BASE=http://127.0.0.1:8765/api/v10 \\
+    DISCORD_GATEWAY_URL=ws://127.0.0.1:8765/gateway \\
+    BOTTOKEN=fake python launcher.py --shards 4 --clusters 2 --stagger 0
+
+It implements just enough for discord.py to log in and connect every shard:
+``/users/@me``, ``/oauth2/applications/@me``, ``/gateway/bot``, member
+fetches, command sync, and a gateway that answers HELLO/IDENTIFY/heartbeats,
+then sends READY plus a GUILD_CREATE for each fake guild routed to the
+identifying shard. ``--members N`` gives every guild N synthetic members,
+served through REQUEST_GUILD_MEMBERS chunks as for a large guild.
+
+``GET /_fake/shards`` shows which shards are connected and which guilds each
+received. ``POST /_fake/dispatch`` with ``{"guild_id": ..., "t": ..., "d": ...}``
+pushes an event to the shard that owns the guild.
+"""
+import argparse
+import itertools
+import json
+
+from aiohttp import WSMsgType, web
+
+BOT_ID = 100000000000000001
+APPLICATION_ID = 100000000000000002
+GUILD_ID_BASE = 1_100_000_000_000_000_000
+MEMBER_ID_BASE = 300_000_000_000_000_000
+MEMBER_CHUNK_SIZE = 1000  # Discord sends at most 1000 members per GUILD_MEMBERS_CHUNK
+
+_snowflakes = itertools.count(200000000000000000)
+
+
+def json_response(data, status: int = 200):
+    # discord.py only decodes bodies whose content-type is exactly "application/json" (no charset)
+    return web.Response(body=json.dumps(data).encode(), status=status, headers={"Content-Type": "application/json"})
+
+
+def bot_user():
+    return {"id": str(BOT_ID), "username": "FakeBot", "discriminator": "0000", "global_name": None,
+            "avatar": None, "bot": True, "flags": 0}
+
+
+def fake_member(user_id: int):
+    return {"user": {"id": str(user_id), "username": f"member{user_id % 10_000_000}", "discriminator": "0",
+                     "global_name": None, "avatar": None},
+            "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+
+
+def fake_guild(guild_id: int, index: int, member_count: int = 0):
+    channel_id = guild_id + 1
+    return {
+        "id": str(guild_id), "name": f"Fake Guild {index}", "icon": None, "owner_id": str(BOT_ID),
+        "afk_timeout": 300, "verification_level": 0, "default_message_notifications": 0,
+        "explicit_content_filter": 0, "mfa_level": 0, "nsfw_level": 0, "premium_tier": 0,
+        "preferred_locale": "en-US", "features": [], "emojis": [], "stickers": [],
+        "roles": [{"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                   "hoist": False, "managed": False, "mentionable": False, "flags": 0}],
+        "channels": [{"id": str(channel_id), "type": 0, "name": "general", "position": 0,
+                      "permission_overwrites": [], "guild_id": str(guild_id), "nsfw": False}],
+        "members": [{"user": bot_user(), "roles": [], "joined_at": "2024-01-01T00:00:00+00:00",
+                     "deaf": False, "mute": False, "flags": 0}],
+        "member_count": member_count + 1, "large": member_count >= 250, "unavailable": False, "threads": [], "presences": [],
+        "voice_states": [], "stage_instances": [], "guild_scheduled_events": [],
+    }
+
+
+class FakeDiscord:
+    def __init__(self, guild_count: int, shard_hint: int, heartbeat_interval: int = 41250, member_count: int = 0):
+        self.guild_ids = [((GUILD_ID_BASE >> 22) + index) << 22 for index in range(guild_count)]
+        self.member_count = member_count
+        self.shard_hint = shard_hint
+        self.heartbeat_interval = heartbeat_interval
+        self.sessions = {}  # shard_id -> {"ws", "seq", "guilds"}
+        self.app = web.Application()
+        self.app.router.add_get("/api/v10/users/@me", self.users_me)
+        self.app.router.add_get("/api/v10/oauth2/applications/@me", self.application)
+        self.app.router.add_get("/api/v10/gateway/bot", self.gateway_bot)
+        self.app.router.add_put("/api/v10/applications/{app_id}/commands", self.sync_commands)
+        self.app.router.add_put("/api/v10/applications/{app_id}/guilds/{guild_id}/commands", self.sync_commands)
+        self.app.router.add_get("/api/v10/guilds/{guild_id}/members/{user_id}", self.get_member)
+        self.app.router.add_get("/gateway", self.gateway)
+        self.app.router.add_get("/gateway/", self.gateway)
+        self.app.router.add_get("/_fake/shards", self.shard_report)
+        self.app.router.add_post("/_fake/dispatch", self.inject)
+        self.app.router.add_route("*", "/api/v10/{tail:.*}", self.not_found)
+
+    # ---------------------------
+    # REST
+    # ---------------------------
+    async def users_me(self, request):
+        return json_response(bot_user())
+
+    async def application(self, request):
+        return json_response({
+            "id": str(APPLICATION_ID), "name": "FakeBot", "icon": None, "description": "", "bot_public": True,
+            "bot_require_code_grant": False, "owner": bot_user(), "verify_key": "0" * 64, "flags": 0,
+            "summary": "", "team": None,
+        })
+
+    async def gateway_bot(self, request):
+        host = request.host
+        return json_response({
+            "url": f"ws://{host}/gateway", "shards": self.shard_hint,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 16},
+        })
+
+    async def sync_commands(self, request):
+        payload = await request.json()
+        return json_response([
+            {**command, "id": str(next(_snowflakes)), "application_id": str(APPLICATION_ID), "version": "1",
+             "default_member_permissions": None, "dm_permission": True}
+            for command in payload
+        ])
+
+    async def get_member(self, request):
+        guild_id, user_id = int(request.match_info["guild_id"]), int(request.match_info["user_id"])
+        if guild_id in self.guild_ids:
+            first_id = MEMBER_ID_BASE + self.guild_ids.index(guild_id) * self.member_count
+            if first_id <= user_id < first_id + self.member_count:
+                return json_response(fake_member(user_id))
+        return json_response({"message": "Unknown Member", "code": 10007}, status=404)
+
+    async def not_found(self, request):
+        return json_response({"message": "Unknown route (fake gateway)", "code": 0}, status=404)
+
+    # ---------------------------
+    # Gateway
+    # ---------------------------
+    async def gateway(self, request):
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+        session = {"ws": ws, "seq": 0, "guilds": [], "shard": None, "host": request.host}
+        await ws.send_json({"op": 10, "d": {"heartbeat_interval": self.heartbeat_interval}, "s": None, "t": None})
+
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(message.data)
+            op = payload.get("op")
+            if op == 1:
+                await ws.send_json({"op": 11, "d": None, "s": None, "t": None})
+            elif op == 2:
+                await self.identify(session, payload["d"])
+            elif op == 8:
+                await self.send_member_chunks(session, payload["d"])
+            elif op == 6:
+                # Resuming is not supported: make the client identify again
+                await ws.send_json({"op": 9, "d": False, "s": None, "t": None})
+        if session["shard"] is not None and self.sessions.get(session["shard"]) is session:
+            del self.sessions[session["shard"]]
+        return ws
+
+    async def identify(self, session, data):
+        shard_id, shard_count = data.get("shard", [0, 1])
+        owned = [guild_id for guild_id in self.guild_ids if (guild_id >> 22) % shard_count == shard_id]
+        session.update(shard=shard_id, guilds=owned)
+        self.sessions[shard_id] = session
+        await self.dispatch(session, "READY", {
+            "v": 10, "user": bot_user(), "session_id": f"fake-{shard_id}-{next(_snowflakes)}",
+            "resume_gateway_url": f"ws://{session['host']}/gateway", "shard": [shard_id, shard_count],
+            "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in owned],
+            "application": {"id": str(APPLICATION_ID), "flags": 0}, "private_channels": [], "relationships": [],
+        })
+        for guild_id in owned:
+            await self.dispatch(session, "GUILD_CREATE",
+                                fake_guild(guild_id, self.guild_ids.index(guild_id), self.member_count))
+
+    async def send_member_chunks(self, session, data):
+        """REQUEST_GUILD_MEMBERS: the guild's synthetic members, MEMBER_CHUNK_SIZE per chunk"""
+        guild_id = int(data["guild_id"])
+        first_id = MEMBER_ID_BASE + self.guild_ids.index(guild_id) * self.member_count
+        if data.get("user_ids"):
+            user_ids = [int(user_id) for user_id in data["user_ids"]
+                        if first_id <= int(user_id) < first_id + self.member_count]
+        else:
+            limit = data.get("limit") or self.member_count
+            user_ids = range(first_id, first_id + min(limit, self.member_count))
+        chunk_count = max(1, -(-len(user_ids) // MEMBER_CHUNK_SIZE))
+        for index in range(chunk_count):
+            chunk = user_ids[index * MEMBER_CHUNK_SIZE:(index + 1) * MEMBER_CHUNK_SIZE]
+            await self.dispatch(session, "GUILD_MEMBERS_CHUNK", {
+                "guild_id": str(guild_id), "members": [fake_member(user_id) for user_id in chunk],
+                "chunk_index": index, "chunk_count": chunk_count, "nonce": data.get("nonce"),
+            })
+
+    async def dispatch(self, session, event: str, data: dict):
+        session["seq"] += 1
+        await session["ws"].send_json({"op": 0, "t": event, "s": session["seq"], "d": data})
+
+    # ---------------------------
+    # Test controls
+    # ---------------------------
+    async def shard_report(self, request):
+        return json_response({
+            str(shard_id): {"guilds": [str(guild_id) for guild_id in session["guilds"]]}
+            for shard_id, session in sorted(self.sessions.items())
+        })
+
+    async def inject(self, request):
+        body = await request.json()
+        guild_id = int(body["guild_id"])
+        for session in self.sessions.values():
+            if guild_id in session["guilds"]:
+                await self.dispatch(session, body["t"], body["d"])
+                return json_response({"shard": session["shard"]})
+        return json_response({"message": "no connected shard owns that guild"}, status=404)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Discord REST + gateway for local shard testing")
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--shards", type=int, default=2, help="shard count recommended by /gateway/bot")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--members", type=int, default=0, help="synthetic members per guild (sent as chunks)")
+    parser.add_argument("--heartbeat-ms", type=int, default=41250, help="heartbeat interval sent in HELLO")
+    args = parser.parse_args()
+    fake = FakeDiscord(args.guilds, args.shards, args.heartbeat_ms, args.members)
+    print(f"🧪 Fake Discord on http://{args.host}:{args.port} with {args.guilds} guild(s)")
+    web.run_app(fake.app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()